@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Compte les appels système du parcours d'une arborescence : gipkowalk (os.scandir,
+    taille et date tirées du DirEntry) contre l'ancienne méthode (os.walk puis
+    os.path.getsize, getctime et getmtime pour chaque fichier).
+
+    Syntaxe :
+    ---------
+    python bench/bench_appels_systeme.py [--repertoire|-r rep]
+                                         [--profondeur p] [--largeur l] [--fichiers f]
+                                         [--strace]
+
+    rep     : arborescence à parcourir. Défaut : une arborescence synthétique créée
+              dans le répertoire temporaire (p niveaux de l sous-répertoires, f fichiers
+              par répertoire).
+    strace  : compte les vrais appels système avec strace -c (linux, strace installé).
+
+    Sans --strace les appels sont comptés en interceptant os.scandir, os.stat et
+    os.lstat. DirEntry.stat() ne passe pas par là : son premier appel sur chaque
+    fichier est compté comme un stat (c'est ce qu'il coûte hors de windows, les appels
+    suivants sont servis par le cache du DirEntry ; sous windows il ne coûte rien,
+    FindNextFile a déjà tout donné).
+    Sur un partage réseau chaque appel est un aller-retour avec le serveur : c'est ce
+    nombre qui compte, plus que le temps mesuré sur un disque local.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import collections
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import outils
+from gipkowalk import gipkowalk
+
+VERSION = '1.0'
+APPELS_STAT = ('stat', 'lstat', 'fstat', 'newfstatat', 'fstatat64', 'statx', 'stat64', 'lstat64')
+APPELS_LISTAGE = ('getdents', 'getdents64', 'openat', 'open', 'close')
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Appels système de gipkowalk contre os.walk + getsize/getctime/getmtime')
+    parser.add_argument('--repertoire', '-r', action='store', help='Arborescence à parcourir')
+    parser.add_argument('--profondeur', default=3, type=int, action='store', help='Niveaux de l\'arborescence synthétique')
+    parser.add_argument('--largeur', default=5, type=int, action='store', help='Sous-répertoires par répertoire')
+    parser.add_argument('--fichiers', default=20, type=int, action='store', help='Fichiers par répertoire')
+    parser.add_argument('--strace', action='count', help='Vrais appels système, avec strace -c')
+    parser.add_argument('--variante', action='store', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    return args.repertoire, args.profondeur, args.largeur, args.fichiers, bool(args.strace), args.variante
+
+
+# ------------------------------------------------------------------------------------
+def ancien_parcours(rep):
+    """
+        Ce que faisait gipkowalk avant os.scandir, sans critère de sélection.
+    """
+    for D, dirs, fics in os.walk(rep):
+        for fic in fics:
+            nom_complet = os.path.join(D, fic)
+            taille = os.path.getsize(nom_complet)
+            os.path.getctime(nom_complet)
+            date_mod = os.path.getmtime(nom_complet)
+            yield D, fic, taille, date_mod
+
+
+VARIANTES = collections.OrderedDict([
+    ('os.walk + 3 stat', ancien_parcours),
+    ('gipkowalk', gipkowalk),
+])
+
+
+#   -------------------------------------------------------------------------------
+class _EntreeComptee:
+    """
+        Enveloppe d'un DirEntry qui compte le premier appel à stat().
+    """
+    def __init__(self, entree, compteur):
+        self._entree = entree
+        self._compteur = compteur
+        self._stat_fait = False
+
+    def __getattr__(self, nom):
+        return getattr(self._entree, nom)
+
+    def stat(self, **kwargs):
+        if not self._stat_fait and os.name != 'nt':
+            self._compteur['DirEntry.stat'] += 1
+            self._stat_fait = True
+        return self._entree.stat(**kwargs)
+
+
+#   -------------------------------------------------------------------------------
+class _ListageCompte:
+    def __init__(self, iterateur, compteur):
+        self._iterateur = iterateur
+        self._compteur = compteur
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._iterateur.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return _EntreeComptee(next(self._iterateur), self._compteur)
+
+    def close(self):
+        self._iterateur.close()
+
+
+# ------------------------------------------------------------------------------------
+def compter(parcours, rep):
+    """
+        Parcourt rep avec parcours en comptant les appels à os.scandir, os.stat,
+        os.lstat et le premier DirEntry.stat() de chaque fichier.
+        Renvoie le nombre de fichiers et le compteur.
+    """
+    compteur = collections.Counter()
+    originaux = os.scandir, os.stat, os.lstat
+
+    def scandir(*args, **kwargs):
+        compteur['scandir'] += 1
+        return _ListageCompte(originaux[0](*args, **kwargs), compteur)
+
+    def stat(*args, **kwargs):
+        compteur['os.stat'] += 1
+        return originaux[1](*args, **kwargs)
+
+    def lstat(*args, **kwargs):
+        compteur['os.lstat'] += 1
+        return originaux[2](*args, **kwargs)
+
+    os.scandir, os.stat, os.lstat = scandir, stat, lstat
+    try:
+        nb_fics = sum(1 for _ in parcours(rep))
+    finally:
+        os.scandir, os.stat, os.lstat = originaux
+
+    return nb_fics, compteur
+
+
+# ------------------------------------------------------------------------------------
+def compter_strace(nom_variante, rep):
+    """
+        Relance ce script sous strace -c pour une seule variante et renvoie le compteur
+        des appels système, regroupés en stat et listage.
+        On retranche un lancement à vide (démarrage de python, imports...).
+    """
+    def lancer(variante):
+        commande = ['strace', '-f', '-c', '-o', '/dev/stdout', sys.executable, os.path.abspath(__file__),
+                    '--repertoire', rep, '--variante', variante]
+        sortie = subprocess.run(commande, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                universal_newlines=True, check=True).stdout
+        compteur = collections.Counter()
+        for ligne in sortie.splitlines():
+            champs = ligne.split()
+            if len(champs) >= 5 and re.match(r'^\d+$', champs[3]):
+                nom = champs[-1]
+                if nom in APPELS_STAT:
+                    compteur['stat'] += int(champs[3])
+                elif nom in APPELS_LISTAGE:
+                    compteur['listage'] += int(champs[3])
+        return compteur
+
+    compteur = lancer(nom_variante)
+    compteur.subtract(lancer(''))
+    return compteur
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    rep, profondeur, largeur, fichiers, avec_strace, variante = LireParametres()
+
+    if variante is not None:
+        #   Lancement sous strace : on fait juste le parcours, sans rien afficher.
+        if variante:
+            for _ in VARIANTES[variante](rep):
+                pass
+        return
+
+    if avec_strace and not shutil.which('strace'):
+        sys.exit('strace n\'est pas installé, relancer sans --strace')
+
+    if not rep:
+        rep = os.path.join(tempfile.gettempdir(), 'gipko_bench_arbre_%s_%s_%s' % (profondeur, largeur, fichiers))
+        nb_reps, nb_fics = outils.creer_arbre(rep, profondeur, largeur, fichiers)
+        print('Arborescence synthétique %s : %s répertoires, %s fichiers' % (rep, nb_reps, nb_fics))
+
+    lignes = []
+    if avec_strace:
+        nb_fics = sum(1 for _ in gipkowalk(rep))
+        for nom in VARIANTES:
+            compteur = compter_strace(nom, rep)
+            total = compteur['stat'] + compteur['listage']
+            lignes.append([nom, compteur['listage'], compteur['stat'], total, '%.2f' % (total / max(nb_fics, 1)), '-'])
+        entetes = ['variante', 'listage', 'stat', 'total', 'par fichier', 'temps (s)']
+
+    else:
+        for nom, parcours in VARIANTES.items():
+            nb_fics, compteur = compter(parcours, rep)
+            stats = compteur['os.stat'] + compteur['os.lstat'] + compteur['DirEntry.stat']
+            total = stats + compteur['scandir']
+            duree, _ = outils.chronometrer(lambda: sum(1 for _ in parcours(rep)))
+            lignes.append([nom, compteur['scandir'], stats, total, '%.2f' % (total / max(nb_fics, 1)), '%.3f' % duree])
+        entetes = ['variante', 'scandir', 'stat', 'total', 'par fichier', 'temps (s)']
+
+    print('%s fichiers' % nb_fics)
+    outils.afficher_tableau(entetes, lignes)
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Gain du cache des permissions décodées (gipkofileinfo.CachePermissions) selon la
+    proportion de DACL différentes parmi les fichiers, avec le backend synthétique
+    BackendMemoire : aucun serveur de fichiers, aucun fichier même, il suffit de noms.
+
+    Syntaxe :
+    ---------
+    python bench/bench_cache_permissions.py [--fichiers f] [--rapports liste]
+                                            [--aces a] [--repetitions n]
+
+    f     : nombre de fichiers. Défaut : 20000.
+    liste : proportions de DACL différentes (nombre de DACL / nombre de fichiers),
+            séparées par des virgules. Défaut : 0.0001,0.001,0.01,0.1,0.5,1.
+    a     : nombre d'ACE par DACL. Défaut : 8.
+    n     : nombre de mesures, on garde la meilleure. Défaut : 3.
+
+    Pour chaque proportion on compare get_perm (avec le cache, vidé au début de chaque
+    mesure : c'est le coût d'un parcours complet) au décodage de chaque DACL comme avant
+    (fileperm_get_perms puis _liste_perms). Le cache des SID et celui des masques sont
+    déjà remplis dans les deux cas : on ne mesure que l'effet du cache des permissions.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import os
+import outils
+import gipkofileinfo
+from gipkofileinfo import BackendMemoire
+
+VERSION = '1.0'
+NB_COMPTES = 50
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Gain du cache des permissions selon la proportion de DACL différentes')
+    parser.add_argument('--fichiers', default=20000, type=int, action='store', help='Nombre de fichiers')
+    parser.add_argument('--rapports', default='0.0001,0.001,0.01,0.1,0.5,1', action='store',
+                        help='Proportions de DACL différentes, séparées par des virgules')
+    parser.add_argument('--aces', default=8, type=int, action='store', help='ACE par DACL')
+    parser.add_argument('--repetitions', default=3, type=int, action='store', help='Nombre de mesures')
+    args = parser.parse_args()
+
+    return args.fichiers, [float(r) for r in args.rapports.split(',')], args.aces, args.repetitions
+
+
+# ------------------------------------------------------------------------------------
+def sans_cache(chemins, infos_serveur):
+    return [gipkofileinfo._liste_perms(gipkofileinfo.fileperm_get_perms(chemin), infos_serveur) for chemin in chemins]
+
+
+# ------------------------------------------------------------------------------------
+def avec_cache(chemins, infos_serveur):
+    gipkofileinfo.cache_permissions.vider()
+    return [gipkofileinfo.get_perm(chemin, infos_serveur) for chemin in chemins]
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    nb_fichiers, rapports, aces_par_acl, repetitions = LireParametres()
+
+    chemins = [os.path.join('partage', 'rep_%03d' % (i // 100), 'fichier_%06d.txt' % i) for i in range(nb_fichiers)]
+    #   Comme le renvoie gipkouserinfo : la moitié des comptes sont des utilisateurs.
+    infos_serveur = {'users': ['user%d' % i for i in range(1, NB_COMPTES, 2)],
+                     'groups': ['groupe%d' % i for i in range(0, NB_COMPTES, 2)]}
+
+    lignes = []
+    for rapport in rapports:
+        backend = BackendMemoire(nb_comptes=NB_COMPTES, nb_acl=max(1, round(nb_fichiers * rapport)), aces_par_acl=aces_par_acl)
+        gipkofileinfo.set_backend(backend)
+        distinctes = len(set(backend.lire_dacl(chemin)[0] for chemin in chemins))
+
+        #   Remplit les caches des SID et des masques.
+        sans_cache(chemins, infos_serveur)
+
+        duree_sans, attendu = outils.chronometrer(lambda: sans_cache(chemins, infos_serveur), repetitions)
+        duree_avec, obtenu = outils.chronometrer(lambda: avec_cache(chemins, infos_serveur), repetitions)
+        if [sorted(p) for p in attendu] != [sorted(p) for p in obtenu]:
+            raise RuntimeError('Le cache ne donne pas les mêmes permissions que le décodage direct')
+
+        lignes.append(['%g' % rapport, distinctes, '%.4f' % (distinctes / nb_fichiers), gipkofileinfo.cache_permissions.echecs,
+                       '%.3f' % duree_sans, '%.3f' % duree_avec, 'x%.1f' % (duree_sans / duree_avec if duree_avec else 0)])
+
+    print('%s fichiers, %s ACE par DACL' % (nb_fichiers, aces_par_acl))
+    outils.afficher_tableau(['demandé', 'DACL', 'DACL/fichiers', 'décodages', 'sans cache (s)', 'avec cache (s)', 'gain'],
+                            lignes)
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
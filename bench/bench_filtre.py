@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Coût par fichier de la sélection de gipkowalk (gipkofilter.Filter appliqué par
+    _selectionner) quand aucun critère n'est actif, comparé à une boucle qui ne fait
+    que lire le stat du DirEntry et à l'ancienne série de tests "if extensions and ...".
+
+    Syntaxe :
+    ---------
+    python bench/bench_filtre.py [--fichiers f] [--repetitions n]
+
+    f : nombre de fichiers du répertoire synthétique. Défaut : 20000.
+    n : nombre de mesures, on garde la meilleure. Défaut : 5.
+
+    Les DirEntry sont listés une fois pour toutes et leur stat est déjà en cache : on
+    ne mesure que le travail de python, pas les appels système.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import os
+import tempfile
+import outils
+import gipkowalk
+from gipkofilter import Filter
+
+VERSION = '1.0'
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Coût par fichier du filtre de gipkowalk sans critère actif')
+    parser.add_argument('--fichiers', default=20000, type=int, action='store', help='Nombre de fichiers')
+    parser.add_argument('--repetitions', default=5, type=int, action='store', help='Nombre de mesures')
+    args = parser.parse_args()
+
+    return args.fichiers, args.repetitions
+
+
+# ------------------------------------------------------------------------------------
+def boucle_nue(D, fics):
+    """
+        Le minimum : un stat (en cache) et un tuple par fichier.
+    """
+    resultats = []
+    for entree in fics:
+        st = entree.stat()
+        resultats.append((D, entree.name, st.st_size, st.st_mtime))
+    return resultats
+
+
+# ------------------------------------------------------------------------------------
+def anciens_tests(D, fics, extensions=None, pattern=None, date_min=None, date_max=None, size_min=None,
+                  size_max=None, texte_cherche=None):
+    """
+        La série de tests que faisait gipkowalk pour chaque fichier avant Filter, tous
+        les critères à None.
+    """
+    resultats = []
+    for entree in fics:
+        fic = entree.name
+        nom_complet = os.path.join(D, fic)
+        if extensions and os.path.splitext(os.path.basename(nom_complet))[1] not in extensions:
+            continue
+        if pattern and not pattern.search(nom_complet):
+            continue
+        st = entree.stat()
+        taille = st.st_size
+        date_mod = st.st_mtime
+        if date_min and date_mod < date_min:
+            continue
+        if date_max and date_mod > date_max:
+            continue
+        if size_min and taille < size_min:
+            continue
+        if size_max and taille > size_max:
+            continue
+        if texte_cherche:
+            continue
+        resultats.append((D, fic, taille, date_mod))
+    return resultats
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    nb_fichiers, repetitions = LireParametres()
+
+    D = os.path.join(tempfile.gettempdir(), 'gipko_bench_plat_%s' % nb_fichiers)
+    outils.creer_arbre(D, 0, 0, nb_fichiers)
+    with os.scandir(D) as it:
+        fics = [e for e in it if e.is_file()]
+    for entree in fics:
+        entree.stat()
+
+    filtre = Filter()
+    print('Filtre sans critère : %s prédicats nom, %s stat, %s contenu'
+          % (len(filtre.predicats_nom), len(filtre.predicats_stat), len(filtre.predicats_contenu)))
+
+    variantes = [
+        ('boucle nue', lambda: boucle_nue(D, fics)),
+        ('anciens tests', lambda: anciens_tests(D, fics)),
+        ('Filter', lambda: gipkowalk._selectionner(D, fics, filtre)),
+    ]
+
+    lignes = []
+    reference = None
+    for nom, fonction in variantes:
+        duree, resultats = outils.chronometrer(fonction, repetitions)
+        par_fichier = duree / len(fics) * 1e9
+        reference = reference or par_fichier
+        lignes.append([nom, len(resultats), '%.4f' % duree, '%.0f' % par_fichier, '%+.0f' % (par_fichier - reference)])
+
+    print('%s fichiers' % len(fics))
+    outils.afficher_tableau(['variante', 'retenus', 'temps (s)', 'ns/fichier', 'surcoût ns'], lignes)
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
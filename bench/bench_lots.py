@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Mémoire occupée par les résultats d'un gros parcours selon la façon de les garder :
+    la liste des tuples de gipkowalk, des lots en colonnes (gipkolots.LotFichiers) avec
+    une table des chemins complets des répertoires (l'ancienne TableChaines), et les
+    mêmes lots avec l'arbre des répertoires (gipkolots.TableRepertoires).
+
+    Syntaxe :
+    ---------
+    python bench/bench_lots.py [--fichiers f] [--par-rep p] [--largeur l]
+                               [--profondeur n] [--repertoire|-r rep]
+
+    f   : nombre de fichiers des résultats synthétiques. Défaut : 1000000.
+    p   : nombre de fichiers par répertoire. Défaut : 20.
+    l   : nombre de sous-répertoires par répertoire. Défaut : 8.
+    n   : profondeur maximale de l'arborescence. Défaut : 8.
+    rep : au lieu de résultats synthétiques, les vrais résultats de gipkowalk sur cette
+          arborescence (f, p, l et n sont alors ignorés).
+
+    Les résultats synthétiques sont ceux du parcours d'une arborescence imaginaire sous
+    \\\\serveur\\partage (/mnt/serveur/partage hors de windows), dans l'ordre de gipkowalk :
+    de haut en bas, les fichiers d'un même répertoire à la suite, avec le même objet
+    chaîne pour le répertoire. On s'arrête au f-ième fichier.
+
+    Chaque façon de garder les résultats est mesurée dans un processus à part : on
+    donne le pic de mémoire résidente (outils.pic_memoire) et ce qu'il a pris pendant la
+    construction. Pas de pic de mémoire sous windows (module resource absent).
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import outils
+from gipkolots import LotFichiers, TableRepertoires
+from gipkofileinfo import affichageHumain
+from gipkowalk import gipkowalk
+
+VERSION = '1.0'
+RACINE = '\\\\serveur\\partage' if os.name == 'nt' else '/mnt/serveur/partage'
+#   Racine des chemins synthétiques, avec le séparateur du système comme dans gipkowalk.
+LIGNES_PAR_LOT = 10000
+VARIANTES = ('tuples', 'lots, chemins complets', 'lots, arbre')
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Mémoire des résultats de gipkowalk : tuples, lots et arbre des répertoires')
+    parser.add_argument('--fichiers', default=1000000, type=int, action='store', help='Nombre de fichiers')
+    parser.add_argument('--par-rep', default=20, type=int, action='store', help='Fichiers par répertoire')
+    parser.add_argument('--largeur', default=8, type=int, action='store', help='Sous-répertoires par répertoire')
+    parser.add_argument('--profondeur', default=8, type=int, action='store', help='Profondeur maximale')
+    parser.add_argument('--repertoire', '-r', action='store', help='Arborescence réelle à parcourir')
+    parser.add_argument('--mesure', action='store', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    return args.fichiers, args.par_rep, args.largeur, args.profondeur, args.repertoire, args.mesure
+
+
+#   -------------------------------------------------------------------------------
+class TableChaines:
+    """
+        La table des répertoires de gipkolots 1.0 : chaque chemin complet n'est gardé
+        qu'une fois et désigné par son numéro.
+    """
+    def __init__(self):
+        self.chaines = []
+        self.numeros = {}
+
+    def numero(self, chaine):
+        n = self.numeros.get(chaine)
+        if n is None:
+            n = len(self.chaines)
+            self.chaines.append(chaine)
+            self.numeros[chaine] = n
+        return n
+
+    def __getitem__(self, n):
+        return self.chaines[n]
+
+    def __len__(self):
+        return len(self.chaines)
+
+
+# ------------------------------------------------------------------------------------
+def resultats_synthetiques(nb_fichiers, par_rep, largeur, profondeur):
+    """
+        Des tuples (répertoire, fichier, taille, date de modification) comme ceux de
+        gipkowalk. Le chemin du répertoire est fabriqué une fois par répertoire.
+    """
+    date = 1700000000.0
+    i = 0
+    a_traiter = [(RACINE, 0)]
+    while a_traiter:
+        D, niveau = a_traiter.pop()
+        for j in range(par_rep):
+            if i >= nb_fichiers:
+                return
+            yield D, 'Compte rendu %07d.docx' % i, i * 37 % 10000000, date + i
+            i += 1
+        if niveau < profondeur:
+            a_traiter.extend((os.path.join(D, 'Dossier %d' % k), niveau + 1) for k in reversed(range(largeur)))
+
+
+# ------------------------------------------------------------------------------------
+def garder(variante, resultats):
+    """
+        Garde tous les résultats de la façon demandée et renvoie ce qui les contient
+        (pour qu'ils restent en mémoire jusqu'à la mesure) et le nombre de répertoires.
+    """
+    if variante == 'tuples':
+        liste = list(resultats)
+        return liste, len(set(r[0] for r in liste))
+
+    table = TableChaines() if variante == 'lots, chemins complets' else TableRepertoires()
+    lots = []
+    lot = None
+    for resultat in resultats:
+        if lot is None or len(lot) >= LIGNES_PAR_LOT:
+            lot = LotFichiers(table)
+            lots.append(lot)
+        lot.ajouter(resultat)
+    return lots, len(table)
+
+
+# ------------------------------------------------------------------------------------
+def mesurer(variante, nb_fichiers, par_rep, largeur, profondeur, rep):
+    """
+        Une mesure, dans le processus fils : renvoie le dictionnaire durée, pic de
+        mémoire avant et après, nombre de fichiers et d'éléments de la table.
+    """
+    avant = outils.pic_memoire()
+    debut = time.perf_counter()
+    resultats = gipkowalk(rep) if rep else resultats_synthetiques(nb_fichiers, par_rep, largeur, profondeur)
+    garde, nb_elements = garder(variante, resultats)
+    duree = time.perf_counter() - debut
+    nb = len(garde) if variante == 'tuples' else sum(len(lot) for lot in garde)
+
+    return {'duree': duree, 'avant': avant, 'apres': outils.pic_memoire(), 'fichiers': nb, 'elements': nb_elements}
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    nb_fichiers, par_rep, largeur, profondeur, rep, variante = LireParametres()
+
+    if variante:
+        print(json.dumps(mesurer(variante, nb_fichiers, par_rep, largeur, profondeur, rep)))
+        return
+
+    lignes = []
+    reference = None
+    for variante in VARIANTES:
+        commande = [sys.executable, os.path.abspath(__file__), '--mesure', variante, '--fichiers', str(nb_fichiers),
+                    '--par-rep', str(par_rep), '--largeur', str(largeur), '--profondeur', str(profondeur)]
+        if rep:
+            commande += ['--repertoire', rep]
+        resultat = json.loads(subprocess.run(commande, stdout=subprocess.PIPE, universal_newlines=True,
+                                             check=True).stdout)
+
+        if resultat['apres'] is None:
+            pic = supplement = rapport = '-'
+        else:
+            pris = resultat['apres'] - resultat['avant']
+            reference = reference or pris
+            pic = affichageHumain(resultat['apres'])
+            supplement = affichageHumain(pris)
+            rapport = '%.1f%%' % (100 * pris / reference) if reference else '-'
+        lignes.append([variante, resultat['fichiers'], resultat['elements'], '%.2f' % resultat['duree'], pic, supplement,
+                       rapport])
+
+    outils.afficher_tableau(['résultats gardés', 'fichiers', 'répertoires', 'temps (s)', 'pic RSS', 'pris', 'vs tuples'],
+                            lignes)
+    print('répertoires : éléments de la table (avec l\'arbre, les répertoires intermédiaires en font partie)')
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
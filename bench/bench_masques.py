@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Décodage des masques de droits des ACE : gipkofileinfo.get_mask (parcours des seuls
+    bits à 1, résultats gardés) comparé à l'ancien get_mask (parcours de tous les bits,
+    concaténation de chaînes avec test "not in"), sur des masques tirés comme on les
+    trouve sur un partage.
+
+    Syntaxe :
+    ---------
+    python bench/bench_masques.py [--masques m] [--repetitions n]
+
+    m : nombre de masques décodés par mesure. Défaut : 200000.
+    n : nombre de mesures, on garde la meilleure. Défaut : 5.
+
+    Deux distributions : "réaliste", où la grande majorité des ACE ont un masque typique
+    (contrôle total, lecture, modification...) et le reste des droits génériques
+    (CREATOR OWNER) ou particuliers, et "atypiques", où il n'y a que ces derniers : c'est
+    là que l'ancien get_mask faisait tout le travail.
+    Le nouveau get_mask est mesuré avec ses résultats gardés (le cas normal) et sans
+    (TAILLE_CACHE_MASQUES à 0 : chaque masque est décodé à chaque fois).
+
+    L'ancien get_mask partait de 47483648, qui n'est pas une puissance de 2 : il testait
+    des groupes de bits et pas chaque bit, et ne voyait rien au-delà de
+    ACCESS_SYSTEM_SECURITY (GENERIC_*, MAXIMUM_ALLOWED). Il oubliait donc des droits
+    (READ_CONTROL dans 0x120089 par exemple) : les masques pour lesquels les deux ne
+    donnent pas le même résultat sont comptés dans la colonne "différents".
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import random
+import outils
+import gipkofileinfo
+from gipkofileinfo import All_perms, Typical_perms, FULL_CONTROL, READ, CHANGE, WALK_DIR
+
+VERSION = '1.0'
+GRAINE = 0
+MASQUES_TYPIQUES = [(FULL_CONTROL, 30), (READ, 25), (CHANGE, 20), (WALK_DIR, 5), (1180086, 3), (1180095, 2)]
+#   Masque et poids : ce qu'on trouve sur les partages, contrôle total et lecture en tête.
+MASQUES_ATYPIQUES = [(0x10000000, 5), (0xA0000000, 4), (0x120089, 3), (0x100116, 2), (0x1F01BF, 1)]
+#   GENERIC_ALL et GENERIC_READ | GENERIC_EXECUTE (ACE héritables de CREATOR OWNER),
+#   lecture sans exécution, écriture seule, contrôle total sans suppression des
+#   sous-dossiers et fichiers.
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Décodage des masques de droits : nouveau et ancien get_mask')
+    parser.add_argument('--masques', default=200000, type=int, action='store', help='Masques décodés par mesure')
+    parser.add_argument('--repetitions', default=5, type=int, action='store', help='Nombre de mesures')
+    args = parser.parse_args()
+
+    return args.masques, args.repetitions
+
+
+# ------------------------------------------------------------------------------------
+def ancien_get_mask(mask):
+    """
+        get_mask tel qu'il était avant la version 2.8 de gipkofileinfo.
+    """
+    a = 47483648
+
+    if mask in Typical_perms:
+        return Typical_perms[mask]
+    else:
+        result = ''
+        while a >> 1:
+            a = a >> 1
+            masked = mask & a
+            if masked:
+                if masked in All_perms and All_perms[masked] not in result:
+                    result = All_perms[masked] + ':' + result
+        return result
+
+
+# ------------------------------------------------------------------------------------
+def tirer(distribution, nombre):
+    hasard = random.Random(GRAINE)
+    masques, poids = zip(*distribution)
+    return hasard.choices(masques, poids, k=nombre)
+
+
+# ------------------------------------------------------------------------------------
+def nouveau_sans_memoire(masques):
+    taille = gipkofileinfo.TAILLE_CACHE_MASQUES
+    gipkofileinfo.TAILLE_CACHE_MASQUES = 0
+    try:
+        return [gipkofileinfo.get_mask(m) for m in masques]
+    finally:
+        gipkofileinfo.TAILLE_CACHE_MASQUES = taille
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    nb_masques, repetitions = LireParametres()
+
+    distributions = [('réaliste', MASQUES_TYPIQUES + MASQUES_ATYPIQUES), ('atypiques', MASQUES_ATYPIQUES)]
+    variantes = [
+        ('ancien', lambda masques: [ancien_get_mask(m) for m in masques]),
+        ('nouveau', lambda masques: [gipkofileinfo.get_mask(m) for m in masques]),
+        ('nouveau sans mémoire', nouveau_sans_memoire),
+    ]
+
+    lignes = []
+    for nom_distribution, distribution in distributions:
+        masques = tirer(distribution, nb_masques)
+        reference = None
+        attendu = None
+        for nom_variante, fonction in variantes:
+            gipkofileinfo._masques_decodes.clear()
+            duree, resultats = outils.chronometrer(lambda: fonction(masques), repetitions)
+            attendu = attendu or resultats
+            differents = sum(1 for a, b in zip(attendu, resultats) if a != b)
+            par_masque = duree / nb_masques * 1e9
+            reference = reference or par_masque
+            lignes.append([nom_distribution, nom_variante, '%.4f' % duree, '%.0f' % par_masque,
+                           'x%.1f' % (reference / par_masque if par_masque else 0), differents])
+
+    print('%s masques par mesure' % nb_masques)
+    outils.afficher_tableau(['distribution', 'get_mask', 'temps (s)', 'ns/masque', 'gain', 'différents'], lignes)
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Recherche d'un texte dans de gros fichiers : débit et pic de mémoire résidente de
+    la recherche par mmap (seuil_mmap) comparés à la lecture par blocs et à l'ancienne
+    méthode (f.read() de tout le fichier puis re.search).
+
+    Syntaxe :
+    ---------
+    python bench/bench_mmap.py [--tailles liste] [--repertoire|-r rep] [--garder]
+
+    liste : tailles des fichiers de test, séparées par des virgules, au format de
+            size_min (k, m, g, t, 1000 octets par k). Défaut : 100M,500M,1G,2G.
+    rep   : où créer les fichiers de test. Défaut : le répertoire temporaire. Il faut
+            la place de tous les fichiers en même temps.
+    garder: ne pas supprimer les fichiers de test à la fin (ils sont réutilisés au
+            lancement suivant).
+
+    Le texte cherché n'est pas dans les fichiers : chaque méthode lit tout.
+    Chaque mesure est faite dans un processus à part, pour que le pic de mémoire de
+    l'une ne se voie pas dans les suivantes. Le fichier est lu une fois avant les
+    mesures pour qu'elles partent toutes avec le fichier dans le cache du système.
+
+    Attention à la lecture des pics de mémoire : les pages d'un fichier projeté par
+    mmap comptent dans la mémoire résidente du processus pendant qu'on les parcourt,
+    mais ce sont les pages du cache du système, que celui-ci peut reprendre à tout
+    moment, pas de la mémoire allouée par python comme la chaîne de f.read().
+    Pas de pic de mémoire sous windows (module resource absent).
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import outils
+from gipkofilter import chercher_texte, lire_taille
+from gipkofileinfo import affichageHumain
+
+VERSION = '1.0'
+MOTIF = 'aiguille_introuvable'
+LIGNE = b'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor 0123456789\n'
+METHODES = ('f.read()', 'blocs', 'mmap')
+TAILLE_ECRITURE = 8 * 1024 * 1024
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Recherche dans de gros fichiers : mmap, blocs et f.read()')
+    parser.add_argument('--tailles', default='100M,500M,1G,2G', action='store', help='Tailles des fichiers de test')
+    parser.add_argument('--repertoire', '-r', action='store', help='Où créer les fichiers de test')
+    parser.add_argument('--garder', action='count', help='Ne pas supprimer les fichiers de test')
+    parser.add_argument('--mesure', nargs=2, action='store', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    tailles = [lire_taille(t, 'Taille') for t in args.tailles.split(',')]
+    return tailles, args.repertoire or tempfile.gettempdir(), bool(args.garder), args.mesure
+
+
+# ------------------------------------------------------------------------------------
+def creer_fichier(nom_complet, taille):
+    """
+        Fichier texte de taille octets, sans le motif cherché. Gardé s'il existe déjà.
+    """
+    if os.path.exists(nom_complet) and os.path.getsize(nom_complet) == taille:
+        return
+
+    bloc = LIGNE * (TAILLE_ECRITURE // len(LIGNE))
+    with open(nom_complet, 'wb') as f:
+        restant = taille
+        while restant > 0:
+            f.write(bloc[:restant])
+            restant -= len(bloc)
+
+
+# ------------------------------------------------------------------------------------
+def mesurer(methode, nom_complet):
+    """
+        Une mesure, dans le processus fils : renvoie le dictionnaire durée, pic de
+        mémoire avant et après la recherche, trouvé.
+    """
+    regex = re.compile(MOTIF, re.I)
+    avant = outils.pic_memoire()
+    debut = time.perf_counter()
+
+    if methode == 'f.read()':
+        with open(nom_complet, 'r', encoding='utf-8') as f:
+            trouve = regex.search(f.read()) is not None
+    elif methode == 'blocs':
+        trouve = chercher_texte(nom_complet, regex, encoding='utf-8')
+    else:
+        trouve = chercher_texte(nom_complet, regex, encoding='utf-8', seuil_mmap=1)
+
+    return {'duree': time.perf_counter() - debut, 'avant': avant, 'apres': outils.pic_memoire(), 'trouve': trouve}
+
+
+# ------------------------------------------------------------------------------------
+def lancer_mesure(methode, nom_complet):
+    commande = [sys.executable, os.path.abspath(__file__), '--mesure', methode, nom_complet]
+    sortie = subprocess.run(commande, stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+    return json.loads(sortie)
+
+
+# ------------------------------------------------------------------------------------
+def prechauffer(nom_complet):
+    with open(nom_complet, 'rb') as f:
+        while f.read(TAILLE_ECRITURE):
+            pass
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    tailles, rep, garder, mesure = LireParametres()
+
+    if mesure:
+        print(json.dumps(mesurer(*mesure)))
+        return
+
+    lignes = []
+    for taille in tailles:
+        nom_complet = os.path.join(rep, 'gipko_bench_mmap_%s.txt' % taille)
+        creer_fichier(nom_complet, taille)
+        prechauffer(nom_complet)
+
+        try:
+            for methode in METHODES:
+                try:
+                    resultat = lancer_mesure(methode, nom_complet)
+                except subprocess.CalledProcessError:
+                    #   f.read() sur un fichier plus gros que la mémoire disponible...
+                    lignes.append([affichageHumain(taille), methode, 'échec', '-', '-', '-'])
+                    continue
+
+                debit = taille / resultat['duree'] / 1e6 if resultat['duree'] else 0
+                if resultat['apres'] is None:
+                    pic = supplement = '-'
+                else:
+                    pic = affichageHumain(resultat['apres'])
+                    supplement = affichageHumain(resultat['apres'] - resultat['avant'])
+                lignes.append([affichageHumain(taille), methode, '%.3f' % resultat['duree'], '%.0f' % debit, pic, supplement])
+
+        finally:
+            if not garder:
+                os.remove(nom_complet)
+
+    outils.afficher_tableau(['fichier', 'méthode', 'temps (s)', 'Mo/s', 'pic RSS', 'pic - avant'], lignes)
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
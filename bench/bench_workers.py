@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Fichiers par seconde du parcours de gipkowalk selon le nombre de workers
+    (_parcourir_parallele), sur une arborescence synthétique profonde et large.
+
+    Syntaxe :
+    ---------
+    python bench/bench_workers.py [--repertoire|-r rep]
+                                  [--profondeur p] [--largeur l] [--fichiers f]
+                                  [--workers liste] [--latence ms] [--ordonne]
+
+    rep      : arborescence à parcourir. Défaut : une arborescence synthétique créée
+               dans le répertoire temporaire (p niveaux de l sous-répertoires, f fichiers
+               par répertoire).
+    liste    : nombres de workers à mesurer, séparés par des virgules. 0 est le parcours
+               séquentiel. Défaut : 0,1,2,4,8,16,32.
+    latence  : attente ajoutée au listage de chaque répertoire, en millisecondes, pour
+               simuler l'aller-retour avec un serveur de fichiers. Défaut : 0.
+    ordonne  : les répertoires sont renvoyés dans l'ordre du parcours séquentiel.
+
+    Sur un disque local tout est dans le cache du système au deuxième passage et le
+    parcours ne dépend que du processeur : les threads n'apportent rien, c'est normal.
+    C'est sur un partage réseau (ou avec --latence) qu'on voit l'intérêt.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import outils
+import gipkowalk
+from gipkofilter import Filter
+
+VERSION = '1.0'
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Fichiers par seconde de gipkowalk selon le nombre de workers')
+    parser.add_argument('--repertoire', '-r', action='store', help='Arborescence à parcourir')
+    parser.add_argument('--profondeur', default=4, type=int, action='store', help='Niveaux de l\'arborescence synthétique')
+    parser.add_argument('--largeur', default=6, type=int, action='store', help='Sous-répertoires par répertoire')
+    parser.add_argument('--fichiers', default=10, type=int, action='store', help='Fichiers par répertoire')
+    parser.add_argument('--workers', default='0,1,2,4,8,16,32', action='store', help='Nombres de workers, séparés par des virgules')
+    parser.add_argument('--latence', default=0, type=float, action='store', help='Attente par répertoire listé, en ms')
+    parser.add_argument('--ordonne', action='count', help='Ordre du parcours séquentiel')
+    args = parser.parse_args()
+
+    workers = [int(w) for w in args.workers.split(',')]
+    return args.repertoire, args.profondeur, args.largeur, args.fichiers, workers, args.latence / 1000, bool(args.ordonne)
+
+
+# ------------------------------------------------------------------------------------
+def parcourir(rep, workers, lister, ordonne):
+    """
+        Parcourt rep sans critère de sélection et renvoie le nombre de fichiers.
+    """
+    filtre = Filter()
+    if workers:
+        parcours = gipkowalk._parcourir_parallele(rep, filtre, workers, ordonne, lister)
+    else:
+        parcours = ((D, gipkowalk._selectionner(D, fics, filtre)) for D, dirs, fics in gipkowalk._parcourir(rep, lister))
+
+    return sum(len(resultats) for D, resultats in parcours)
+
+
+# ------------------------------------------------------------------------------------
+def main():
+    rep, profondeur, largeur, fichiers, liste_workers, latence, ordonne = LireParametres()
+
+    if not rep:
+        rep = os.path.join(tempfile.gettempdir(), 'gipko_bench_arbre_%s_%s_%s' % (profondeur, largeur, fichiers))
+        nb_reps, nb_fics = outils.creer_arbre(rep, profondeur, largeur, fichiers)
+        print('Arborescence synthétique %s : %s répertoires, %s fichiers' % (rep, nb_reps, nb_fics))
+
+    if latence:
+        def lister(D):
+            time.sleep(latence)
+            return gipkowalk._lister(D)
+    else:
+        lister = gipkowalk._lister
+
+    #   Un premier passage pour que tout le monde parte avec le même cache disque.
+    parcourir(rep, 0, gipkowalk._lister, False)
+
+    lignes = []
+    reference = None
+    for workers in liste_workers:
+        duree, nb_fics = outils.chronometrer(lambda: parcourir(rep, workers, lister, ordonne))
+        debit = nb_fics / duree if duree else 0
+        reference = reference or debit
+        lignes.append(['séquentiel' if not workers else workers, nb_fics, '%.3f' % duree, '%.0f' % debit,
+                       'x%.2f' % (debit / reference if reference else 0)])
+
+    outils.afficher_tableau(['workers', 'fichiers', 'temps (s)', 'fichiers/s', 'rapport'], lignes)
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Outils communs aux scripts de mesure du répertoire bench.
+
+    Chaque script de mesure est autonome et se lance depuis n'importe où :
+        python bench/bench_xxx.py --help
+    Ce module met la racine du dépôt dans sys.path pour que les scripts puissent
+    importer les modules gipko*.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    #   Pas de module resource sous windows.
+    resource = None
+
+VERSION = '1.0'
+RACINE_DEPOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RACINE_DEPOT not in sys.path:
+    sys.path.insert(0, RACINE_DEPOT)
+
+
+# ------------------------------------------------------------------------------------
+def creer_arbre(racine, profondeur, largeur, fichiers_par_rep, taille=100):
+    """
+        Crée sous racine une arborescence synthétique : largeur sous-répertoires par
+        répertoire sur profondeur niveaux, et fichiers_par_rep fichiers de taille octets
+        dans chaque répertoire. Si l'arborescence existe déjà (même forme) on la garde.
+        Renvoie le couple (nombre de répertoires, nombre de fichiers).
+    """
+    contenu = b'x' * (taille - 1) + b'\n' if taille else b''
+    nb_reps = nb_fics = 0
+    a_creer = [(racine, 0)]
+
+    while a_creer:
+        D, niveau = a_creer.pop()
+        os.makedirs(D, exist_ok=True)
+        nb_reps += 1
+
+        for i in range(fichiers_par_rep):
+            nom_complet = os.path.join(D, 'fichier_%04d.txt' % i)
+            if not os.path.exists(nom_complet):
+                with open(nom_complet, 'wb') as f:
+                    f.write(contenu)
+            nb_fics += 1
+
+        if niveau < profondeur:
+            a_creer.extend((os.path.join(D, 'rep_%03d' % i), niveau + 1) for i in range(largeur))
+
+    return nb_reps, nb_fics
+
+
+# ------------------------------------------------------------------------------------
+def chronometrer(fonction, repetitions=3):
+    """
+        Exécute repetitions fois fonction() et renvoie le meilleur temps en secondes,
+        et le résultat de la dernière exécution.
+    """
+    meilleur = None
+    resultat = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        duree = time.perf_counter() - debut
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+
+    return meilleur, resultat
+
+
+# ------------------------------------------------------------------------------------
+def pic_memoire():
+    """
+        Pic de mémoire résidente du processus depuis son lancement, en octets. None si
+        on ne sait pas le mesurer (windows).
+    """
+    if resource is None:
+        return None
+
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #   En ko sous linux, en octets sous macOS.
+    return pic if sys.platform == 'darwin' else pic * 1024
+
+
+# ------------------------------------------------------------------------------------
+def afficher_tableau(entetes, lignes):
+    """
+        Affiche un tableau aligné : une ligne d'entêtes puis les lignes, chaque valeur
+        déjà formatée en chaîne.
+    """
+    largeurs = [max(len(str(ligne[i])) for ligne in [entetes] + lignes) for i in range(len(entetes))]
+    for ligne in [entetes] + lignes:
+        print('  '.join(str(valeur).rjust(largeur) for valeur, largeur in zip(ligne, largeurs)))
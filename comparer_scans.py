@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Compare deux listes de fichiers d'une même arborescence faites à des moments
+    différents (gipkodir --format bin, csv ou jsonl), et dit ce qui a changé : fichiers
+    ajoutés, supprimés, qui ont grossi, diminué ou ont été modifiés, et pour chaque
+    répertoire la variation de volume.
+
+    Les deux listes sont triées (gipkotri : tri externe, mémoire bornée) puis parcourues
+    en parallèle comme une fusion. Aucune des deux n'est gardée en entier en mémoire, on
+    peut comparer des dizaines de millions de fichiers. Seuls les totaux des répertoires
+    qui ont changé restent en mémoire jusqu'à la fin.
+
+    Syntaxe :
+    ---------
+    python comparer_scans.py [--output|-o sortie]
+                             [--sort-ram mémoire tri]
+                             [--repertoires-seulement|-r]
+                             avant apres
+
+    avant, apres : les deux listes. Le format est reconnu tout seul : bin, jsonl, csv
+                   ou texte (la sortie par défaut de gipkodir, sans -H : avec -H les
+                   tailles sont arrondies, on ne peut pas comparer).
+    mémoire tri  : mémoire maximale utilisée par chacun des tris. Défaut : 100Mo.
+    -r           : n'affiche que la variation par répertoire, pas le détail des fichiers.
+
+    Dans le détail, chaque ligne commence par le type de changement :
+        A : ajouté, S : supprimé, + : a grossi, - : a diminué, M : modifié (même taille,
+        date différente)
+    suivi de la variation de taille en octets et du nom complet.
+    Puis les répertoires dont le volume a changé, de la plus forte variation (en valeur
+    absolue) à la plus faible, avec la variation.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+    Version 1.1 2026-10-18
+        Lit aussi la sortie texte de gipkodir. Un fichier dans un format inconnu donne
+        une erreur claire au lieu d'un KeyError.
+
+"""
+
+import argparse
+import os
+import sys
+import re
+import csv
+import json
+import gipkobin
+import gipkotri
+
+VERSION = '1.1'
+PRECISION_DATE = 0.001
+#   Le format csv n'a les dates qu'à la milliseconde près.
+ENTETE_CSV = 'date_mod\tdate\ttaille\tnom'
+LIGNE_TEXTE = re.compile(r'^ *(\d+\.\d{3}) \d{4}-\d\d-\d\d \d\d:\d\d:\d\d +(\d+) (.+?)(?:   \[[^\]]*\])?$')
+#   Une ligne de la sortie texte de gipkodir (voir gipkodir.formater) : date, date ISO,
+#   taille, nom complet, et éventuellement les motifs trouvés entre crochets.
+fic_sortie = None
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Ce qui a changé entre deux listes de fichiers')
+    parser.add_argument('--output', '-o', action='store', help='Nom du fichier en sortie')
+    parser.add_argument('--sort-ram', default='100M', action='store', help='Mémoire maximale de chaque tri. Format : nnnko/mo/go')
+    parser.add_argument('--repertoires-seulement', '-r', action='count', help='Seulement la variation par répertoire')
+    parser.add_argument('avant', action='store', help='Liste la plus ancienne')
+    parser.add_argument('apres', action='store', help='Liste la plus récente')
+    args = parser.parse_args()
+
+    return args.avant, args.apres, args.output, args.sort_ram, bool(args.repertoires_seulement)
+
+
+# ------------------------------------------------------------------------------------
+def output(ligne):
+    global fic_sortie
+
+    if fic_sortie:
+        fic_sortie.write(ligne)
+    else:
+        sys.stdout.write(ligne)
+
+
+# ------------------------------------------------------------------------------------
+def lire_scan(nom_fichier):
+    """
+        Renvoie les tuples (répertoire, fichier, taille, date de modification) d'une liste
+        écrite par gipkodir --format bin, csv ou jsonl.
+    """
+    with open(nom_fichier, 'rb') as f:
+        debut = f.read(len(gipkobin.ENTETE))
+
+    if debut == gipkobin.ENTETE:
+        for resultat in gipkobin.lire(nom_fichier):
+            yield resultat[:4]
+
+    elif debut[:1] == b'{':
+        with open(nom_fichier) as f:
+            for ligne in f:
+                objet = json.loads(ligne)
+                yield objet['repertoire'], objet['fichier'], objet['taille'], objet['date_mod']
+
+    else:
+        with open(nom_fichier, newline='') as f:
+            premiere = f.readline()
+            f.seek(0)
+            if premiere.startswith(ENTETE_CSV):
+                for ligne in csv.DictReader(f, delimiter='\t'):
+                    D, fic = os.path.split(ligne['nom'])
+                    yield D, fic, int(ligne['taille']), float(ligne['date_mod'])
+            else:
+                yield from _lire_texte(nom_fichier, f)
+
+
+# ------------------------------------------------------------------------------------
+def _lire_texte(nom_fichier, f):
+    for numero, ligne in enumerate(f, 1):
+        #   L'hélice de gipkodir peut traîner en début de ligne si on a redirigé l'écran.
+        ligne = ligne.rstrip('\r\n').rpartition('\r')[2]
+        if ligne.strip() in ('', '|', '/', '-', '\\'):
+            continue
+
+        trouve = LIGNE_TEXTE.match(ligne)
+        if trouve is None:
+            raise ValueError('%s, ligne %s : format inconnu. Formats possibles : gipkodir --format bin, jsonl, csv, '
+                             'ou text sans -H' % (nom_fichier, numero))
+
+        D, fic = os.path.split(trouve.group(3))
+        yield D, fic, int(trouve.group(2)), float(trouve.group(1))
+
+
+# ------------------------------------------------------------------------------------
+def _trie(nom_fichier, memoire_tri):
+    """
+        La liste triée par répertoire puis par nom. Les noms de répertoires sont normalisés
+        pour que deux listes du même endroit se comparent bien.
+    """
+    scan = ((os.path.normpath(D), fic, taille, date_mod) for D, fic, taille, date_mod in lire_scan(nom_fichier))
+    return gipkotri.trier(scan, cle=lambda r: (r[0], r[1]), budget=memoire_tri)
+
+
+# ------------------------------------------------------------------------------------
+def comparer(avant, apres, memoire_tri='100M'):
+    """
+        Générateur qui renvoie les changements, tuples (type, variation de taille,
+        répertoire, fichier), dans l'ordre des répertoires puis des noms.
+        Le type est 'A', 'S', '+', '-' ou 'M' (voir la doc du module).
+    """
+    fin = object()
+    a = _trie(avant, memoire_tri)
+    b = _trie(apres, memoire_tri)
+
+    try:
+        ra = next(a, fin)
+        rb = next(b, fin)
+        while ra is not fin or rb is not fin:
+            if rb is fin or (ra is not fin and (ra[0], ra[1]) < (rb[0], rb[1])):
+                yield 'S', -ra[2], ra[0], ra[1]
+                ra = next(a, fin)
+
+            elif ra is fin or (rb[0], rb[1]) < (ra[0], ra[1]):
+                yield 'A', rb[2], rb[0], rb[1]
+                rb = next(b, fin)
+
+            else:
+                variation = rb[2] - ra[2]
+                if variation > 0:
+                    yield '+', variation, rb[0], rb[1]
+                elif variation < 0:
+                    yield '-', variation, rb[0], rb[1]
+                elif abs(rb[3] - ra[3]) > PRECISION_DATE:
+                    yield 'M', 0, rb[0], rb[1]
+                ra = next(a, fin)
+                rb = next(b, fin)
+
+    finally:
+        a.close()
+        b.close()
+
+
+# ------------------------------------------------------------------------------------
+def lister_changements(avant, apres, memoire_tri='100M', repertoires_seulement=False):
+    variations = {}
+    nb_changements = 0
+
+    for type_changement, variation, D, fic in comparer(avant, apres, memoire_tri):
+        nb_changements += 1
+        if not repertoires_seulement:
+            output('%s %+15d %s\n' % (type_changement, variation, os.path.join(D, fic)))
+        if variation:
+            variations[D] = variations.get(D, 0) + variation
+
+    output('\n\tVariation par répertoire :\n')
+    for D, variation in sorted(variations.items(), key=lambda e: -abs(e[1])):
+        output('%+15d %s\n' % (variation, D))
+
+    output('\n%s fichiers ont changé, variation totale %+d octets\n' % (nb_changements, sum(variations.values())))
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    avant, apres, nom_fic_sortie, memoire_tri, repertoires_seulement = LireParametres()
+
+    if nom_fic_sortie:
+        fic_sortie = open(nom_fic_sortie, 'w')
+
+    lister_changements(avant, apres, memoire_tri, repertoires_seulement)
+
+    if fic_sortie:
+        fic_sortie.close()
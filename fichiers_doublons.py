@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Recherche des fichiers en double dans une ou plusieurs arborescences, pour savoir
+    combien de place on peut récupérer.
+
+    Pour ne pas lire tous les fichiers en entier on procède par étapes :
+        1°  on regroupe les fichiers par taille. Un fichier dont la taille est unique n'a
+            pas de double, on ne l'ouvre même pas ;
+        2°  pour les tailles qu'on trouve plusieurs fois, on calcule une empreinte du
+            début et de la fin du fichier (TAILLE_BOUT octets de chaque côté). Ça suffit
+            à séparer la plupart des fichiers qui ont la même taille par hasard ;
+        3°  il ne reste que les fichiers qui ont même taille, même début et même fin :
+            on calcule l'empreinte (blake2b) de tout leur contenu, par blocs.
+    Les empreintes sont calculées par plusieurs threads en parallèle, et peuvent être
+    gardées dans un cache (SQLite) d'une exécution à l'autre : tant qu'un fichier n'a
+    changé ni de taille ni de date on ne le relit pas.
+
+    Syntaxe :
+    ---------
+    python fichiers_doublons.py [--output|-o sortie]
+                                [--size-min|-s taille mini]
+                                [--extensions|-e extension(s)]
+                                [--exclude-dirs|-x répertoires exclus]
+                                [--cache|-c cache]
+                                [--workers|-w nb threads]
+                                [rep [rep ...]]
+
+    taille mini  : on ignore les fichiers plus petits. Format nnnko/mo/go, défaut 1 octet
+                   (les fichiers vides sont tous identiques, mais ça ne fait pas de place).
+    extension(s) et répertoires exclus : comme pour gipkodir.
+    cache        : nom du fichier (base SQLite, créée si elle n'existe pas) qui garde les
+                   empreintes.
+    nb threads   : nombre de fichiers lus en même temps. Défaut : 4.
+    rep          : le ou les répertoires à parcourir. Défaut : répertoire courant.
+
+    En sortie chaque groupe de fichiers identiques, du groupe qui permet de récupérer le
+    plus de place au plus petit, et à la fin le total récupérable (tous les exemplaires
+    sauf un de chaque groupe).
+
+    Un même fichier n'est compté qu'une fois, même s'il est trouvé sous plusieurs des
+    répertoires donnés (rep et un de ses sous-répertoires) ou sous plusieurs noms (liens
+    "en dur") : on ne gagnerait rien à le supprimer.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+    Version 1.1 2026-10-18
+        Les fichiers sont identifiés par leur numéro de fichier (st_dev, st_ino) : un
+        fichier trouvé deux fois (répertoires qui se recouvrent, liens en dur) n'est plus
+        son propre double.
+
+"""
+
+import argparse
+import os
+import sys
+import logging
+import hashlib
+import collections
+import concurrent.futures
+from gipkocache import CacheFichiers
+from gipkofileinfo import affichageHumain
+from gipkowalk import gipkowalk
+
+VERSION = '1.1'
+TAILLE_BOUT = 4096
+TAILLE_BLOC = 1024 * 1024
+WORKERS = 4
+fic_sortie = None
+
+
+# -----------------------------------------------------------------------------------------------------------------------------------------------------------
+def LireParametres():
+    parser = argparse.ArgumentParser(description='Recherche des fichiers en double')
+    parser.add_argument('--output', '-o', action='store', help='Nom du fichier en sortie')
+    parser.add_argument('--size-min', '-s', action='store', default='1', help='Ignorer les fichiers plus petits. Format : nnnko/mo/go')
+    parser.add_argument('--extensions', '-e', action='store', help='Extension(s) prise(s) en compte. format ".xt1,.xt2,.xtn"')
+    parser.add_argument('--exclude-dirs', '-x', action='store', help='Répertoires à ne pas parcourir, "jokers" séparés par des virgules')
+    parser.add_argument('--cache', '-c', action='store', help='Fichier cache des empreintes')
+    parser.add_argument('--workers', '-w', type=int, default=WORKERS, action='store', help='Nombre de fichiers lus en même temps')
+    parser.add_argument('reps', default=[os.path.realpath('.')], action='store', help='Répertoire(s) à examiner', nargs='*')
+    args = parser.parse_args()
+
+    #   On fait quelques vérifications :
+    for rep in args.reps:
+        if not os.path.isdir(rep):
+            raise NotADirectoryError('%s n\'est pas un répertoire' % rep)
+
+    return args.reps, args.output, args.size_min, args.extensions, args.exclude_dirs, args.cache, args.workers
+
+
+# ------------------------------------------------------------------------------------
+def output(ligne):
+    global fic_sortie
+
+    if fic_sortie:
+        fic_sortie.write(ligne)
+    else:
+        sys.stdout.write(ligne)
+
+
+# ------------------------------------------------------------------------------------
+def identite(nom_complet):
+    """
+        Ce qui identifie le fichier lui-même, quel que soit le nom par lequel on y
+        arrive : (périphérique, numéro de fichier), ou à défaut le chemin normalisé.
+    """
+    try:
+        st = os.stat(nom_complet)
+        if st.st_ino:
+            return st.st_dev, st.st_ino
+    except OSError:
+        pass
+    return os.path.normcase(os.path.abspath(nom_complet))
+
+
+# ------------------------------------------------------------------------------------
+def empreinte_bouts(nom_complet, taille):
+    """
+        Empreinte du début et de la fin du fichier. Si le fichier est assez petit c'est
+        l'empreinte de tout son contenu.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(nom_complet, 'rb') as f:
+        h.update(f.read(TAILLE_BOUT))
+        if taille > 2 * TAILLE_BOUT:
+            f.seek(-TAILLE_BOUT, os.SEEK_END)
+        h.update(f.read(TAILLE_BOUT))
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------------------------------
+def empreinte_complete(nom_complet, taille):
+    h = hashlib.blake2b()
+    with open(nom_complet, 'rb') as f:
+        while True:
+            bloc = f.read(TAILLE_BLOC)
+            if not bloc:
+                break
+            h.update(bloc)
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------------------------------
+def regrouper(fichiers, fonction, cache, workers):
+    """
+        fichiers : liste de tuples (nom complet, taille, date de modification).
+        Calcule l'empreinte de chaque fichier avec fonction (ou la prend dans le cache) et
+        renvoie les groupes de fichiers qui ont la même taille et la même empreinte, sauf
+        ceux qui n'ont qu'un fichier.
+    """
+    logger = logging.getLogger()
+
+    def calculer(fichier):
+        nom_complet, taille, date_mod = fichier
+        if cache is not None:
+            empreinte = cache.lire(nom_complet, taille, date_mod)
+            if empreinte is not None:
+                return empreinte
+
+        try:
+            empreinte = fonction(nom_complet, taille)
+        except OSError as e:
+            logger.error('Impossible de lire le fichier %s : %s' % (nom_complet, e))
+            return None
+
+        if cache is not None:
+            cache.ecrire(nom_complet, taille, date_mod, empreinte)
+        return empreinte
+
+    groupes = collections.defaultdict(list)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for fichier, empreinte in zip(fichiers, executor.map(calculer, fichiers)):
+            if empreinte is not None:
+                groupes[(fichier[1], empreinte)].append(fichier)
+
+    return [groupe for groupe in groupes.values() if len(groupe) > 1]
+
+
+# ------------------------------------------------------------------------------------
+def chercher_doublons(reps, size_min='1', extensions=None, exclude_dirs=None, nom_cache=None, workers=WORKERS):
+    """
+        Renvoie la liste des groupes de fichiers identiques, chaque groupe étant une liste
+        de tuples (nom complet, taille, date de modification).
+    """
+    logger = logging.getLogger()
+
+    par_taille = collections.defaultdict(list)
+    for rep in reps:
+        for D, fic, taille, date_mod in gipkowalk(rep, size_min=size_min, extensions=extensions, exclude_dirs=exclude_dirs):
+            par_taille[taille].append((os.path.join(D, fic), taille, date_mod))
+
+    #   On ne regarde l'identité que des fichiers qui ont la même taille qu'un autre.
+    candidats = []
+    vus = set()
+    for fichiers in par_taille.values():
+        if len(fichiers) < 2:
+            continue
+        uniques = []
+        for fichier in fichiers:
+            cle = identite(fichier[0])
+            if cle not in vus:
+                vus.add(cle)
+                uniques.append(fichier)
+        if len(uniques) > 1:
+            candidats.extend(uniques)
+    logger.info('%s fichiers de même taille qu\'un autre' % len(candidats))
+    par_taille = None
+
+    #   Les deux caches peuvent être dans le même fichier SQLite : on ne les ouvre pas en
+    #   même temps, une connexion bloquerait les écritures de l'autre.
+    doublons = []
+    a_lire = []
+    cache = CacheFichiers(nom_cache, 'empreintes_bouts') if nom_cache else None
+    try:
+        for groupe in regrouper(candidats, empreinte_bouts, cache, workers):
+            if groupe[0][1] <= 2 * TAILLE_BOUT:
+                #   L'empreinte des bouts était celle de tout le fichier.
+                doublons.append(groupe)
+            else:
+                a_lire.extend(groupe)
+    finally:
+        if cache is not None:
+            cache.fermer()
+
+    logger.info('%s fichiers à lire en entier' % len(a_lire))
+    cache = CacheFichiers(nom_cache, 'empreintes') if nom_cache else None
+    try:
+        doublons.extend(regrouper(a_lire, empreinte_complete, cache, workers))
+    finally:
+        if cache is not None:
+            cache.fermer()
+
+    #   Les groupes qui rapportent le plus de place d'abord.
+    doublons.sort(key=lambda groupe: -groupe[0][1] * (len(groupe) - 1))
+    for groupe in doublons:
+        groupe.sort()
+    return doublons
+
+
+# ------------------------------------------------------------------------------------
+def lister_doublons(doublons):
+    total = 0
+    for groupe in doublons:
+        taille = groupe[0][1]
+        recuperable = taille * (len(groupe) - 1)
+        total += recuperable
+        output('\n%s fichiers identiques de %s, %s récupérables :\n' %
+               (len(groupe), affichageHumain(taille), affichageHumain(recuperable)))
+        for nom_complet, taille, date_mod in groupe:
+            output('\t%s\n' % nom_complet)
+
+    output('\n%s groupes de fichiers identiques, %s récupérables au total\n' % (len(doublons), affichageHumain(total)))
+
+
+# ------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    reps, nom_fic_sortie, size_min, extensions, exclude_dirs, nom_cache, workers = LireParametres()
+
+    if nom_fic_sortie:
+        fic_sortie = open(nom_fic_sortie, 'w')
+
+    lister_doublons(chercher_doublons(reps, size_min, extensions, exclude_dirs, nom_cache, workers))
+
+    if fic_sortie:
+        fic_sortie.close()
@@ -25,12 +25,21 @@
     guillemets si un nom contient des espaces.
     Typiquement on mettra -e "Administrateurs , Système, Domain Admins, Administrateurs de l'entreprise"
 
+    L'argument -x, --exclure-reps, donne la liste des répertoires à ne pas parcourir, séparés
+    par des virgules. Ce sont des "jokers" comparés au nom du répertoire, ou des expressions
+    régulières préfixées par "re:" cherchées dans le nom complet (voir la doc de gipkowalk).
+    Typiquement on mettra -x "~snapshot,$RECYCLE.BIN"
+
     L'argument -f, --fichiers, indique qu'on veut aussi afficher les permissions des fichiers.
     Par défaut on ne traite que les répertoires.
 
     L'argument -a, --all, indique qu'on veut aussi afficher les permissions des groupes système comme
     les administrateurs qui ont par définition un contrôle total partout.
 
+    L'argument -b, --backend, choisit d'où viennent les permissions : win32 (windows), posix
+    (droits et ACL POSIX) ou memoire (permissions synthétiques, pour les essais et les mesures
+    sans serveur). Par défaut win32 si pywin32 est installé, posix sinon.
+
     Historique :
 
     Version 1.1 2017-01-04
@@ -66,6 +75,19 @@
         le KeyError est normal, donc except = continue.
         Si on a une autre exception on la loggue
 
+    Version 1.5 2026-10-18
+        perm_load parcourt l'arborescence avec gipkowalk.parcourir au lieu de os.walk : les
+        répertoires au-delà du niveau maximal ne sont plus listés du tout (avant on les listait
+        pour rien, le niveau était testé après coup en comptant les '\\').
+        Argument -x, --exclure-reps : répertoires exclus du parcours.
+
+    Version 1.6 2026-10-18
+        Argument -b, --backend : backend de sécurité de gipkofileinfo. Le programme tourne
+        aussi sous Linux.
+
+    Version 1.7 2026-10-18
+        perm_load lit propriétaire et permissions en une seule fois (gipkofileinfo.get_security).
+
 """
 
 import argparse
@@ -74,8 +96,9 @@ import sys
 import logging
 import traceback
 import gipkofileinfo
+from gipkowalk import parcourir
 
-VERSION = '1.4'
+VERSION = '1.7'
 fic_sortie = None
 LISTE_ADMINS = ['administrateurs de l\'entreprise', 'administrateurs du schéma', 'public folder management', 'domain admins',
                 'administrateurs', 'administrators', 'système']
@@ -96,7 +119,9 @@ def LireParametres():
     parser.add_argument('--output', '-o', action='store', help='Nom de base des fichiers en sortie')
     parser.add_argument('--all', '-a', action='count', help='Affiche aussi les groupes d\'administration (Par défaut ils sont exclus)')
     parser.add_argument('--niveau', '-n', type=int, action='store', help='nombre de niveaux maximal à afficher')
+    parser.add_argument('--exclure-reps', '-x', action='store', help='Répertoires à ne pas parcourir', default='')
     parser.add_argument('--fichiers', '-f', action='count', help='Afficher AUSSI les permissions des fichiers')
+    parser.add_argument('--backend', '-b', choices=sorted(gipkofileinfo.BACKENDS), action='store', help='Origine des permissions')
     parser.add_argument('nomRepBase', default=os.path.realpath('.'), action='store', help='Nom du répertoire à examiner', nargs='?')
     args = parser.parse_args()
 
@@ -109,7 +134,7 @@ def LireParametres():
     if args.all is None:
         liste_exclusions += LISTE_ADMINS
 
-    return args.nomRepBase, args.niveau, args.output, liste_exclusions, args.fichiers
+    return args.nomRepBase, args.niveau, args.output, liste_exclusions, args.fichiers, args.exclure_reps, args.backend
 
 
 # ------------------------------------------------------------------------------------
@@ -123,10 +148,10 @@ def output(ligne):
 
 
 # ------------------------------------------------------------------------------------
-def perm_load(nomRepBase, niveaumax, fichiers_aussi, progression=False, infos_serveur={}):
+def perm_load(nomRepBase, niveaumax, fichiers_aussi, progression=False, infos_serveur={}, exclure_reps=None):
     """
         Cette fonction charge toutes les permissions de tous les répertoires (et fichiers si fichiers_aussi = True)
-        jusqu'au niveau niveaumax.
+        jusqu'au niveau niveaumax, sauf ceux exclus par exclure_reps (voir exclude_dirs dans gipkowalk).
         Elle retourne une liste de répertoire et un dictionnaire de fichiers.
 
         La mise en forme se fera dans un autre module
@@ -135,34 +160,35 @@ def perm_load(nomRepBase, niveaumax, fichiers_aussi, progression=False, infos_se
     etapes = '\\|/-'
     nb = 0
 
-    if nomRepBase[-1] != '\\':
-        nomRepBase += '\\'
+    if nomRepBase[-1] != os.sep:
+        nomRepBase += os.sep
 
-    if niveaumax:
-        niveaumax += nomRepBase.count('\\') - 1
-
-    liste_dirs = [[nomRepBase, gipkofileinfo.get_owner(nomRepBase), gipkofileinfo.get_perm(nomRepBase, infos_serveur)]]
+    securite = gipkofileinfo.get_security(nomRepBase, infos_serveur)
+    liste_dirs = [[nomRepBase, securite.proprietaire, securite.permissions]]
     #   Parce que dans le "walk" il n'est pas renvoyé lui-même...
     liste_fics = {}
 
-    for D, dirs, fics in os.walk(nomRepBase):
+    #   niveaumax compte le répertoire de base : avec 1 on n'a que lui, avec 2 on liste le
+    #   répertoire de base (ses sous-répertoires sont dans la liste) mais pas ses
+    #   sous-répertoires eux-mêmes, etc. D'où max_depth = niveaumax - 1.
+    if niveaumax == 1:
+        parcours = []
+    else:
+        parcours = parcourir(nomRepBase, max_depth=niveaumax - 1 if niveaumax else None, exclude_dirs=exclure_reps)
+
+    for D, dirs, fics in parcours:
         if progression:
             sys.stdout.write('\r\t%s' % etapes[nb % 4])
 
-        if niveaumax:
-            niveau = D.count('\\')
-            if niveau >= niveaumax:
-                continue
-
         for dir in dirs:
             nomComplet = os.path.join(D, dir)
-            niveau = nomComplet.count('\\')
 
             if progression:
                 sys.stdout.write('\r\t%s' % etapes[nb % 4])
                 nb += 1
 
-            liste_dirs.append([nomComplet, gipkofileinfo.get_owner(nomComplet), gipkofileinfo.get_perm(nomComplet, infos_serveur)])
+            securite = gipkofileinfo.get_security(nomComplet, infos_serveur)
+            liste_dirs.append([nomComplet, securite.proprietaire, securite.permissions])
 
         if fichiers_aussi:
             liste_fics[D] = []
@@ -173,7 +199,8 @@ def perm_load(nomRepBase, niveaumax, fichiers_aussi, progression=False, infos_se
                     sys.stdout.write('\r\t%s' % etapes[nb % 4])
                     nb += 1
 
-                liste_fics[D].append([fic, gipkofileinfo.get_owner(nomComplet), gipkofileinfo.get_perm(nomComplet, infos_serveur)])
+                securite = gipkofileinfo.get_security(nomComplet, infos_serveur)
+                liste_fics[D].append([fic, securite.proprietaire, securite.permissions])
 
     """
         Pour faire plus propre on trie tout ça
@@ -464,8 +491,9 @@ def perm_print(liste_dirs, liste_fics, nom_base_sorties, liste_exclusions, infos
 
 
 # ------------------------------------------------------------------------------------
-def liste_permissions(nomRepBase, niveaumax, nom_base_sorties, liste_exclusions, fichiers_aussi, progression=False, infos_serveur={}):
-    repertoires, fichiers = perm_load(nomRepBase, niveaumax, fichiers_aussi, progression, infos_serveur)
+def liste_permissions(nomRepBase, niveaumax, nom_base_sorties, liste_exclusions, fichiers_aussi, progression=False, infos_serveur={},
+                      exclure_reps=None):
+    repertoires, fichiers = perm_load(nomRepBase, niveaumax, fichiers_aussi, progression, infos_serveur, exclure_reps)
     perm_print(repertoires, fichiers, nom_base_sorties, liste_exclusions, infos_serveur)
 
 
@@ -490,5 +518,8 @@ if __name__ == '__main__':
     fichiers_aussi = False
     """
 
-    nomRepBase, niveaumax, nom_base_sorties, liste_exclusions, fichiers_aussi = LireParametres()
-    liste_permissions(nomRepBase, niveaumax, nom_base_sorties, liste_exclusions, fichiers_aussi, progression=progression, infos_serveur=infos_serveur)
+    nomRepBase, niveaumax, nom_base_sorties, liste_exclusions, fichiers_aussi, exclure_reps, nom_backend = LireParametres()
+    if nom_backend:
+        gipkofileinfo.set_backend(nom_backend)
+    liste_permissions(nomRepBase, niveaumax, nom_base_sorties, liste_exclusions, fichiers_aussi, progression=progression, infos_serveur=infos_serveur,
+                      exclure_reps=exclure_reps)
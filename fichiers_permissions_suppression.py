@@ -37,7 +37,6 @@ import logging
 import logging.handlers
 import traceback
 import gipkofileinfo
-import win32security
 
 VERSION = '1.1'
 
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Cache persistant d'informations sur des fichiers, dans une base SQLite.
+
+    La clé est le triplet (nom complet, taille, date de modification) : si le fichier
+    a changé de taille ou de date depuis qu'on l'a mis en cache, l'information qu'on
+    avait n'est plus valable et on ne la renvoie pas.
+
+    Syntaxe :
+        cache = CacheFichiers('c:\\temp\\cache.db', 'binaires')
+        valeur = cache.lire(nom_complet, taille, date_mod)    # None si absent ou périmé
+        cache.ecrire(nom_complet, taille, date_mod, valeur)
+        cache.fermer()
+
+    Plusieurs caches (tables) différents peuvent partager le même fichier.
+    Utilisable depuis plusieurs threads : les accès sont protégés par un verrou.
+    Les écritures sont validées par paquets (et à la fermeture), pas une par une.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import sqlite3
+import threading
+
+VERSION = '1.0'
+ECRITURES_PAR_COMMIT = 1000
+
+
+#   -------------------------------------------------------------------------------
+class CacheFichiers:
+    """
+        nom_fichier : fichier SQLite. None pour un cache en mémoire, qui ne dure que le
+                      temps du programme.
+        table       : nom du cache dans ce fichier.
+    """
+    def __init__(self, nom_fichier=None, table='cache'):
+        self.table = table
+        self.verrou = threading.Lock()
+        self.connexion = sqlite3.connect(nom_fichier or ':memory:', check_same_thread=False)
+        self.connexion.execute('CREATE TABLE IF NOT EXISTS %s (chemin TEXT PRIMARY KEY, taille INTEGER, '
+                               'mtime REAL, valeur)' % table)
+        self.connexion.commit()
+        self.nb_ecritures = 0
+
+    #   -------------------------------------------------------------------------------
+    def lire(self, chemin, taille, mtime):
+        with self.verrou:
+            ligne = self.connexion.execute('SELECT valeur FROM %s WHERE chemin = ? AND taille = ? AND mtime = ?'
+                                           % self.table, (chemin, taille, mtime)).fetchone()
+        return ligne[0] if ligne else None
+
+    #   -------------------------------------------------------------------------------
+    def ecrire(self, chemin, taille, mtime, valeur):
+        with self.verrou:
+            self.connexion.execute('INSERT OR REPLACE INTO %s (chemin, taille, mtime, valeur) VALUES (?, ?, ?, ?)'
+                                   % self.table, (chemin, taille, mtime, valeur))
+            self.nb_ecritures += 1
+            if self.nb_ecritures % ECRITURES_PAR_COMMIT == 0:
+                self.connexion.commit()
+
+    #   -------------------------------------------------------------------------------
+    def fermer(self):
+        with self.verrou:
+            self.connexion.commit()
+            self.connexion.close()
@@ -34,6 +34,20 @@
                        [--extensions|-e extension(s)]
                        [--pattern|-p regexp nom fichier]
                        [--texte-cherche|-t regexp contenu fichier]
+                       [--motif|-M nom=regexp [--motif|-M nom=regexp ...]]
+                       [--max-octets|-m taille maxi lue]
+                       [--cache-binaires|-c cache]
+                       [--mmap seuil mmap]
+                       [--processus|-P nb processus]
+                       [--index|-i index [--verification proportion]]
+                       [--catalogue|-C index]
+                       [--max-depth|-n niveaux]
+                       [--exclude-dirs|-x répertoires exclus]
+                       [--stream|-f]
+                       [--sort date|size|name [--reverse|-r] [--sort-ram mémoire tri]]
+                       [--top N [--by size|mtime]]
+                       [--summary [--summary-depth profondeur synthèse]]
+                       [--format text|csv|jsonl|bin]
                        [--log-level|-l niveau log]
                        [--human-display|-H]
                        [rep]
@@ -86,6 +100,120 @@
                    Si cet argument est spécifié et qu'un fichier ne peut pas
                    être lu (pas du texte, problème d'encodage etc) ce fichier
                    sera éliminé de la liste des fichiers trouvés.
+                   Le fichier est lu par blocs, on s'arrête dès que l'expression
+                   est trouvée.
+
+    nom=regexp   : une expression régulière nommée à chercher dans le contenu.
+                   On peut répéter l'argument autant de fois qu'on veut, chaque
+                   fichier ne sera lu qu'une fois pour toutes les expressions.
+                   Sont retenus les fichiers qui contiennent au moins une des
+                   expressions (et aussi celle de -t si elle est spécifiée), et
+                   pour chacun on affiche en fin de ligne, entre crochets, les
+                   noms des expressions trouvées.
+                   Ex : -M iban="FR\d{2} ?\d{4}" -M mdp="password *="
+
+    taille maxi lue :
+                   avec -t, on ne lira pas plus que ça dans chaque fichier. Même
+                   format que taille mini. Défaut : on lit tout le fichier.
+
+    cache        : avec -t, nom d'un fichier (base SQLite, créée si elle n'existe
+                   pas) où on garde la liste des fichiers reconnus comme binaires
+                   (exécutables, archives, images...). Aux recherches suivantes ils
+                   ne seront même plus ouverts, tant qu'ils n'ont pas changé.
+                   Sans cache les fichiers binaires sont quand même reconnus d'après
+                   leurs premiers octets et ne sont pas lus jusqu'au bout.
+
+    seuil mmap   : avec -t, les fichiers au moins aussi gros que ça (même format
+                   que taille mini) sont projetés en mémoire et l'expression
+                   régulière est cherchée directement dans les octets, sans
+                   décodage. Nettement plus rapide sur les gros fichiers, mais
+                   l'insensibilité à la casse ne marche plus pour les lettres
+                   accentuées. Défaut : pas de projection, on lit par blocs.
+
+    nb processus : avec -t ou -M, la recherche dans le contenu des fichiers est
+                   répartie entre ce nombre de processus. Intéressant si les
+                   expressions régulières sont compliquées et que c'est le
+                   processeur qui limite. Défaut : un seul processus.
+
+    index        : nom d'un fichier (base SQLite, créée si elle n'existe pas) qui
+                   garde le contenu des répertoires d'une exécution à l'autre.
+                   Les répertoires dont la date de modification n'a pas changé
+                   ne sont pas relus. Pour les rapports quotidiens sur une
+                   arborescence qui change peu c'est beaucoup plus rapide.
+                   ATTENTION, la modification d'un fichier existant ne change
+                   pas la date de son répertoire : sa taille et sa date peuvent
+                   être celles de la fois précédente.
+
+    proportion   : avec --index, proportion (entre 0 et 1) des répertoires non
+                   modifiés qu'on relit quand même pour contrôler l'index. Les
+                   différences trouvées sont inscrites dans le log.
+                   Défaut : 0, aucune vérification.
+
+    --catalogue  : au lieu de parcourir l'arborescence, cherche les fichiers dans un
+                   index (voir --index) rempli par les exécutions précédentes.
+                   Quelques millisecondes au lieu de plusieurs minutes, mais on
+                   a les fichiers tels qu'ils étaient au dernier parcours. Pour
+                   mettre le catalogue à jour il suffit d'une exécution avec
+                   --index (seuls les répertoires modifiés sont relus), par
+                   exemple avec --summary pour ne pas afficher toute la liste.
+                   Les tailles, dates et extensions sont indexées. Les autres
+                   critères sont appliqués ensuite (-t et -M lisent quand même
+                   les fichiers).
+                   Ex : gipkodir \\\\serveur\\partage -C c:\\temp\\index.db -s 1G
+
+    niveaux      : nombre de niveaux parcourus. 1 : seulement les fichiers du
+                   répertoire de base, 2 : plus ceux de ses sous-répertoires etc.
+                   Défaut : toute l'arborescence.
+
+    répertoires exclus : répertoires à ne pas parcourir, séparés par des virgules.
+                   "Jokers" comparés au nom du répertoire sans tenir compte de la
+                   casse, ou expressions régulières préfixées par "re:" cherchées
+                   dans le nom complet. Ex : -x "~snapshot,$RECYCLE.BIN,node_modules"
+                   Ces répertoires ne sont même pas listés.
+
+    --stream     : les lignes sont écrites au fur et à mesure que les fichiers sont
+                   trouvés, au lieu d'attendre la fin du parcours. La mémoire ne
+                   dépend plus du nombre de fichiers trouvés.
+
+    --sort       : trie les résultats par date, taille ou nom complet (ordre
+                   croissant, décroissant avec --reverse). Si les résultats ne
+                   tiennent pas dans la mémoire de tri ils sont triés par paquets
+                   écrits dans des fichiers temporaires puis fusionnés (gipkotri).
+                   Défaut : pas de tri, l'ordre du parcours.
+
+    mémoire tri  : avec --sort, mémoire maximale utilisée pour le tri. Même format
+                   que taille mini. Défaut : 100Mo.
+
+    --top N      : n'affiche que les N plus gros fichiers (--by size, défaut) ou les
+                   N plus récents (--by mtime), du premier au N-ième. Seuls les N
+                   meilleurs sont gardés pendant le parcours (tas de taille N) :
+                   la mémoire ne dépend pas du nombre de fichiers. Se combine
+                   avec tous les critères de sélection. --sort et --stream sont
+                   alors ignorés.
+
+    --summary    : au lieu de la liste des fichiers, affiche le nombre de fichiers et
+                   leur volume total par répertoire, par extension et par
+                   ancienneté (moins d'un jour, d'une semaine... plus de 5 ans).
+                   Calculé au fil du parcours avec de simples compteurs, on ne
+                   garde pas la liste des fichiers : utilisable sur n'importe
+                   quelle arborescence. Se combine avec les critères de sélection.
+
+    profondeur synthèse : avec --summary, les fichiers sont comptés dans leur
+                   répertoire de ce niveau. 0 : un seul total pour rep, 1 : un
+                   total par sous-répertoire de rep (défaut), etc.
+
+    --format     : format de sortie.
+                   text  : lignes à largeur fixe, pour la lecture (défaut).
+                   csv   : une ligne par fichier, séparateur tab, avec une ligne de
+                           titres : date (timestamp), date ISO, taille, nom complet
+                           et motifs trouvés séparés par des virgules.
+                   jsonl : un objet JSON par ligne (repertoire, fichier, taille,
+                           date_mod et éventuellement motifs).
+                   bin   : format binaire compact, à relire avec gipkobin.lire.
+                           Beaucoup plus rapide à relire que du texte.
+                   Sauf pour text, les résultats sont écrits au fur et à mesure
+                   comme avec --stream (à moins de --sort ou --top). Sans effet
+                   avec --summary.
 
     niveau log   : Quel type d'évènement on inscrira dans le journal.
                    Défaut : warning (30). Le niveau debug (10) liste les
@@ -129,6 +257,57 @@
         première expérience a montré qu'il y avait des farceurs qui 
         utilisent (inutilement) des encodages à la con.
 
+    Version 1.5 2026-10-18
+        Le parcours et la sélection sont faits par gipkowalk, avec les critères
+        compilés dans un gipkofilter.Filter. Il n'y a plus deux versions du même
+        code à maintenir.
+
+    Version 1.6 2026-10-18
+        La recherche dans le contenu se fait par blocs, sans charger tout le
+        fichier en mémoire. Argument --max-octets.
+
+    Version 1.7 2026-10-18
+        Les fichiers binaires ne sont plus lus. Argument --cache-binaires.
+
+    Version 1.8 2026-10-18
+        Argument --mmap.
+
+    Version 1.9 2026-10-18
+        Argument --motif : plusieurs expressions régulières nommées cherchées en une
+        seule lecture de chaque fichier.
+
+    Version 1.10 2026-10-18
+        Argument --processus : recherche dans le contenu par plusieurs processus.
+
+    Version 1.11 2026-10-18
+        Arguments --index et --verification.
+
+    Version 1.12 2026-10-18
+        Arguments --max-depth et --exclude-dirs.
+
+    Version 1.13 2026-10-18
+        Les résultats sont gardés en colonnes (gipkowalk_lots) au lieu d'une liste par
+        fichier : beaucoup moins de mémoire sur les grosses arborescences.
+
+    Version 1.14 2026-10-18
+        Argument --stream : écriture au fil de l'eau. Arguments --sort, --reverse et
+        --sort-ram : tri externe à mémoire bornée (gipkotri).
+        Le fichier de sortie est écrit avec un tampon de 1Mo.
+
+    Version 1.15 2026-10-18
+        Arguments --top et --by : les N plus gros ou plus récents fichiers.
+
+    Version 1.16 2026-10-18
+        Arguments --summary et --summary-depth : synthèse par répertoire, extension et
+        ancienneté (gipkosynthese).
+
+    Version 1.17 2026-10-18
+        Argument --format : sorties csv, jsonl et binaire (gipkobin). Dans ces formats
+        l'hélice n'est affichée que si les résultats vont dans un fichier.
+
+    Version 1.18 2026-10-18
+        Argument --catalogue : recherche dans l'index sans parcourir l'arborescence.
+
 """
 
 import argparse
@@ -137,12 +316,22 @@ import sys
 import logging
 import logging.handlers
 import traceback
-import datetime
-import re
+import csv
+import json
+import heapq
 import itertools
+import gipkobin
+import gipkotri
+from gipkosynthese import Synthese
 from gipkofileinfo import *
+from gipkofilter import Filter
+from gipkowalk import gipkowalk, gipkowalk_lots, catalogue
 
 fic_sortie = None
+helice_active = True
+TAILLE_TAMPON = 1024 * 1024
+CLES_TRI = {'date': lambda r: r[3], 'size': lambda r: r[2], 'name': lambda r: os.path.join(r[0], r[1])}
+CLES_TOP = {'size': CLES_TRI['size'], 'mtime': CLES_TRI['date']}
 
 
 # -----------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -156,8 +345,6 @@ def LireParametres():
     nom = os.path.splitext(os.path.basename(Fpgm))[0]
     nomFichierLog = os.path.join(rep, nom) + '.log'
 
-    patSize = '^\d{1,3}[kmgt]?o?$'
-
     parser = argparse.ArgumentParser(description='Dir amélioré. gipkodir --doc pour voir la doc complète')
     parser.add_argument('--output', '-o', action='store', help='Nom du fichier qui contiendra le résultat. Si absent, affichage à l\'écran.')
     parser.add_argument('--date-min', '-d', action='store', help='Ne prendre en compte que les fichiers postérieurs à cette date (format ISO, avec ou sans l\'heure)')
@@ -167,6 +354,25 @@ def LireParametres():
     parser.add_argument('--extensions', '-e', action='store', help='Extension(s) prise(s) en compte. format ".xt1,.xt2,.xtn"')
     parser.add_argument('--pattern', '-p', action='store', help='Expression régulière de sélection du nom de fichier')
     parser.add_argument('--texte-cherche', '-t', action='store', help='Expression régulière à chercher dans le contenu du fichier')
+    parser.add_argument('--max-octets', '-m', action='store', help='Avec -t, nombre maximum d\'octets lus dans chaque fichier. Format : nnnko/mo/go')
+    parser.add_argument('--cache-binaires', '-c', action='store', help='Avec -t, fichier cache de la liste des fichiers binaires')
+    parser.add_argument('--mmap', action='store', help='Avec -t, taille à partir de laquelle on cherche dans le fichier projeté en mémoire. Format : nnnko/mo/go')
+    parser.add_argument('--motif', '-M', action='append', help='Expression régulière nommée à chercher dans le contenu, format nom=regexp. Peut être répété')
+    parser.add_argument('--processus', '-P', type=int, action='store', help='Avec -t ou -M, nombre de processus pour la recherche dans le contenu')
+    parser.add_argument('--index', '-i', action='store', help='Fichier index du contenu des répertoires, pour ne pas relire ceux qui n\'ont pas changé')
+    parser.add_argument('--verification', action='store', type=float, default=0, help='Avec --index, proportion des répertoires relus pour vérification (0 à 1)')
+    parser.add_argument('--catalogue', '-C', action='store', help='Chercher dans cet index au lieu de parcourir l\'arborescence')
+    parser.add_argument('--max-depth', '-n', type=int, action='store', help='Nombre de niveaux parcourus')
+    parser.add_argument('--exclude-dirs', '-x', action='store', help='Répertoires à ne pas parcourir, "jokers" séparés par des virgules')
+    parser.add_argument('--stream', '-f', action='count', help='Écrit les résultats au fur et à mesure')
+    parser.add_argument('--sort', choices=sorted(CLES_TRI), action='store', help='Trie les résultats')
+    parser.add_argument('--reverse', '-r', action='count', help='Avec --sort, ordre décroissant')
+    parser.add_argument('--sort-ram', default='100M', action='store', help='Avec --sort, mémoire maximale du tri. Format : nnnko/mo/go')
+    parser.add_argument('--top', type=int, action='store', help='N\'affiche que les N plus gros (ou plus récents) fichiers')
+    parser.add_argument('--by', choices=sorted(CLES_TOP), default='size', action='store', help='Avec --top, critère : taille ou date')
+    parser.add_argument('--summary', action='count', help='Synthèse par répertoire, extension et ancienneté au lieu de la liste des fichiers')
+    parser.add_argument('--summary-depth', type=int, default=1, action='store', help='Avec --summary, profondeur des répertoires de la synthèse')
+    parser.add_argument('--format', choices=['text', 'csv', 'jsonl', 'bin'], default='text', action='store', help='Format de sortie')
     parser.add_argument('--log-level', '-l', default='30', action='store', help='Niveau de log')
     parser.add_argument('--human-display', '-H', action='count', help='Affichage lisible pour un humain')
     parser.add_argument('--doc', action='count', help='Affiche la doc complète de ce module')
@@ -181,85 +387,14 @@ def LireParametres():
 
 
     #   On fait quelques vérifications :
-    if not os.path.isdir(args.nomRepBase):
+    #   (Avec le catalogue on n'a pas besoin d'accéder à l'arborescence.)
+    if not args.catalogue and not os.path.isdir(args.nomRepBase):
         raise NotADirectoryError('%s n\'est pas un répertoire' % args.nomRepBase) from None
 
-    if args.date_min:
-        try:
-            dateMin = datetime.datetime.strptime(args.date_min, '%Y-%m-%dT%H:%M:%S').timestamp()
-        except:
-            try:
-                dateMin = datetime.datetime.strptime(args.date_min, '%Y-%m-%d %H:%M:%S').timestamp()
-            except:
-                try:
-                    dateMin = datetime.datetime.strptime(args.date_min, '%Y-%m-%d').timestamp()
-                except:
-                    raise ValueError('Date min incorrecte, %s' % args.date_min) from None
-    else:
-        dateMin = None
-
-    if args.date_max:
-        try:
-            dateMax = datetime.datetime.strptime(args.date_max, '%Y-%m-%dT%H:%M:%S').timestamp()
-        except:
-            try:
-                dateMax = datetime.datetime.strptime(args.date_max, '%Y-%m-%d %H:%M:%S').timestamp()
-            except:
-                try:
-                    dateMax = datetime.datetime.strptime(args.date_max, '%Y-%m-%d').timestamp()
-                except:
-                    raise ValueError('Date max incorrecte, %s' % args.date_max) from None
-    else:
-        dateMax = None
-
-    if args.size_min:
-        if not re.search(patSize, args.size_min, re.I):
-            raise ValueError('Taille min incorrecte, %s' % args.size_min) from None
-        else:
-            facteur = 1000000000000 if re.search('t', args.size_min, re.I) \
-                else (1000000000 if re.search('g', args.size_min, re.I)
-                      else (1000000 if re.search('m', args.size_min, re.I)
-                            else (1000 if re.search('k', args.size_min, re.I)
-                                  else 1)))
-            sizeMin = int(re.search('^\d+', args.size_min).group()) * facteur
-    else:
-        sizeMin = None
-
-    if args.size_max:
-        if not re.search(patSize, args.size_max, re.I):
-            raise ValueError('Taille max incorrecte, %s' % args.size_max) from None
-        else:
-            facteur = 1000000000000 if re.search('t', args.size_max, re.I) \
-                else (1000000000 if re.search('g', args.size_max, re.I)
-                      else (1000000 if re.search('m', args.size_max, re.I)
-                            else (1000 if re.search('k', args.size_max, re.I)
-                                  else 1)))
-            sizeMax = int(re.search('^\d+', args.size_max).group()) * facteur
-    else:
-        sizeMax = None
-
-    if args.extensions:
-        extensions = args.extensions.split(',')
-    else:
-        extensions = None
-
-    if args.pattern:
-        try:
-            pattern = re.compile(args.pattern, re.I)
-        except:
-            raise ValueError('%s n\'est pas une expression régulière correcte' % pattern) from None
-
-    else:
-        pattern = None
-
-    if args.texte_cherche:
-        try:
-            texte_cherche = re.compile(args.texte_cherche, re.I)
-        except:
-            raise ValueError('%s n\'est pas une expression régulière correcte' % texte_cherche) from None
-
-    else:
-        texte_cherche = None
+    filtre = Filter(date_min=args.date_min, date_max=args.date_max, size_min=args.size_min, size_max=args.size_max,
+                    extensions=args.extensions, pattern=args.pattern, texte_cherche=args.texte_cherche,
+                    max_octets=args.max_octets, cache_binaires=args.cache_binaires,
+                    seuil_mmap=args.mmap, motifs=args.motif)
 
     if args.output:
         ficSortie = args.output
@@ -274,20 +409,18 @@ def LireParametres():
     humainementLisible = True if args.human_display else False
     afficherDoc = True if args.doc else False
 
-    return args.nomRepBase, dateMin, dateMax, sizeMin, sizeMax, extensions, pattern, ficSortie, nomFichierLog, niveauLog, humainementLisible, afficherDoc, texte_cherche
+    parcours = {'processus': args.processus, 'index': args.index, 'verification': args.verification,
+                'max_depth': args.max_depth, 'exclude_dirs': args.exclude_dirs}
+    sortie = {'flux': bool(args.stream), 'tri': args.sort, 'decroissant': bool(args.reverse), 'memoire_tri': args.sort_ram,
+              'top': args.top, 'par': args.by, 'synthese': bool(args.summary), 'profondeur_synthese': args.summary_depth,
+              'format': args.format}
+    if args.format != 'text' or args.catalogue:
+        sortie['flux'] = True
+    if args.catalogue:
+        parcours['index'] = args.catalogue
+        parcours['catalogue'] = True
 
-
-# ------------------------------------------------------------------------------------
-def tableBoms():
-    """
-        Renvoie une table des encodages connus en fonction des premiers octets du fichier
-        quand on l'ouvre avec l'encodage par défaut.
-    """
-    bom8 = '\xef\xbb\xbf'
-    bom16be = '\xfe\xff'
-    bom16le = '\xff\xfe'
-    boms = {bom8 : 'utf-8', bom16be : 'utf-16-be', bom16le: 'utf-16-le'}
-    return boms
+    return args.nomRepBase, filtre, ficSortie, nomFichierLog, niveauLog, humainementLisible, afficherDoc, parcours, sortie
 
 
 # ------------------------------------------------------------------------------------
@@ -301,6 +434,38 @@ def output(ligne):
         sys.stdout.write(ligne)
 
 
+# ------------------------------------------------------------------------------------
+def formater(resultat, humainementLisible):
+    """
+        La ligne affichée pour un résultat de gipkowalk.
+    """
+    D, fic, taille, dateMod = resultat[:4]
+    if humainementLisible:
+        ligne = dateISO(dateMod) + '   {: >10s}'.format(affichageHumain(taille)) + '   ' + os.path.join(D, fic)
+    else:
+        ligne = '{: >15.3f}'.format(dateMod) + ' ' + dateISO(dateMod) + ' ' + '{: >12d}'.format(taille) + ' ' + \
+            os.path.join(D, fic)
+    if len(resultat) > 4:
+        ligne += '   [' + ', '.join(resultat[4]) + ']'
+    return ligne
+
+
+# ------------------------------------------------------------------------------------
+def avec_helice(elements):
+    """
+        Cosmétique : fait tourner la petite hélice à chaque élément.
+    """
+    if not helice_active:
+        yield from elements
+        return
+
+    helice = itertools.cycle(['\r\t|', '\r\t/', '\r\t-', '\r\t\\'])
+    for e in elements:
+        print(next(helice), end='')
+        yield e
+    print('\r')
+
+
 # -----------------------------------------------------------------------------------------------------------------------------------------------------------
 def creer_logger(nomFichierLog, niveauLog):
     logger = logging.getLogger()
@@ -315,7 +480,8 @@ def creer_logger(nomFichierLog, niveauLog):
 
 # ------------------------------------------------------------------------------------
 if __name__ == '__main__':
-    nomRepBase, dateMin, dateMax, sizeMin, sizeMax, extensions, pattern, ficSortie, nomFichierLog, niveauLog, humainementLisible, afficherDoc, texte_cherche = LireParametres()
+    nomRepBase, filtre, ficSortie, nomFichierLog, niveauLog, humainementLisible, afficherDoc, parcours, \
+        sortie = LireParametres()
 
     if afficherDoc:
         print(__doc__)
@@ -324,112 +490,76 @@ if __name__ == '__main__':
     logger = logging.getLogger()
     creer_logger(nomFichierLog, niveauLog)
     logger.info('Début programme')
-    helice = itertools.cycle(['\r\t|', '\r\t/', '\r\t-', '\r\t\\'])
-    boms = tableBoms()
 
     if ficSortie:
         try:
-            fic_sortie = open(ficSortie, 'w')
+            if sortie['format'] == 'bin' and not sortie['synthese']:
+                fic_sortie = open(ficSortie, 'wb', buffering=TAILLE_TAMPON)
+            else:
+                fic_sortie = open(ficSortie, 'w', buffering=TAILLE_TAMPON, newline='' if sortie['format'] == 'csv' else None)
         except:
             raise IOError('Impossible d\'ouvrir le fichier %s en écriture' % ficSortie) from None
 
-    liste = []
-
-    for D, dirs, fics in os.walk(nomRepBase):
-        for fic in fics:
-            nomComplet = os.path.join(D, fic)
-            print(next(helice), end='')
-
-            #   Premier test tout simple : le filtre sur les extensions
-            if extensions and os.path.splitext(os.path.basename(nomComplet))[1] not in extensions:
-                logger.debug('%s éliminé à cause de son extension' % nomComplet)
-                continue
-
-            #   Deuxième test, simple aussi : le filtre sur la pattern
-            #   if pattern and not re.search(pattern, fic):
-            if pattern and not re.search(pattern, nomComplet):
-                logger.debug('%s éliminé par l\'expression régulière sur le nom' % nomComplet)
-                continue
-
-            #   Maintenant on a besoin de la taille et des dates des fichiers.
-            try:
-                #   Oui, on n'est pas à l'abri d'un nom trop long qui va nous planter...
-                taille = os.path.getsize(nomComplet)
-            except:
-                logger.error('Impossible d\'avoir la taille du fichier %s' % nomComplet)
-                continue
-
-            try:
-                dateCre = os.path.getctime(nomComplet)
-            except:
-                logger.error('Impossible d\'avoir la date de création du fichier %s' % nomComplet)
-                continue
-
-            try:
-                dateMod = os.path.getmtime(nomComplet)
-            except:
-                logger.error('Impossible d\'avoir la date de modification du fichier %s' % nomComplet)
-                continue
-
-            """
-                Le gag des dates avec windows :
-                Si on crée un fichier f1 le 1 janvier, qu'on le modifie le 15 janvier, et que le 1 février on
-                copie ce fichier f1 en fichier f2, le fichier f1 aura bien comme date de création le 1 janvier
-                et comme date de modification le 15 janvier, mais le fichier f2 aura, lui, comme date de
-                modification le 15 janvier et comme date de création le 1 janvier !
-                Microsoft nous a inventé la machine à remonter le temps...
-
-                On va donc se baser sur la date de modification
-            """
-
-            if dateMin and dateMod < dateMin:
-                logger.debug('%s éliminé parce qu\'antérieur à date min' % nomComplet)
-                continue
-
-            if dateMax and dateMod > dateMax:
-                logger.debug('%s éliminé parce que postérieur à date max' % nomComplet)
-                continue
-
-            if sizeMin and taille < sizeMin:
-                logger.debug('%s éliminé parce que plus petit que taille min' % nomComplet)
-                continue
-
-            if sizeMax and taille > sizeMax:
-                logger.debug('%s éliminé parce que plus grand que taille max' % nomComplet)
-                continue
-
-            if texte_cherche:
-                try:
-                    with open(nomComplet, 'r') as f:
-                        contenu = f.read()
-                except Exception as e:
-                    logger.warning('Pas pu lire le contenu du fichier {0} pour y chercher l\'expression régulière'.format(nomComplet))
-                    continue
-
-                #   Y'a des farceurs qui nous encodent leurs fichiers en utf 16... Faut gérer !
-                for bom in boms:
-                    if contenu[:len(bom)] == bom:
-                        logger.debug('{0} encodé en {1}'.format(nomComplet, boms[bom]))
-                        with open(nomComplet, 'r', encoding=boms[bom]) as f:
-                            try:
-                                contenu = f.read()
-                            except Exception as e:
-                                logger.warning('Pas pu lire le contenu du fichier {0} en {1} pour y chercher l\'expression régulière'.format(nomComplet, boms[bom]))
-                        break
-
-                if not re.search(texte_cherche, contenu):
-                    logger.debug('%s éliminé parce qu\'il ne contient pas l\'expression régulière indiquée' % nomComplet)
-                    continue
-
-            liste.append([dateMod, taille, nomComplet])
+    logger.debug('Filtre : %s' % filtre)
+
+    #   L'hélice au milieu d'une sortie csv, jsonl ou binaire à l'écran, ça ne le ferait pas :
+    #   elle finirait dans les données de celui qui lit la sortie.
+    helice_active = bool(fic_sortie) or sortie['format'] == 'text' or sortie['synthese']
+
+    #   Parcours de l'arborescence ou recherche dans le catalogue, mêmes résultats.
+    source = catalogue if parcours.pop('catalogue', False) else gipkowalk
+
+    if sortie['synthese']:
+        synthese = Synthese(nomRepBase, sortie['profondeur_synthese'])
+        for resultat in avec_helice(source(nomRepBase, filtre=filtre, **parcours)):
+            synthese.ajouter(resultat)
+        resultats = []
+        for ligne in synthese.lignes(humainementLisible):
+            output(ligne)
+    elif sortie['top']:
+        #   nlargest ne garde qu'un tas des N meilleurs, pas de tri de l'ensemble.
+        resultats = heapq.nlargest(sortie['top'], avec_helice(source(nomRepBase, filtre=filtre, **parcours)),
+                                   key=CLES_TOP[sortie['par']])
+    elif sortie['tri']:
+        #   Le tri ne renvoie rien avant d'avoir tout lu : l'hélice tourne pendant le parcours.
+        resultats = gipkotri.trier(avec_helice(source(nomRepBase, filtre=filtre, **parcours)),
+                                   cle=CLES_TRI[sortie['tri']], budget=sortie['memoire_tri'],
+                                   reverse=sortie['decroissant'])
+    elif sortie['flux']:
+        resultats = source(nomRepBase, filtre=filtre, **parcours)
+        if fic_sortie:
+            #   Pas d'hélice au milieu des résultats à l'écran...
+            resultats = avec_helice(resultats)
+    else:
+        lots = list(avec_helice(gipkowalk_lots(nomRepBase, lignes_par_lot=1000, filtre=filtre, **parcours)))
+        resultats = (resultat for lot in lots for resultat in lot)
+
+    if sortie['synthese'] or sortie['format'] == 'text':
+        for resultat in resultats:
+            output(formater(resultat, humainementLisible))
+
+    elif sortie['format'] == 'csv':
+        ecrivain = csv.writer(fic_sortie or sys.stdout, delimiter='\t', lineterminator='\n')
+        ecrivain.writerow(['date_mod', 'date', 'taille', 'nom', 'motifs'])
+        for resultat in resultats:
+            D, fic, taille, dateMod = resultat[:4]
+            ecrivain.writerow(['%.3f' % dateMod, dateISO(dateMod), taille, os.path.join(D, fic),
+                               ','.join(resultat[4]) if len(resultat) > 4 else ''])
+
+    elif sortie['format'] == 'jsonl':
+        for resultat in resultats:
+            objet = {'repertoire': resultat[0], 'fichier': resultat[1], 'taille': resultat[2], 'date_mod': resultat[3]}
+            if len(resultat) > 4:
+                objet['motifs'] = list(resultat[4])
+            output(json.dumps(objet, ensure_ascii=False))
 
-    print('\r')
-    for e in liste:
-        if humainementLisible:
-            ligne = dateISO(e[0]) + '   {: >10s}'.format(affichageHumain(e[1])) + '   ' + e[2]
-        else:
-            ligne = '{: >15.3f}'.format(e[0]) + ' ' + dateISO(e[0]) + ' ' + '{: >12d}'.format(e[1]) + ' ' + e[2]
-        output(ligne)
+    else:
+        ecrivain = gipkobin.Ecrivain(fic_sortie or sys.stdout.buffer)
+        for resultat in resultats:
+            ecrivain.ecrire(resultat)
+        ecrivain.fermer()
+
+    filtre.fermer()
 
     if fic_sortie:
         fic_sortie.close()
@@ -4,7 +4,7 @@
     Donne des informations de sécurité sur un fichier windows.
 
     Syntaxe : liste_droits = get_perm(nom_fichier)
-    Chaque élément de la liste retournée est une liste contenant dans cet ordre :
+    Chaque élément de la liste (tuple) retournée est un tuple contenant dans cet ordre :
     - Nom de l'utilisateur ou du groupe
     - Droit d'accès textuel ("read", "change", "full control" etc)
     - Type du droit précédent : "" si droit accordé, "REFUS" sinon
@@ -40,14 +40,76 @@
         et set_file_dates pour pouvoir corriger des fichiers et remettre ensuite (à la main)
         sa date de modif originale.
 
+    Version 2.5 2026-10-18
+        Cache des noms de comptes : la traduction SID -> (domaine, nom, type) passe par un
+        "résolveur" (ResolveurWin32 par défaut, ResolveurMemoire pour les essais) derrière
+        un cache LRU partagé par tout le process (resolveur_sid). Les SID inconnus sont
+        aussi gardés, pour ne pas redemander. LookupAccountSid prend quelques ms et on
+        retrouve les mêmes SID dans quasiment toutes les ACE d'une arborescence.
+        get_owner, fileperm_get_perms et remove_perm l'utilisent.
+        Cache des permissions décodées (cache_permissions) : get_perm ne décode qu'une fois
+        chaque DACL différente, la clé est le descripteur de sécurité binaire. get_perm
+        renvoie maintenant un tuple de tuples (partagé, à ne pas modifier) au lieu d'une
+        liste de listes.
+
+    Version 2.6 2026-10-18
+        Backends de sécurité : la lecture et l'écriture des descripteurs passe par un
+        objet "backend" (BackendWin32, BackendPosix ou BackendMemoire, voir
+        BackendSecurite), choisi avec set_backend. Par défaut BackendWin32 si pywin32 est
+        installé, BackendPosix sinon : l'import de win32security est devenu facultatif et
+        les outils fichiers_permissions_* peuvent tourner (et être mesurés) sous Linux.
+        get_owner n'appelle plus file.stat() sur une chaîne hors windows.
+
+    Version 2.7 2026-10-18
+        Fonction get_security : propriétaire, groupe et permissions lus en une seule fois
+        (un seul GetFileSecurity au lieu d'un pour get_owner et un pour get_perm).
+
+    Version 2.8 2026-10-18
+        get_mask ne parcourt plus que les bits à 1 du masque, et garde ses résultats.
+        Au passage elle trouve tous les droits : l'ancienne boucle partait de 47483648,
+        qui n'est pas une puissance de 2. Elle testait des groupes de bits, ne voyait
+        jamais les bits au-dessus de 2^24 (GENERIC_ALL etc.), et oubliait DELETE quand
+        ACCESS_DELETE était déjà dans le texte.
+        Fonction noms_droits : les mêmes noms, dans un tuple.
+
+    Version 2.9 2026-10-18
+        cache_permissions n'est plus vidé à chaque changement d'objet infos_serveur :
+        infos_serveur fait partie de la clé.
+        remove_perm et add_perm modifient de nouveau la DACL sur place (supprimer_aces,
+        ajouter_aces) au lieu de la reconstruire, et BackendWin32.ecrire_dacl refuse les
+        ACE qu'il ne sait pas reconstruire (ACE "objet" etc.). Le sid d'une ACE est son
+        dernier élément.
+
+    Version 2.10 2026-10-18
+        CacheSid ne garde un échec que si le SID est inconnu (ERROR_NONE_MAPPED, KeyError
+        de pwd / grp). Les autres erreurs (contrôleur de domaine injoignable...) sont
+        notées dans le log et la traduction sera retentée à la prochaine demande.
+
 """
 #
-import win32security
 import os
+import stat
+import struct
+import random
+import zlib
+import platform
 import logging
-import traceback
 import locale
 import datetime
+import threading
+import collections
+from collections import namedtuple
+
+try:
+    import win32security
+except ImportError:
+    win32security = None
+
+try:
+    import pwd
+    import grp
+except ImportError:
+    pwd = grp = None
 
 All_perms = {
     1: "ACCESS_READ",  # 0x00000001
@@ -87,7 +149,552 @@ READ = 1179817
 CHANGE = 1245631
 WALK_DIR = 1048609
 
-VERSION = '2.4'
+VERSION = '2.10'
+TAILLE_CACHE_SID = 10000
+TAILLE_CACHE_PERMISSIONS = 10000
+MAX_INFOS_SERVEUR = 8
+TAILLE_CACHE_MASQUES = 4096
+_masques_decodes = {}
+PERMS_ILLISIBLES = {'DCO-FR\\GR_VTB': (0, (0, 0))}
+#   Ce qu'on renvoie quand on n'a pas le droit de lire les permissions.
+
+#   Valeurs windows, utilisées telles quelles dans les ACE de tous les backends.
+ACCESS_ALLOWED_ACE_TYPE = 0
+ACCESS_DENIED_ACE_TYPE = 1
+OBJECT_INHERIT_ACE = 0x1
+CONTAINER_INHERIT_ACE = 0x2
+INHERITED_ACE = 0x10
+SID_TYPE_USER = 1
+SID_TYPE_GROUP = 2
+SID_TYPE_WELL_KNOWN_GROUP = 5
+ERROR_NONE_MAPPED = 1332
+#   LookupAccountSid : aucun compte ne correspond à ce SID.
+
+#   ACL POSIX, format de l'attribut étendu system.posix_acl_access (voir acl(5))
+XATTR_ACL_POSIX = 'system.posix_acl_access'
+ACL_USER_OBJ = 0x01
+ACL_USER = 0x02
+ACL_GROUP_OBJ = 0x04
+ACL_GROUP = 0x08
+ACL_MASK = 0x10
+ACL_OTHER = 0x20
+ACL_UNDEFINED_ID = 0xFFFFFFFF
+DOMAINE_GROUPES_POSIX = 'GROUPES'
+Securite = namedtuple('Securite', 'proprietaire groupe permissions')
+#   Résultat de get_security. groupe est None si le backend ne le connaît pas.
+
+#   Droits rwx POSIX -> masque windows : r = ACCESS_READ, w = ACCESS_WRITE, x = ACCESS_EXEC
+MASQUES_POSIX = [(1 if p & 4 else 0) | (2 if p & 2 else 0) | (8 if p & 1 else 0) for p in range(8)]
+
+
+#   -------------------------------------------------------------------------------
+class ResolveurWin32:
+    """
+        Traduit un SID en (domaine, nom, type) en interrogeant windows.
+        Lève KeyError si le SID est inconnu, l'exception de win32security pour toute
+        autre erreur.
+    """
+    def resoudre(self, sid):
+        try:
+            nom, domaine, type_compte = win32security.LookupAccountSid(None, sid)
+        except Exception as e:
+            if getattr(e, 'winerror', None) == ERROR_NONE_MAPPED:
+                raise KeyError(sid) from None
+            raise
+        return domaine, nom, type_compte
+
+
+#   -------------------------------------------------------------------------------
+class ResolveurMemoire:
+    """
+        Résolveur qui prend les noms dans un dictionnaire {sid: (domaine, nom, type)}.
+        Pour tester ou mesurer sans serveur windows. appels compte les demandes.
+    """
+    def __init__(self, comptes=None):
+        self.comptes = dict(comptes or {})
+        self.appels = 0
+
+    def resoudre(self, sid):
+        self.appels += 1
+        return self.comptes[sid]
+
+
+#   -------------------------------------------------------------------------------
+class CacheSid:
+    """
+        Cache LRU devant un résolveur (n'importe quel objet qui a une méthode
+        resoudre(sid), qui lève KeyError si le SID est inconnu). Au-delà de taille_max
+        SID on oublie le moins récemment utilisé.
+
+        nom(sid) renvoie (domaine, nom, type), ou None si le résolveur ne connaît pas le
+        SID (et on s'en souvient aussi) ou n'a pas pu le traduire : dans ce cas on ne s'en
+        souvient pas, l'erreur peut être passagère (serveur injoignable, délai dépassé...).
+        succes et echecs comptent les demandes trouvées ou non dans le cache.
+    """
+    def __init__(self, resolveur, taille_max=TAILLE_CACHE_SID):
+        self.resolveur = resolveur
+        self.taille_max = taille_max
+        self.noms = collections.OrderedDict()
+        self.verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+
+    def nom(self, sid):
+        with self.verrou:
+            if sid in self.noms:
+                self.succes += 1
+                self.noms.move_to_end(sid)
+                return self.noms[sid]
+            self.echecs += 1
+
+        try:
+            resultat = tuple(self.resolveur.resoudre(sid))
+        except KeyError:
+            resultat = None
+        except Exception as e:
+            logger = logging.getLogger()
+            logger.warning('Impossible de traduire le SID %s : %s' % (sid, e))
+            return None
+
+        with self.verrou:
+            self.noms[sid] = resultat
+            if len(self.noms) > self.taille_max:
+                self.noms.popitem(last=False)
+        return resultat
+
+    def vider(self):
+        with self.verrou:
+            self.noms.clear()
+            self.succes = 0
+            self.echecs = 0
+
+
+#   -------------------------------------------------------------------------------
+class CachePermissions:
+    """
+        Cache LRU des permissions décodées (résultat de get_perm), avec pour clé le
+        descripteur de sécurité binaire. Avec l'héritage, la plupart des fichiers d'une
+        arborescence ont exactement la même DACL : on ne parcourt les ACE, on ne traduit
+        les SID et on ne décode les masques qu'une fois par DACL différente.
+
+        Le résultat dépend aussi de infos_serveur (colonne utilisateur / groupe), qui fait
+        donc partie de la clé : tous les infos_serveur vides sont équivalents, les autres
+        sont reconnus à leur identité ou, pour un nouvel objet, à leur contenu. On garde
+        les résultats d'au plus MAX_INFOS_SERVEUR contenus différents. On suppose qu'un
+        infos_serveur n'est pas modifié une fois passé.
+    """
+    def __init__(self, taille_max=TAILLE_CACHE_PERMISSIONS):
+        self.taille_max = taille_max
+        self.resultats = collections.OrderedDict()
+        self.infos = []
+        #   Les contenus différents de infos_serveur rencontrés. Leur numéro fait partie
+        #   de la clé.
+        self.alias = {}
+        #   id(infos_serveur) -> (infos_serveur, numéro). On garde l'objet pour que son id
+        #   ne puisse pas resservir à un autre.
+        self.verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+
+    def __numero_infos__(self, infos_serveur):
+        if not infos_serveur:
+            return -1
+
+        alias = self.alias.get(id(infos_serveur))
+        if alias is not None and alias[0] is infos_serveur:
+            return alias[1]
+
+        for numero, infos in enumerate(self.infos):
+            if infos == infos_serveur:
+                break
+        else:
+            if len(self.infos) >= MAX_INFOS_SERVEUR:
+                self.resultats.clear()
+                self.infos = []
+                self.alias.clear()
+            self.infos.append(infos_serveur)
+            numero = len(self.infos) - 1
+
+        if len(self.alias) >= MAX_INFOS_SERVEUR:
+            self.alias.clear()
+        self.alias[id(infos_serveur)] = (infos_serveur, numero)
+        return numero
+
+    def permissions(self, cle, decoder, infos_serveur={}):
+        """
+            cle     : le descripteur binaire (ou None s'il est illisible).
+            decoder : fonction sans argument qui renvoie le dictionnaire des permissions
+                      (comme fileperm_get_perms). Appelée seulement si la clé est inconnue.
+        """
+        with self.verrou:
+            cle = (cle, self.__numero_infos__(infos_serveur))
+            if cle in self.resultats:
+                self.succes += 1
+                self.resultats.move_to_end(cle)
+                return self.resultats[cle]
+            self.echecs += 1
+
+        resultat = _liste_perms(decoder(), infos_serveur)
+
+        with self.verrou:
+            self.resultats[cle] = resultat
+            if len(self.resultats) > self.taille_max:
+                self.resultats.popitem(last=False)
+        return resultat
+
+    def vider(self):
+        with self.verrou:
+            self.resultats.clear()
+            self.infos = []
+            self.alias.clear()
+            self.succes = 0
+            self.echecs = 0
+
+
+#   -------------------------------------------------------------------------------
+class ResolveurPosix:
+    """
+        Traduit les "SID" du backend POSIX, tuples (type d'entrée ACL, uid ou gid), en
+        (domaine, nom, type). Le domaine est le nom de la machine pour les utilisateurs et
+        DOMAINE_GROUPES_POSIX pour les groupes (comme BUILTIN sous windows) : un
+        utilisateur et un groupe peuvent avoir le même nom.
+    """
+    def resoudre(self, sid):
+        tag, ident = sid
+        if tag in (ACL_USER_OBJ, ACL_USER):
+            return platform.node(), pwd.getpwuid(ident).pw_name, SID_TYPE_USER
+        if tag in (ACL_GROUP_OBJ, ACL_GROUP):
+            return DOMAINE_GROUPES_POSIX, grp.getgrgid(ident).gr_name, SID_TYPE_GROUP
+        return DOMAINE_GROUPES_POSIX, 'everyone', SID_TYPE_WELL_KNOWN_GROUP
+
+
+#   -------------------------------------------------------------------------------
+class BackendSecurite:
+    """
+        Interface des backends de sécurité, qui lisent et écrivent les descripteurs.
+
+        Une ACE est un tuple ((type, drapeaux), masque, ..., sid) comme celles que renvoie
+        win32security : type ACCESS_ALLOWED_ACE_TYPE ou ACCESS_DENIED_ACE_TYPE (ou un
+        autre type windows, les ACE "objet" ont alors deux éléments de plus avant le sid),
+        masque au format windows. Le sid, toujours le dernier élément, est un objet
+        (hashable) propre au backend, que le résolveur du backend sait traduire en nom.
+
+        lire_dacl renvoie (clé, dacl) : dacl est un objet propre au backend, qu'on passe
+        ensuite à aces(), supprimer_aces(), ajouter_aces() et ecrire_dacl(). La clé est un
+        objet hashable, identique pour deux fichiers qui ont les mêmes droits (voir
+        CachePermissions).
+    """
+    def resolveur(self):
+        raise NotImplementedError
+
+    def lire_proprietaire(self, chemin):
+        """Le sid du propriétaire."""
+        raise NotImplementedError
+
+    def lire_dacl(self, chemin):
+        raise NotImplementedError
+
+    def lire_securite(self, chemin):
+        """
+            (sid du propriétaire, sid du groupe, clé, dacl) en une seule lecture si le
+            backend sait le faire. Par défaut on lit le propriétaire puis la dacl, sans
+            le groupe.
+        """
+        cle, dacl = self.lire_dacl(chemin)
+        return self.lire_proprietaire(chemin), None, cle, dacl
+
+    def aces(self, dacl):
+        """La liste des ACE de la dacl, dans l'ordre."""
+        raise NotImplementedError
+
+    def ecrire_dacl(self, chemin, dacl, aces):
+        """Remplace les ACE de la dacl lue par lire_dacl par la liste aces, et l'écrit."""
+        raise NotImplementedError
+
+    def supprimer_aces(self, chemin, dacl, indices):
+        """Supprime de la dacl les ACE dont les numéros (dans l'ordre de aces()) sont donnés, et l'écrit."""
+        indices = set(indices)
+        self.ecrire_dacl(chemin, dacl, [ace for i, ace in enumerate(self.aces(dacl)) if i not in indices])
+
+    def ajouter_aces(self, chemin, dacl, aces):
+        """Ajoute les ACE à la fin de la dacl, et l'écrit."""
+        self.ecrire_dacl(chemin, dacl, self.aces(dacl) + list(aces))
+
+    def sid_de(self, nom):
+        """Le sid d'un utilisateur ou d'un groupe."""
+        raise NotImplementedError
+
+
+#   -------------------------------------------------------------------------------
+def _dacl_binaire(descripteur):
+    """
+        La DACL (et les bits de contrôle) d'un descripteur de sécurité binaire
+        "self-relative" : c'est la clé du cache des permissions, il ne faut pas que
+        le propriétaire et le groupe en fassent partie.
+        En-tête : révision, Sbz1, contrôle (2 octets), puis les positions du
+        propriétaire, du groupe, de la SACL et de la DACL (4 octets chacune). Dans la
+        DACL, la taille totale est à la position 2 (2 octets).
+    """
+    controle, position = struct.unpack_from('<2xH12xI', descripteur)
+    if not position:
+        return struct.pack('<H', controle)
+    taille = struct.unpack_from('<H', descripteur, position + 2)[0]
+    return struct.pack('<H', controle) + descripteur[position:position + taille]
+
+
+#   -------------------------------------------------------------------------------
+class BackendWin32(BackendSecurite):
+    def __init__(self):
+        if win32security is None:
+            raise ImportError('Le backend win32 a besoin de pywin32 (win32security)')
+
+    def resolveur(self):
+        return ResolveurWin32()
+
+    def lire_proprietaire(self, chemin):
+        sd = win32security.GetFileSecurity(chemin, win32security.OWNER_SECURITY_INFORMATION)
+        return sd.GetSecurityDescriptorOwner()
+
+    def lire_dacl(self, chemin):
+        #   On ne demande que la DACL : deux fichiers qui ont les mêmes droits ont alors
+        #   exactement le même descripteur, octet pour octet.
+        sd = win32security.GetFileSecurity(chemin, win32security.DACL_SECURITY_INFORMATION)
+        return bytes(memoryview(sd)), sd
+
+    def lire_securite(self, chemin):
+        sd = win32security.GetFileSecurity(chemin, win32security.OWNER_SECURITY_INFORMATION |
+                                           win32security.GROUP_SECURITY_INFORMATION | win32security.DACL_SECURITY_INFORMATION)
+        return sd.GetSecurityDescriptorOwner(), sd.GetSecurityDescriptorGroup(), _dacl_binaire(bytes(memoryview(sd))), sd
+
+    def aces(self, sd):
+        dacl = sd.GetSecurityDescriptorDacl()
+        if dacl is None:
+            return []
+        return [dacl.GetAce(i) for i in range(dacl.GetAceCount())]
+
+    def ecrire_dacl(self, chemin, sd, aces):
+        """
+            Reconstruit la DACL. Seules les ACE simples d'autorisation et de refus savent
+            être reconstruites : s'il y en a d'autres on refuse avant d'écrire quoi que ce
+            soit (supprimer_aces et ajouter_aces, elles, modifient la DACL sur place).
+        """
+        for ace in aces:
+            if len(ace) != 3 or ace[0][0] not in (ACCESS_ALLOWED_ACE_TYPE, ACCESS_DENIED_ACE_TYPE):
+                raise ValueError('%s : ACE de type %s, la DACL ne peut pas être réécrite' % (chemin, ace[0][0]))
+
+        dacl = win32security.ACL()
+        for (type_ace, drapeaux), masque, sid in aces:
+            if type_ace == ACCESS_DENIED_ACE_TYPE:
+                dacl.AddAccessDeniedAceEx(win32security.ACL_REVISION, drapeaux, masque, sid)
+            else:
+                dacl.AddAccessAllowedAceEx(win32security.ACL_REVISION, drapeaux, masque, sid)
+        sd.SetSecurityDescriptorDacl(1, dacl, 0)
+        win32security.SetFileSecurity(chemin, win32security.DACL_SECURITY_INFORMATION, sd)
+
+    def supprimer_aces(self, chemin, sd, indices):
+        dacl = sd.GetSecurityDescriptorDacl()
+        #   Super important, l'ordre décroissant, si on supprime plusieurs éléments !
+        for i in sorted(indices, reverse=True):
+            dacl.DeleteAce(i)
+        sd.SetSecurityDescriptorDacl(1, dacl, 0)
+        win32security.SetFileSecurity(chemin, win32security.DACL_SECURITY_INFORMATION, sd)
+
+    def ajouter_aces(self, chemin, sd, aces):
+        dacl = sd.GetSecurityDescriptorDacl()
+        for (type_ace, drapeaux), masque, sid in aces:
+            if type_ace == ACCESS_DENIED_ACE_TYPE:
+                dacl.AddAccessDeniedAceEx(win32security.ACL_REVISION, drapeaux, masque, sid)
+            else:
+                dacl.AddAccessAllowedAceEx(win32security.ACL_REVISION, drapeaux, masque, sid)
+        sd.SetSecurityDescriptorDacl(1, dacl, 0)
+        win32security.SetFileSecurity(chemin, win32security.DACL_SECURITY_INFORMATION, sd)
+
+    def sid_de(self, nom):
+        sid, domain, type = win32security.LookupAccountName('', nom)
+        return sid
+
+
+#   -------------------------------------------------------------------------------
+class BackendPosix(BackendSecurite):
+    """
+        Droits POSIX : le propriétaire, le groupe et les autres (os.stat), plus les
+        entrées de l'ACL POSIX (attribut étendu system.posix_acl_access, ce que montre
+        getfacl) s'il y en a. Les sid sont des tuples (type d'entrée, uid ou gid).
+        Pas de refus ni d'héritage en POSIX : toutes les ACE sont des autorisations,
+        les drapeaux sont ignorés à l'écriture.
+    """
+    def resolveur(self):
+        return ResolveurPosix()
+
+    def lire_proprietaire(self, chemin):
+        return ACL_USER_OBJ, os.stat(chemin).st_uid
+
+    def lire_dacl(self, chemin):
+        st = os.stat(chemin)
+        try:
+            brut = os.getxattr(chemin, XATTR_ACL_POSIX)
+        except (OSError, AttributeError):
+            brut = b''
+        dacl = (st.st_uid, st.st_gid, st.st_mode, brut)
+        return dacl, dacl
+
+    def lire_securite(self, chemin):
+        cle, dacl = self.lire_dacl(chemin)
+        return (ACL_USER_OBJ, dacl[0]), (ACL_GROUP_OBJ, dacl[1]), cle, dacl
+
+    def aces(self, dacl):
+        uid, gid, mode, brut = dacl
+        if brut:
+            entrees = list(struct.iter_unpack('<HHI', brut[4:]))
+        else:
+            entrees = [(ACL_USER_OBJ, (mode >> 6) & 7, 0), (ACL_GROUP_OBJ, (mode >> 3) & 7, 0), (ACL_OTHER, mode & 7, 0)]
+
+        masque_acl = 7
+        for tag, perm, ident in entrees:
+            if tag == ACL_MASK:
+                masque_acl = perm
+
+        aces = []
+        for tag, perm, ident in entrees:
+            if tag == ACL_MASK:
+                continue
+            if tag in (ACL_USER, ACL_GROUP_OBJ, ACL_GROUP):
+                #   Le masque limite les droits de tout le monde sauf le propriétaire et les autres.
+                perm &= masque_acl
+            ident = {ACL_USER_OBJ: uid, ACL_GROUP_OBJ: gid, ACL_OTHER: None}.get(tag, ident)
+            aces.append(((ACCESS_ALLOWED_ACE_TYPE, 0), MASQUES_POSIX[perm], (tag, ident)))
+        return aces
+
+    def ecrire_dacl(self, chemin, dacl, aces):
+        uid, gid, mode, brut = dacl
+        droits = {ACL_USER_OBJ: 0, ACL_GROUP_OBJ: 0, ACL_OTHER: 0}
+        nommees = {}
+        for (type_ace, drapeaux), masque, (tag, ident) in aces:
+            if type_ace == ACCESS_DENIED_ACE_TYPE:
+                raise ValueError('Pas de refus dans les ACL POSIX (%s)' % chemin)
+            perm = (4 if masque & 1 else 0) | (2 if masque & 2 else 0) | (1 if masque & 8 else 0)
+            if tag in droits:
+                droits[tag] |= perm
+            else:
+                nommees[(tag, ident)] = nommees.get((tag, ident), 0) | perm
+
+        if not nommees:
+            if brut:
+                os.removexattr(chemin, XATTR_ACL_POSIX)
+            os.chmod(chemin, (stat.S_IMODE(mode) & ~0o777) | (droits[ACL_USER_OBJ] << 6) | (droits[ACL_GROUP_OBJ] << 3) | droits[ACL_OTHER])
+            return
+
+        masque_acl = droits[ACL_GROUP_OBJ]
+        for perm in nommees.values():
+            masque_acl |= perm
+        entrees = [(ACL_USER_OBJ, droits[ACL_USER_OBJ], ACL_UNDEFINED_ID), (ACL_GROUP_OBJ, droits[ACL_GROUP_OBJ], ACL_UNDEFINED_ID),
+                   (ACL_MASK, masque_acl, ACL_UNDEFINED_ID), (ACL_OTHER, droits[ACL_OTHER], ACL_UNDEFINED_ID)]
+        entrees += [(tag, perm, ident) for (tag, ident), perm in nommees.items()]
+        #   Le noyau veut les entrées triées par type puis par identifiant.
+        entrees.sort()
+        os.setxattr(chemin, XATTR_ACL_POSIX, struct.pack('<I', 2) + b''.join(struct.pack('<HHI', *e) for e in entrees))
+
+    def sid_de(self, nom):
+        try:
+            return ACL_USER, pwd.getpwnam(nom).pw_uid
+        except KeyError:
+            return ACL_GROUP, grp.getgrnam(nom).gr_gid
+
+
+#   -------------------------------------------------------------------------------
+class BackendMemoire(BackendSecurite):
+    """
+        Backend synthétique, tout en mémoire, pour les essais et les mesures de charge
+        sans serveur de fichiers.
+
+        descripteurs : dictionnaire {chemin: (sid du propriétaire, sid du groupe, tuple
+                       d'ACE)}.
+        Les chemins qui n'y sont pas (qu'ils existent ou non) reçoivent l'une des nb_acl
+        DACL tirées au hasard au départ (graine fixe, donc toujours les mêmes), choisie
+        d'après leur nom, et deux des nb_comptes comptes comme propriétaire et groupe. On peut
+        ainsi faire tourner les outils sur n'importe quelle arborescence, avec la
+        proportion de DACL différentes qu'on veut.
+    """
+    def __init__(self, descripteurs=None, nb_comptes=50, nb_acl=100, aces_par_acl=8, graine=0):
+        hasard = random.Random(graine)
+        self.comptes = {'S-1-5-21-%d' % i: ('SYNTHESE', ('user%d' if i % 2 else 'groupe%d') % i, SID_TYPE_USER if i % 2 else SID_TYPE_GROUP)
+                        for i in range(nb_comptes)}
+        self.sids = sorted(self.comptes)
+        masques = sorted(Typical_perms) + [1, 2, 3, 65536]
+        self.acls = [tuple(((hasard.choice((ACCESS_ALLOWED_ACE_TYPE,) * 7 + (ACCESS_DENIED_ACE_TYPE,)),
+                             hasard.choice((0, OBJECT_INHERIT_ACE | CONTAINER_INHERIT_ACE | INHERITED_ACE))),
+                            hasard.choice(masques), hasard.choice(self.sids)) for j in range(aces_par_acl))
+                     for i in range(nb_acl)]
+        self.descripteurs = dict(descripteurs or {})
+        self.verrou = threading.Lock()
+
+    def __descripteur__(self, chemin):
+        descripteur = self.descripteurs.get(chemin)
+        if descripteur is None:
+            #   Pas hash() : il change d'une exécution à l'autre.
+            n = zlib.crc32(os.fsencode(chemin))
+            descripteur = (self.sids[n % len(self.sids)], self.sids[(n >> 16) % len(self.sids)], self.acls[n % len(self.acls)])
+        return descripteur
+
+    def resolveur(self):
+        return ResolveurMemoire(self.comptes)
+
+    def lire_proprietaire(self, chemin):
+        return self.__descripteur__(chemin)[0]
+
+    def lire_dacl(self, chemin):
+        aces = self.__descripteur__(chemin)[2]
+        return aces, aces
+
+    def lire_securite(self, chemin):
+        proprietaire, groupe, aces = self.__descripteur__(chemin)
+        return proprietaire, groupe, aces, aces
+
+    def aces(self, dacl):
+        return list(dacl)
+
+    def ecrire_dacl(self, chemin, dacl, aces):
+        with self.verrou:
+            self.descripteurs[chemin] = self.__descripteur__(chemin)[:2] + (tuple(aces), )
+
+    def sid_de(self, nom):
+        for sid, (domaine, nom_compte, type_compte) in self.comptes.items():
+            if nom_compte.lower() == nom.lower():
+                return sid
+        raise KeyError(nom)
+
+
+BACKENDS = {'win32': BackendWin32, 'posix': BackendPosix, 'memoire': BackendMemoire}
+backend = BackendWin32() if win32security is not None else BackendPosix()
+resolveur_sid = CacheSid(backend.resolveur())
+cache_permissions = CachePermissions()
+
+
+#   -------------------------------------------------------------------------------
+def set_resolveur_sid(resolveur, taille_max=TAILLE_CACHE_SID):
+    """
+        Remplace le résolveur utilisé par tout le module (par exemple un ResolveurMemoire).
+        Le cache repart de zéro.
+    """
+    global resolveur_sid
+    resolveur_sid = CacheSid(resolveur, taille_max)
+    cache_permissions.vider()
+    return resolveur_sid
+
+
+#   -------------------------------------------------------------------------------
+def set_backend(nouveau_backend):
+    """
+        Change le backend de sécurité utilisé par tout le module. nouveau_backend est un
+        objet BackendSecurite, ou un nom de BACKENDS ('win32', 'posix', 'memoire').
+        Le résolveur de SID devient celui du backend, les caches repartent de zéro.
+    """
+    global backend
+    if isinstance(nouveau_backend, str):
+        nouveau_backend = BACKENDS[nouveau_backend]()
+    backend = nouveau_backend
+    set_resolveur_sid(backend.resolveur())
+    return backend
 
 
 #   -------------------------------------------------------------------------------
@@ -99,78 +706,99 @@ def get_owner(file):
 
     On Windows, this returns a name of the form ur'DOMAIN\User Name'.
     On Windows, a group can own a file or directory.
+    With the POSIX backend, the domain is the host name.
     """
-    if os.name == 'nt':
-        if win32security is None:
-            raise Exception("path.owner requires win32all to be installed")
+    try:
+        sid = backend.lire_proprietaire(file)
+    except Exception as e:
+        return '?\\?'
 
-        try:
-            desc = win32security.GetFileSecurity(file, win32security.OWNER_SECURITY_INFORMATION)
-            sid = desc.GetSecurityDescriptorOwner()
-        except Exception as e:
-            return '?\\?'
+    return _nom_compte(sid)
 
-        try:
-            account, domain, typecode = win32security.LookupAccountSid(None, sid)
-        except:
-            domain = 'Domaine'
-            account = '%s' % sid
-        return domain + u'\\' + account
-    else:
-        if pwd is None:
-            raise NotImplementedError("path.owner is not implemented on this platform.")
-        st = file.stat()
-        return pwd.getpwuid(st.st_uid).pw_name
+
+#   -------------------------------------------------------------------------------
+def _nom_compte(sid):
+    compte = resolveur_sid.nom(sid)
+    if compte is None:
+        return 'Domaine\\%s' % (sid, )
+    return compte[0] + u'\\' + compte[1]
 
 
 #   -----------------------------------------------------------------------
 def fileperm_get_perms(file):
     logger = logging.getLogger()
-    all_perms = {}
-    mask = win32security.OWNER_SECURITY_INFORMATION | win32security.GROUP_SECURITY_INFORMATION | win32security.DACL_SECURITY_INFORMATION
     try:
-        sd = win32security.GetFileSecurity(file, mask)
-        ownersid = sd.GetSecurityDescriptorOwner()
-        dacl = sd.GetSecurityDescriptorDacl()
+        cle, dacl = backend.lire_dacl(file)
+        aces = backend.aces(dacl)
     except:
         #   Si l'utilisateur n'a pas les droits nécessaires pour lire les infos ça plante...
-        return {'DCO-FR\\GR_VTB': (0, (0, 0))}
+        return dict(PERMS_ILLISIBLES)
 
-    count = dacl.GetAceCount()
-    for i in range(count):
-        ace = dacl.GetAce(i)
+    return _decoder_dacl(aces)
+
+
+#   -----------------------------------------------------------------------
+def _decoder_dacl(aces):
+    all_perms = {}
+    for ace in aces:
         #   ace[0][0] = 1 signifie refus
-        try:
-            user, domain, int = win32security.LookupAccountSid(None, ace[2])
-            all_perms[domain + "\\" + user] = (ace[1], ace[0])
-        except:
-            all_perms['Domaine\\%s' % ace[2]] = (ace[1], ace[0])
+        compte = resolveur_sid.nom(ace[-1])
+        if compte is None:
+            all_perms['Domaine\\%s' % (ace[-1], )] = (ace[1], ace[0])
+        else:
+            all_perms[compte[0] + "\\" + compte[1]] = (ace[1], ace[0])
     return all_perms
 
 
+#   -----------------------------------------------------------------------
+def noms_droits(mask):
+    """
+        Les noms des droits d'un masque, dans un tuple : le nom "typique" s'il y en a un
+        (Typical_perms), sinon le nom de chacun des bits à 1 qui en a un (All_perms), du
+        plus faible au plus fort.
+        Les résultats sont gardés (dans la limite de TAILLE_CACHE_MASQUES masques
+        différents) : on retrouve toujours les mêmes masques d'un fichier à l'autre.
+    """
+    return _decoder_masque(mask)[0]
+
+
 #   -----------------------------------------------------------------------
 def get_mask(mask):
-    a = 47483648
-
-    #   if Typical_perms.has_key(mask):
-    if mask in Typical_perms:
-        return Typical_perms[mask]
-    else:
-        result = ''
-        while a >> 1:
-            a = a >> 1
-            masked = mask & a
-            if masked:
-                if masked in All_perms and All_perms[masked] not in result:
-                    result = All_perms[masked] + ':' + result
-        return result
+    """
+        Comme noms_droits, mais sous forme de texte : le nom typique, ou les noms des
+        droits suivis chacun de ':'.
+    """
+    return _decoder_masque(mask)[1]
 
 
 #   -----------------------------------------------------------------------
-def get_perm(file, infos_serveur={}):
-    logger = logging.getLogger()
+def _decoder_masque(mask):
+    decode = _masques_decodes.get(mask)
+    if decode is None:
+        if mask in Typical_perms:
+            noms = (Typical_perms[mask], )
+            texte = Typical_perms[mask]
+        else:
+            noms = []
+            reste = mask
+            while reste:
+                #   On ne passe que par les bits à 1 : bit = le plus faible des bits restants.
+                bit = reste & -reste
+                reste ^= bit
+                if bit in All_perms:
+                    noms.append(All_perms[bit])
+            noms = tuple(noms)
+            texte = ''.join(nom + ':' for nom in noms)
+
+        if len(_masques_decodes) >= TAILLE_CACHE_MASQUES:
+            _masques_decodes.clear()
+        decode = _masques_decodes[mask] = (noms, texte)
+    return decode
+
+
+#   -----------------------------------------------------------------------
+def _liste_perms(all_perms, infos_serveur):
     perm_list = []
-    all_perms = fileperm_get_perms(file)
     for (domain_id, perm) in all_perms.items():
         mask = perm[0]
         type_perm = 'REFUS' if perm[1][0] == 1 else ''
@@ -189,11 +817,46 @@ def get_perm(file, infos_serveur={}):
         else:
             grp_ou_usr = ''
 
-        perm_list.append([sys_id.lower(), mask_name, type_perm, perm[0], perm[1][0], perm[1][1], grp_ou_usr])
+        perm_list.append((sys_id.lower(), mask_name, type_perm, perm[0], perm[1][0], perm[1][1], grp_ou_usr))
 
     perm_list.sort(key=lambda x: [x[6], x[0]])
 
-    return perm_list
+    return tuple(perm_list)
+
+
+#   -----------------------------------------------------------------------
+def get_perm(file, infos_serveur={}):
+    """
+        Les permissions sont décodées une seule fois par DACL différente (voir
+        CachePermissions) : le résultat est un tuple de tuples, partagé entre tous les
+        fichiers qui ont la même DACL. Il ne faut pas le modifier.
+    """
+    logger = logging.getLogger()
+    try:
+        cle, dacl = backend.lire_dacl(file)
+    except:
+        return cache_permissions.permissions(None, lambda: dict(PERMS_ILLISIBLES), infos_serveur)
+
+    return cache_permissions.permissions(cle, lambda: _decoder_dacl(backend.aces(dacl)), infos_serveur)
+
+
+#   -----------------------------------------------------------------------
+def get_security(file, infos_serveur={}):
+    """
+        Propriétaire, groupe et permissions d'un fichier, lus en une seule fois : un
+        seul aller-retour vers le serveur de fichiers au lieu de deux pour get_owner
+        puis get_perm.
+        Renvoie un Securite(proprietaire, groupe, permissions) : proprietaire comme
+        get_owner, groupe sous la même forme (ou None), permissions comme get_perm.
+    """
+    logger = logging.getLogger()
+    try:
+        sid_proprietaire, sid_groupe, cle, dacl = backend.lire_securite(file)
+    except:
+        return Securite('?\\?', None, cache_permissions.permissions(None, lambda: dict(PERMS_ILLISIBLES), infos_serveur))
+
+    return Securite(_nom_compte(sid_proprietaire), None if sid_groupe is None else _nom_compte(sid_groupe),
+                    cache_permissions.permissions(cle, lambda: _decoder_dacl(backend.aces(dacl)), infos_serveur))
 
 
 #   -----------------------------------------------------------------------
@@ -209,20 +872,15 @@ def remove_perm(file, *users, verbose=0):
     """
     logger = logging.getLogger()
 
-    mask = win32security.OWNER_SECURITY_INFORMATION | win32security.GROUP_SECURITY_INFORMATION | win32security.DACL_SECURITY_INFORMATION
-    sd = win32security.GetFileSecurity(file, mask)
-    ownersid = sd.GetSecurityDescriptorOwner()
-    dacl = sd.GetSecurityDescriptorDacl()
-    count = dacl.GetAceCount()
+    cle, dacl = backend.lire_dacl(file)
     a_supprimer = []
-    #   Faire une suppression directe dans une liste qu'on parcourt...
-    for i in range(count):
-        ace = dacl.GetAce(i)
-        try:
-            user, domain, int = win32security.LookupAccountSid(None, ace[2])
-        except:
-            logger.error('Erreur: %s' % traceback.format_exc())
-            user = '%s' % ace[2]
+    for i, ace in enumerate(backend.aces(dacl)):
+        compte = resolveur_sid.nom(ace[-1])
+        if compte is None:
+            logger.error('Erreur: SID %s inconnu' % (ace[-1], ))
+            user = '%s' % (ace[-1], )
+        else:
+            user = compte[1]
 
         if user.lower() in users:
             if verbose:
@@ -233,14 +891,8 @@ def remove_perm(file, *users, verbose=0):
                     print('On supprime %s pour %s' % (user, texte_remplacement))
             a_supprimer.append(i)
 
-    a_supprimer.reverse()
-    #   Super important, le reverse, si on supprime plusieurs éléments !
-    for i in a_supprimer:
-        dacl.DeleteAce(i)
-
     if a_supprimer:
-        sd.SetSecurityDescriptorDacl(1, dacl, 0)   # may not be necessary
-        win32security.SetFileSecurity(file, win32security.DACL_SECURITY_INFORMATION, sd)
+        backend.supprimer_aces(file, dacl, a_supprimer)
 
 
 #   -----------------------------------------------------------------------
@@ -257,21 +909,7 @@ def add_perm(file, permission, *users):
         OU
         add_perm('file', permission, *('u1', 'u2', ..., 'un'))
     """
-    logger = logging.getLogger()
-
-    mask = win32security.OWNER_SECURITY_INFORMATION | win32security.GROUP_SECURITY_INFORMATION | win32security.DACL_SECURITY_INFORMATION
-    sd = win32security.GetFileSecurity(file, mask)
-    ownersid = sd.GetSecurityDescriptorOwner()
-    dacl = sd.GetSecurityDescriptorDacl()
-    heritage = win32security.OBJECT_INHERIT_ACE | win32security.CONTAINER_INHERIT_ACE | win32security.INHERITED_ACE
-
-    for u in users:
-        sid, domain, type = win32security.LookupAccountName('', u)
-        dacl.AddAccessAllowedAceEx(win32security.ACL_REVISION, heritage, permission, sid)
-
-    sd.SetSecurityDescriptorDacl(1, dacl, 0)
-
-    win32security.SetFileSecurity(file, win32security.DACL_SECURITY_INFORMATION, sd)
+    add_perm_by_sid(file, permission, *[backend.sid_de(u) for u in users])
 
 
 #   -----------------------------------------------------------------------
@@ -286,18 +924,10 @@ def add_perm_by_sid(file, permission, *sidlist):
     """
     logger = logging.getLogger()
 
-    mask = win32security.OWNER_SECURITY_INFORMATION | win32security.GROUP_SECURITY_INFORMATION | win32security.DACL_SECURITY_INFORMATION
-    sd = win32security.GetFileSecurity(file, mask)
-    ownersid = sd.GetSecurityDescriptorOwner()
-    dacl = sd.GetSecurityDescriptorDacl()
-    heritage = win32security.OBJECT_INHERIT_ACE | win32security.CONTAINER_INHERIT_ACE | win32security.INHERITED_ACE
-
-    for sid in sidlist:
-        dacl.AddAccessAllowedAceEx(win32security.ACL_REVISION, heritage, permission, sid)
-
-    sd.SetSecurityDescriptorDacl(1, dacl, 0)
+    cle, dacl = backend.lire_dacl(file)
+    heritage = OBJECT_INHERIT_ACE | CONTAINER_INHERIT_ACE | INHERITED_ACE
 
-    win32security.SetFileSecurity(file, win32security.DACL_SECURITY_INFORMATION, sd)
+    backend.ajouter_aces(file, dacl, [((ACCESS_ALLOWED_ACE_TYPE, heritage), permission, sid) for sid in sidlist])
 
 
 #   -----------------------------------------------------------------------
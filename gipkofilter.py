@@ -0,0 +1,665 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Critères de sélection des fichiers, communs à gipkowalk et gipkodir.
+
+    Syntaxe : filtre = Filter(date_min='2020-01-01', extensions='.txt,.log', ...)
+    Les arguments sont les mêmes que ceux de gipkowalk (voir sa doc) : date_min,
+    date_max, size_min, size_max, extensions, pattern, texte_cherche, def_encoding,
+    max_octets, cache_binaires, seuil_mmap, motifs.
+    Un argument absent ou None n'est pas pris en compte.
+
+    Les critères sont "compilés" une fois pour toutes à la création du filtre en une
+    chaîne de prédicats qui ne contient que les critères demandés, rangés du moins
+    cher au plus cher :
+    - d'abord ceux qui ne demandent que le nom du fichier (extension, expression
+      régulière sur le nom),
+    - puis ceux qui ont besoin de la taille ou de la date (il faut un stat),
+    - et enfin ceux qui ont besoin du contenu (il faut lire le fichier).
+
+    On peut voir ce que contient un filtre avec filtre.predicats(), ou simplement en
+    l'affichant.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original. Reprend les contrôles et le décodage des arguments qui étaient en
+        double dans gipkowalk et gipkodir.
+
+    Version 1.1 2026-10-18
+        La recherche dans le contenu se fait par blocs (chercher_texte) au lieu de
+        lire tout le fichier d'un coup : un fichier log de plusieurs Go ne prend plus
+        des Go de mémoire. Le BOM est détecté sur les premiers octets, et on peut
+        limiter le nombre d'octets lus par fichier (max_octets).
+
+    Version 1.2 2026-10-18
+        Avant de chercher dans un fichier on regarde ses premiers octets (est_binaire) :
+        les exécutables, archives, images etc ne sont plus lus pour rien.
+        Les fichiers reconnus comme binaires peuvent être gardés dans un cache
+        persistant (cache_binaires, nom d'un fichier SQLite), pour ne pas avoir à les
+        regarder de nouveau à la recherche suivante.
+
+    Version 1.3 2026-10-18
+        Recherche optionnelle directement sur le fichier projeté en mémoire (mmap)
+        pour les gros fichiers (seuil_mmap).
+
+    Version 1.4 2026-10-18
+        Plusieurs expressions régulières nommées (motifs) cherchées en une seule
+        lecture de chaque fichier (classe Motifs, fonction chercher_motifs).
+
+    Version 1.5 2026-10-18
+        Une expression seule (texte_cherche sans motifs) est de nouveau cherchée telle
+        quelle : les références arrière numérotées (\\1) et les drapeaux globaux ((?i))
+        y marchent comme avant la 1.4. Avec plusieurs expressions l'alternative est
+        compilée dès la création de Motifs : une combinaison impossible est refusée tout
+        de suite au lieu de faire échouer la recherche dans chaque fichier. Le nombre
+        d'alternatives gardées est limité (MAX_ALTERNATIVES).
+        Avec max_octets inférieur à TAILLE_SNIFF, on ne lit plus que max_octets octets
+        pour savoir si c'est un binaire, et on cherche dedans : avant on s'arrêtait sans
+        avoir rien cherché.
+
+    Version 1.6 2026-10-18
+        Un fichier texte qui commence par MZ, RIFF, ID3, GIF8 ou %PDF n'est plus pris pour
+        un binaire : ces nombres magiques ne comptent que s'il y a aussi un caractère de
+        contrôle dans les premiers octets. Le cache des fichiers binaires change de table,
+        les fichiers mal reconnus avant seront regardés de nouveau.
+
+"""
+
+import os
+import logging
+import datetime
+import re
+import codecs
+import locale
+import mmap
+import copy
+from gipkocache import CacheFichiers
+
+VERSION = '1.6'
+PAT_SIZE = r'^\d{1,3}[kmgt]?o?$'
+TAILLE_BLOC = 1024 * 1024
+RECOUVREMENT = 4096
+BOMS = {b'\xef\xbb\xbf': 'utf-8-sig', b'\xff\xfe': 'utf-16', b'\xfe\xff': 'utf-16'}
+#   Les codecs utf-8-sig et utf-16 consomment eux-mêmes le BOM.
+TAILLE_SNIFF = 8192
+MAGIQUES = (
+    b'\x7fELF',             # exécutable linux
+    b'PK\x03\x04',          # zip, docx, xlsx, jar...
+    b'\xd0\xcf\x11\xe0',    # ancien office (doc, xls, msg)
+    b'\x89PNG',
+    b'\xff\xd8\xff',        # jpeg
+    b'7z\xbc\xaf\x27\x1c',
+    b'Rar!\x1a\x07',
+    b'\x1f\x8b',            # gzip
+    b'\x00\x00\x01\x00',    # ico
+)
+MAGIQUES_LETTRES = (
+    b'MZ',                  # exe, dll
+    b'%PDF',
+    b'GIF8',
+    b'ID3',                 # mp3
+    b'RIFF',                # wav, avi
+)
+#   Ces "nombres magiques" là ne sont que des lettres : un fichier texte peut très bien
+#   commencer comme ça. Il faut un octet de contrôle plus loin pour y croire (voir
+#   est_binaire).
+_octet_controle = re.compile(b'[\x00-\x07\x0e-\x1a\x1c-\x1f\x7f]')
+#   Les octets qu'on ne trouve pas dans un fichier texte : tous les caractères de
+#   contrôle sauf \b, \t, \n, \v, \f, \r et ESC.
+TABLE_BINAIRES = 'binaires_2'
+#   Nom de la table du cache des fichiers binaires. Il change quand la façon de les
+#   reconnaître change : les réponses de l'ancienne ne sont plus lues.
+_motifs_octets = {}
+TEXTE_CHERCHE = ''
+#   Le nom sous lequel texte_cherche est rangé avec les motifs nommés.
+MAX_ALTERNATIVES = 256
+#   Nombre maximal d'alternatives gardées par un objet Motifs.
+_drapeaux_globaux = re.compile(r'^\(\?([aiLmsux]+)\)')
+_reference_numerotee = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)')
+
+
+# ------------------------------------------------------------------------------------
+def lire_date(texte, libelle):
+    """
+        Décode une date au format ISO, jour seul ou jour + heure (séparés par un "T" ou
+        une espace), et renvoie le timestamp correspondant.
+    """
+    for format_date in ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(texte, format_date).timestamp()
+        except ValueError:
+            pass
+
+    raise ValueError('%s incorrecte, %s' % (libelle, texte)) from None
+
+
+# ------------------------------------------------------------------------------------
+def lire_taille(texte, libelle):
+    """
+        Décode une taille, nombre entier suffixé par une abréviation de taille (k|m|g|t)?o?,
+        et renvoie le nombre d'octets correspondant.
+    """
+    if not re.search(PAT_SIZE, texte, re.I):
+        raise ValueError('%s incorrecte, %s' % (libelle, texte)) from None
+
+    facteur = 1000000000000 if re.search('t', texte, re.I) \
+        else (1000000000 if re.search('g', texte, re.I)
+              else (1000000 if re.search('m', texte, re.I)
+                    else (1000 if re.search('k', texte, re.I)
+                          else 1)))
+    return int(re.search(r'^\d+', texte).group()) * facteur
+
+
+# ------------------------------------------------------------------------------------
+def lire_motifs(motifs):
+    """
+        Les motifs nommés peuvent être donnés sous forme de dictionnaire {nom: regexp} ou
+        de liste de chaînes "nom=regexp". Renvoie le dictionnaire.
+    """
+    if not motifs:
+        return {}
+
+    if isinstance(motifs, dict):
+        return dict(motifs)
+
+    resultat = {}
+    for motif in motifs:
+        nom, egal, texte = motif.partition('=')
+        if not egal or not nom:
+            raise ValueError('Motif incorrect, %s. Format attendu : nom=expression' % motif)
+        resultat[nom] = texte
+
+    return resultat
+
+
+# ------------------------------------------------------------------------------------
+def est_binaire(debut):
+    """
+        Devine d'après les premiers octets d'un fichier si c'est un fichier binaire :
+        soit il commence par un "nombre magique" connu, soit il contient un octet nul.
+        Un fichier avec un BOM utf-16 (plein d'octets nuls...) est du texte.
+
+        Les nombres magiques qui ne sont que des lettres (MAGIQUES_LETTRES : "MZ",
+        "%PDF"...) ne suffisent pas, il faut aussi un caractère de contrôle dans ces
+        premiers octets. Ce qui ne manque pas dans les vrais : l'entête d'un exe a des
+        octets nuls dans e_lfanew, la longueur d'un RIFF est en binaire, etc.
+    """
+    for bom in BOMS:
+        if debut.startswith(bom):
+            return False
+
+    if debut.startswith(MAGIQUES) or b'\x00' in debut:
+        return True
+
+    return debut.startswith(MAGIQUES_LETTRES) and _octet_controle.search(debut) is not None
+
+
+# ------------------------------------------------------------------------------------
+def _motif_octets(motif, flags, encodage):
+    """
+        Traduit une expression régulière texte en expression régulière sur des octets
+        dans l'encodage donné. None si ce n'est pas possible : encodage qui n'est pas
+        compatible ascii (les caractères spéciaux des expressions régulières ne seraient
+        plus les mêmes), ou caractère impossible à encoder.
+    """
+    if encodage.lower().replace('_', '-') == 'utf-8-sig':
+        encodage = 'utf-8'
+
+    cle = (motif, flags, encodage)
+    if cle not in _motifs_octets:
+        try:
+            if 'azAZ09\\.*'.encode(encodage) != b'azAZ09\\.*':
+                raise ValueError(encodage)
+            _motifs_octets[cle] = re.compile(motif.encode(encodage), flags & ~re.UNICODE)
+        except (ValueError, LookupError, re.error):
+            _motifs_octets[cle] = None
+
+    return _motifs_octets[cle]
+
+
+#   -------------------------------------------------------------------------------
+class Motifs:
+    """
+        Plusieurs expressions régulières nommées, cherchées en une seule lecture du fichier.
+
+        Syntaxe : motifs = Motifs({'nom1': 'regexp1', 'nom2': 'regexp2', ...})
+
+        Les expressions sont combinées en une seule alternative "(regexp1)|(regexp2)|..."
+        dont chaque branche est un groupe nommé : un seul passage sur le texte dit quelle
+        expression a été trouvée, et où. On retire alors cette expression de l'alternative
+        et on repart du même endroit avec celles qui restent, jusqu'à ce qu'on les ait
+        toutes trouvées ou qu'on arrive au bout du texte. Comme ça une expression n'en
+        masque pas une autre qui commencerait au même endroit.
+        Les alternatives déjà construites sont gardées, on ne les recompile pas pour
+        chaque fichier.
+
+        Une expression seule (ou la dernière qui reste) est cherchée telle quelle.
+
+        Quand il y en a plusieurs, les drapeaux globaux en tête d'une expression ((?i)...)
+        ne valent que pour elle : ils sont transformés en drapeaux locals ((?i:...)).
+        Les références arrière numérotées (\\1, (?(1)...)) sont refusées, puisqu'une fois
+        les expressions mises bout à bout elles ne désigneraient plus le bon groupe :
+        utiliser des groupes nommés.
+        Les alternatives déjà construites sont gardées (au plus MAX_ALTERNATIVES), on ne
+        les recompile pas pour chaque fichier.
+    """
+    def __init__(self, motifs, flags=re.I):
+        self.noms = list(motifs)
+        self.textes = [motifs[nom] for nom in self.noms]
+        self.flags = flags
+        self.tous = frozenset(range(len(self.noms)))
+        self.alternatives = {}
+
+        for nom, texte in zip(self.noms, self.textes):
+            try:
+                re.compile(texte, flags)
+            except re.error:
+                raise ValueError('%s (%s) n\'est pas une expression régulière correcte' % (texte, nom)) from None
+
+        if len(self.noms) > 1:
+            self.branches = [self.__branche__(nom, texte) for nom, texte in zip(self.noms, self.textes)]
+            try:
+                self.alternative(self.tous)
+            except re.error as e:
+                raise ValueError('Les expressions %s ne peuvent pas être cherchées ensemble : %s' % (', '.join(self.textes), e)) from None
+
+    #   -------------------------------------------------------------------------------
+    @staticmethod
+    def __branche__(nom, texte):
+        if _reference_numerotee.search(texte):
+            raise ValueError('%s (%s) : pas de référence arrière numérotée avec plusieurs expressions, utiliser un groupe nommé'
+                             % (texte, nom))
+
+        drapeaux = _drapeaux_globaux.match(texte)
+        if drapeaux:
+            if set(drapeaux.group(1)) - set('imsx'):
+                raise ValueError('%s (%s) : seuls les drapeaux i, m, s et x sont possibles avec plusieurs expressions' % (texte, nom))
+            texte = '(?%s:%s)' % (drapeaux.group(1), texte[drapeaux.end():])
+
+        return texte
+
+    #   -------------------------------------------------------------------------------
+    def alternative(self, restants, encodage=None):
+        """
+            L'expression combinée pour les expressions dont les indices sont dans
+            restants (l'expression elle-même s'il n'en reste qu'une). Sur des octets dans
+            l'encodage donné si encodage est renseigné (None si c'est impossible, voir
+            _motif_octets).
+        """
+        cle = (restants, encodage)
+        if cle not in self.alternatives:
+            if len(restants) == 1:
+                texte = self.textes[next(iter(restants))]
+            else:
+                texte = '|'.join('(?P<_m%s>%s)' % (i, self.branches[i]) for i in sorted(restants))
+
+            if len(self.alternatives) >= MAX_ALTERNATIVES:
+                self.alternatives.clear()
+            if encodage:
+                self.alternatives[cle] = _motif_octets(texte, self.flags | re.UNICODE, encodage)
+            else:
+                self.alternatives[cle] = re.compile(texte, self.flags)
+
+        return self.alternatives[cle]
+
+    #   -------------------------------------------------------------------------------
+    def chercher(self, texte, restants, encodage=None, fin=None):
+        """
+            Cherche dans texte (des octets si encodage est renseigné) les expressions dont
+            les indices sont dans restants. Renvoie les indices de celles qui n'ont pas été
+            trouvées.
+        """
+        position = 0
+        fin = len(texte) if fin is None else fin
+        while restants:
+            trouve = self.alternative(restants, encodage).search(texte, position, fin)
+            if trouve is None:
+                break
+
+            if len(restants) == 1:
+                restants = frozenset()
+            else:
+                restants = restants - {int(trouve.lastgroup[2:])}
+            position = trouve.start()
+
+        return restants
+
+    #   -------------------------------------------------------------------------------
+    def noms_trouves(self, restants):
+        return tuple(self.noms[i] for i in sorted(self.tous - restants))
+
+
+# ------------------------------------------------------------------------------------
+def chercher_motifs(nom_complet, motifs, encoding=None, taille_bloc=TAILLE_BLOC, recouvrement=RECOUVREMENT,
+                    max_octets=None, seuil_mmap=None):
+    """
+        Cherche les expressions régulières d'un objet Motifs dans le contenu du fichier,
+        sans jamais le charger en entier : on lit par blocs de taille_bloc octets et on
+        garde à chaque fois les recouvrement derniers caractères du bloc précédent, pour
+        trouver aussi ce qui est à cheval sur deux blocs. La mémoire utilisée ne dépend
+        donc pas de la taille du fichier.
+        (Forcément, une correspondance plus longue que le recouvrement qui tombe à cheval
+        sur deux blocs ne sera pas trouvée.)
+
+        On s'arrête dès que toutes les expressions ont été trouvées. Si max_octets est
+        renseigné on ne lit pas plus que ça dans chaque fichier.
+
+        L'encodage est deviné d'après le BOM s'il y en a un, sinon c'est encoding (et à
+        défaut l'encodage par défaut du système, comme open).
+
+        Si seuil_mmap est renseigné, pour les fichiers au moins aussi gros on fait la
+        recherche directement sur une "projection" en mémoire (mmap) du fichier, avec
+        l'expression régulière traduite en octets dans l'encodage du fichier : pas de
+        décodage, pas de copie du contenu dans une chaîne python.
+        Attention, sur des octets l'option "insensible à la casse" ne marche que pour les
+        lettres non accentuées, et une classe de caractères [...] avec des accents ne
+        veut plus dire la même chose en utf-8. Les fichiers utf-16 passent toujours par
+        la lecture par blocs.
+
+        Renvoie le tuple des noms des expressions trouvées (vide si aucune), et None si
+        d'après ses premiers octets c'est un fichier binaire (exécutable, archive,
+        image...) : dans ce cas on n'essaie même pas de le décoder.
+        Lève UnicodeDecodeError si le fichier ne peut pas être décodé (mauvais
+        encodage...), OSError s'il ne peut pas être lu.
+    """
+    logger = logging.getLogger()
+    restants = motifs.tous
+
+    with open(nom_complet, 'rb') as f:
+        debut = f.read(min(TAILLE_SNIFF, max_octets) if max_octets else TAILLE_SNIFF)
+        if est_binaire(debut):
+            return None
+
+        #   Y'a des farceurs qui nous encodent leurs fichiers en utf 16... Faut gérer !
+        encodage = encoding or locale.getpreferredencoding(False)
+        for bom in BOMS:
+            if debut.startswith(bom):
+                encodage = BOMS[bom]
+                logger.debug('{0} encodé en {1}'.format(nom_complet, encodage))
+                break
+
+        if seuil_mmap and not encodage.startswith('utf-16'):
+            taille = os.fstat(f.fileno()).st_size
+            if taille >= seuil_mmap and motifs.alternative(restants, encodage) is not None:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as projection:
+                    restants = motifs.chercher(projection, restants, encodage, min(max_octets or taille, taille))
+                return motifs.noms_trouves(restants)
+
+        decodeur = codecs.getincrementaldecoder(encodage)()
+        bloc = debut
+        lus = len(debut)
+        reste = ''
+
+        while True:
+            #   Le premier bloc (ce qu'on a lu pour savoir si c'est un binaire) est cherché
+            #   même s'il atteint déjà max_octets.
+            plafond = max_octets and lus >= max_octets
+            if plafond:
+                logger.debug('%s : arrêt de la recherche après %s octets' % (nom_complet, lus))
+                suite = b''
+            else:
+                a_lire = taille_bloc if not max_octets else min(taille_bloc, max_octets - lus)
+                suite = f.read(a_lire)
+                lus += len(suite)
+            bloc += suite
+
+            #   Si on s'arrête à cause de max_octets le dernier caractère peut être coupé :
+            #   ce n'est pas une erreur de décodage.
+            texte = reste + decodeur.decode(bloc, final=not suite and not plafond)
+            restants = motifs.chercher(texte, restants)
+
+            if not suite or not restants:
+                break
+
+            reste = texte[-recouvrement:]
+            bloc = b''
+
+    return motifs.noms_trouves(restants)
+
+
+# ------------------------------------------------------------------------------------
+def chercher_texte(nom_complet, regex, encoding=None, taille_bloc=TAILLE_BLOC, recouvrement=RECOUVREMENT,
+                   max_octets=None, seuil_mmap=None):
+    """
+        Comme chercher_motifs, pour une seule expression régulière (compilée).
+        Renvoie True si trouvé, False sinon, et None si c'est un fichier binaire.
+    """
+    trouves = chercher_motifs(nom_complet, Motifs({'': regex.pattern}, regex.flags), encoding, taille_bloc,
+                              recouvrement, max_octets, seuil_mmap)
+    return None if trouves is None else bool(trouves)
+
+
+#   -------------------------------------------------------------------------------
+class Filter:
+    """
+        Chaîne de prédicats de sélection des fichiers.
+
+        Chaque prédicat est un tuple (libellé, fonction, message d'élimination). Il y a
+        trois listes, une par niveau de coût :
+        - predicats_nom     : fonction(fic, nom_complet)
+        - predicats_stat    : fonction(taille, date_mod)
+        - predicats_contenu : fonction(nom_complet, taille, date_mod), qui renvoie None
+                              si le fichier est éliminé, le tuple des motifs trouvés sinon.
+        Une liste vide ne coûte rien, un filtre sans critère laisse tout passer.
+    """
+    def __init__(self, date_min=None, date_max=None, size_min=None, size_max=None, extensions=None,
+                 pattern=None, texte_cherche=None, def_encoding=None, max_octets=None, taille_bloc=TAILLE_BLOC,
+                 cache_binaires=None, seuil_mmap=None, motifs=None):
+        self.date_min = lire_date(date_min, 'Date min') if date_min else None
+        self.date_max = lire_date(date_max, 'Date max') if date_max else None
+        self.size_min = lire_taille(size_min, 'Taille min') if size_min else None
+        self.size_max = lire_taille(size_max, 'Taille max') if size_max else None
+        self.extensions = frozenset(extensions.split(',')) if extensions else None
+
+        try:
+            self.pattern = re.compile(pattern, re.I) if pattern else None
+        except re.error:
+            raise ValueError('%s n\'est pas une expression régulière correcte' % pattern) from None
+
+        try:
+            self.texte_cherche = re.compile(texte_cherche, re.I) if texte_cherche else None
+        except re.error:
+            raise ValueError('%s n\'est pas une expression régulière correcte' % texte_cherche) from None
+
+        self.def_encoding = def_encoding
+        if isinstance(max_octets, str):
+            max_octets = lire_taille(max_octets, 'Taille max lue')
+        self.max_octets = max_octets
+        self.taille_bloc = taille_bloc
+
+        if isinstance(cache_binaires, str):
+            cache_binaires = CacheFichiers(cache_binaires, TABLE_BINAIRES)
+        self.cache_binaires = cache_binaires
+
+        if isinstance(seuil_mmap, str):
+            seuil_mmap = lire_taille(seuil_mmap, 'Seuil mmap')
+        self.seuil_mmap = seuil_mmap
+
+        #   La recherche dans le contenu : texte_cherche et les motifs nommés sont cherchés
+        #   ensemble, en une seule lecture de chaque fichier.
+        self.motifs = lire_motifs(motifs)
+        a_chercher = {}
+        if self.texte_cherche:
+            a_chercher[TEXTE_CHERCHE] = self.texte_cherche.pattern
+        a_chercher.update(self.motifs)
+        self.recherche = Motifs(a_chercher) if a_chercher else None
+
+        self.predicats_nom = []
+        self.predicats_stat = []
+        self.predicats_contenu = []
+        self.__compiler__()
+
+    #   -------------------------------------------------------------------------------
+    def __compiler__(self):
+        """
+            Construit les listes de prédicats. Dans chaque liste on met le test le plus
+            simple en premier : une recherche dans un ensemble coûte moins cher qu'une
+            expression régulière.
+        """
+        extensions = self.extensions
+        pattern = self.pattern
+        date_min = self.date_min
+        date_max = self.date_max
+        size_min = self.size_min
+        size_max = self.size_max
+
+        if extensions:
+            self.predicats_nom.append(('extensions', lambda fic, nom_complet: os.path.splitext(fic)[1] in extensions,
+                                       'à cause de son extension'))
+        if pattern:
+            self.predicats_nom.append(('pattern', lambda fic, nom_complet: pattern.search(nom_complet) is not None,
+                                       'par l\'expression régulière sur le nom'))
+
+        """
+            Le gag des dates avec windows :
+            Si on crée un fichier f1 le 1 janvier, qu'on le modifie le 15 janvier, et que le 1 février on
+            copie ce fichier f1 en fichier f2, le fichier f1 aura bien comme date de création le 1 janvier
+            et comme date de modification le 15 janvier, mais le fichier f2 aura, lui, comme date de
+            modification le 15 janvier et comme date de création le 1 janvier !
+            Microsoft nous a inventé la machine à remonter le temps...
+
+            On va donc se baser sur la date de modification
+        """
+        if size_min:
+            self.predicats_stat.append(('size_min', lambda taille, date_mod: taille >= size_min,
+                                        'parce que plus petit que taille min'))
+        if size_max:
+            self.predicats_stat.append(('size_max', lambda taille, date_mod: taille <= size_max,
+                                        'parce que plus grand que taille max'))
+        if date_min:
+            self.predicats_stat.append(('date_min', lambda taille, date_mod: date_mod >= date_min,
+                                        'parce qu\'antérieur à date min'))
+        if date_max:
+            self.predicats_stat.append(('date_max', lambda taille, date_mod: date_mod <= date_max,
+                                        'parce que postérieur à date max'))
+
+        if self.recherche:
+            libelle = ', '.join((['texte_cherche'] if self.texte_cherche else []) + ['motif ' + m for m in self.motifs])
+            self.predicats_contenu.append((libelle, self.__contient__,
+                                           'parce qu\'il ne contient pas l\'expression régulière indiquée'))
+
+    #   -------------------------------------------------------------------------------
+    def __contient__(self, nom_complet, taille, date_mod):
+        """
+            Renvoie None si le fichier est éliminé, sinon le tuple des noms des motifs
+            trouvés (vide s'il n'y a que texte_cherche).
+
+            On ne garde en cache que les fichiers binaires : pour un fichier texte le
+            "reniflage" ne coûte rien puisqu'on lit de toute façon ses premiers octets
+            pour la recherche.
+        """
+        logger = logging.getLogger()
+        if self.binaire_connu(nom_complet, taille, date_mod):
+            return None
+
+        try:
+            trouves = chercher_motifs(nom_complet, self.recherche, self.def_encoding, self.taille_bloc,
+                                      max_octets=self.max_octets, seuil_mmap=self.seuil_mmap)
+        except Exception as e:
+            logger.warning('Pas pu lire le contenu du fichier {0} pour y chercher l\'expression régulière : {1}'.format(nom_complet, e))
+            return None
+
+        if trouves is None:
+            logger.debug('%s : fichier binaire' % nom_complet)
+            if self.cache_binaires is not None:
+                self.cache_binaires.ecrire(nom_complet, taille, date_mod, True)
+            return None
+
+        if self.texte_cherche and TEXTE_CHERCHE not in trouves:
+            return None
+
+        trouves = tuple(m for m in trouves if m != TEXTE_CHERCHE)
+        if self.motifs and not trouves:
+            return None
+
+        return trouves
+
+    #   -------------------------------------------------------------------------------
+    def binaire_connu(self, nom_complet, taille, date_mod):
+        """
+            Vrai si le cache dit que ce fichier (dans cet état) est un fichier binaire.
+        """
+        if self.cache_binaires is not None and self.cache_binaires.lire(nom_complet, taille, date_mod):
+            logging.getLogger().debug('%s : fichier binaire (d\'après le cache)' % nom_complet)
+            return True
+        return False
+
+    #   -------------------------------------------------------------------------------
+    def sans_contenu(self):
+        """
+            Renvoie une copie de ce filtre sans la recherche dans le contenu, pour faire
+            la recherche à part (voir les processus de gipkowalk).
+        """
+        copie = copy.copy(self)
+        copie.predicats_contenu = []
+        copie.motifs = {}
+        copie.recherche = None
+        return copie
+
+    #   -------------------------------------------------------------------------------
+    def parametres_contenu(self):
+        """
+            Les arguments qui permettent de reconstruire la partie "recherche dans le
+            contenu" de ce filtre dans un autre processus : Filter(**parametres).
+            Tout ce qui est renvoyé peut être transmis par pickle, pas le cache.
+        """
+        return {'texte_cherche': self.texte_cherche.pattern if self.texte_cherche else None,
+                'motifs': self.motifs, 'def_encoding': self.def_encoding, 'max_octets': self.max_octets,
+                'taille_bloc': self.taille_bloc, 'seuil_mmap': self.seuil_mmap}
+
+    #   -------------------------------------------------------------------------------
+    def fermer(self):
+        """
+            À appeler en fin de traitement pour enregistrer le cache des fichiers binaires.
+        """
+        if self.cache_binaires is not None:
+            self.cache_binaires.fermer()
+            self.cache_binaires = None
+
+    #   -------------------------------------------------------------------------------
+    def accepte_nom(self, fic, nom_complet):
+        for libelle, predicat, message in self.predicats_nom:
+            if not predicat(fic, nom_complet):
+                logging.getLogger().debug('%s éliminé %s', nom_complet, message)
+                return False
+        return True
+
+    #   -------------------------------------------------------------------------------
+    def accepte_stat(self, nom_complet, taille, date_mod):
+        for libelle, predicat, message in self.predicats_stat:
+            if not predicat(taille, date_mod):
+                logging.getLogger().debug('%s éliminé %s', nom_complet, message)
+                return False
+        return True
+
+    #   -------------------------------------------------------------------------------
+    def accepte_contenu(self, nom_complet, taille, date_mod):
+        """
+            Contrairement à accepte_nom et accepte_stat, renvoie None si le fichier est
+            éliminé, et sinon le tuple des noms des motifs trouvés dans le fichier.
+        """
+        trouves = ()
+        for libelle, predicat, message in self.predicats_contenu:
+            trouves = predicat(nom_complet, taille, date_mod)
+            if trouves is None:
+                logging.getLogger().debug('%s éliminé %s', nom_complet, message)
+                return None
+        return trouves
+
+    #   -------------------------------------------------------------------------------
+    def predicats(self):
+        """
+            Renvoie la liste des libellés des prédicats actifs, dans l'ordre où ils sont testés.
+        """
+        return [p[0] for p in self.predicats_nom + self.predicats_stat + self.predicats_contenu]
+
+    #   -------------------------------------------------------------------------------
+    def __bool__(self):
+        return bool(self.predicats_nom or self.predicats_stat or self.predicats_contenu)
+
+    #   -------------------------------------------------------------------------------
+    def __repr__(self):
+        return 'Filter(%s)' % ', '.join(self.predicats())
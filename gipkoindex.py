@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Index persistant (base SQLite) du contenu des répertoires d'une arborescence, pour
+    les parcours répétés de gipkowalk.
+
+    Pour chaque répertoire on garde sa date de modification, la liste de ses
+    sous-répertoires et la liste de ses fichiers avec leur taille et leur date de
+    modification. Au parcours suivant, si la date de modification d'un répertoire n'a
+    pas changé on ne le relit pas : son contenu est pris dans l'index. Sur une
+    arborescence qui change peu ça évite l'essentiel des requêtes au serveur de
+    fichiers, il ne reste qu'un stat par répertoire.
+
+    ATTENTION : la date de modification d'un répertoire change quand on y crée, supprime
+    ou renomme un fichier ou un sous-répertoire, mais PAS quand on modifie le contenu
+    d'un fichier existant. Pour ces fichiers l'index donnera donc l'ancienne taille et
+    l'ancienne date. C'est le prix à payer...
+    Pour savoir si c'est acceptable on peut demander une vérification : une proportion
+    des répertoires (tirés au hasard) est relue même si elle n'a pas changé, et les
+    différences avec l'index sont signalées dans le log (et corrigées dans l'index).
+
+    Syntaxe :
+        index = IndexRepertoires('c:\\temp\\index.db', verification=0.01)
+        for D, fic, taille, date_mod in gipkowalk(rep, index=index): ...
+        index.fermer()
+    ou plus simplement gipkowalk(rep, index='c:\\temp\\index.db', verification=0.01)
+
+    L'index sert aussi de catalogue : on peut y chercher les fichiers d'une arborescence
+    sans la parcourir (gipkowalk.catalogue, gipkodir --catalogue). Les tailles, dates,
+    extensions et répertoires des fichiers sont indexés, une recherche ne prend que
+    quelques millisecondes. Pour mettre le catalogue à jour il suffit de refaire un
+    parcours avec l'index : seuls les répertoires modifiés sont relus, et ceux qui ont
+    disparu sont supprimés du catalogue avec tout leur contenu.
+    Les chemins des répertoires sont rangés normalisés (_cle : chemin absolu, et sous
+    windows en minuscules) : on retrouve le même répertoire quel que soit le répertoire
+    courant ou la façon dont on l'a écrit.
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+    Version 1.1 2026-10-18
+        Catalogue : extension des fichiers, index sur la taille, la date et l'extension,
+        méthode fichiers_sous. Les répertoires disparus sont supprimés de l'index.
+        Chemins normalisés.
+
+    Version 1.2 2026-10-18
+        Chemins absolus et normcase au lieu de normpath seul : un index fait avec un
+        chemin relatif ne servait plus depuis un autre répertoire courant, ni pour le
+        chemin absolu. Les index faits avant sont relus au premier passage.
+
+"""
+
+import os
+import logging
+import itertools
+import random
+import sqlite3
+import threading
+
+VERSION = '1.2'
+REPERTOIRES_PAR_COMMIT = 100
+
+
+#   -------------------------------------------------------------------------------
+def _cle(chemin):
+    """
+        Le chemin d'un répertoire tel qu'il est rangé dans l'index.
+    """
+    return os.path.normcase(os.path.abspath(chemin))
+
+
+#   -------------------------------------------------------------------------------
+def _sous_chemins(chemin):
+    """
+        Bornes (début inclus, fin exclue) des chemins qui sont sous chemin, pour une
+        recherche par intervalle qui profite des index (LIKE ne s'en sert pas).
+    """
+    debut = chemin if chemin.endswith(os.sep) else chemin + os.sep
+    return debut, debut[:-1] + chr(ord(os.sep) + 1)
+
+
+#   -------------------------------------------------------------------------------
+class EntreeIndex:
+    """
+        Se fait passer pour un os.DirEntry quand le contenu d'un répertoire vient de
+        l'index : name, path, is_symlink() et stat(), qui renvoie l'entrée elle-même
+        puisqu'elle a les attributs st_size et st_mtime.
+    """
+    __slots__ = ('name', 'path', 'st_size', 'st_mtime', 'lien')
+
+    def __init__(self, D, nom, taille=None, mtime=None, lien=False):
+        self.name = nom
+        self.path = os.path.join(D, nom)
+        self.st_size = taille
+        self.st_mtime = mtime
+        self.lien = lien
+
+    def is_symlink(self):
+        return self.lien
+
+    def stat(self):
+        return self
+
+
+#   -------------------------------------------------------------------------------
+class IndexRepertoires:
+    """
+        nom_fichier  : fichier SQLite, créé s'il n'existe pas.
+        verification : proportion (entre 0 et 1) des répertoires non modifiés qu'on
+                       relit quand même pour vérifier l'index. Défaut 0.
+    """
+    def __init__(self, nom_fichier, verification=0):
+        self.verification = verification
+        self.verrou = threading.Lock()
+        self.connexion = sqlite3.connect(nom_fichier, check_same_thread=False)
+        self.connexion.executescript("""
+            CREATE TABLE IF NOT EXISTS repertoires (chemin TEXT PRIMARY KEY, mtime REAL);
+            CREATE TABLE IF NOT EXISTS sous_repertoires (repertoire TEXT, nom TEXT, lien INTEGER);
+            CREATE TABLE IF NOT EXISTS fichiers (repertoire TEXT, nom TEXT, taille INTEGER, mtime REAL, extension TEXT);
+        """)
+        #   Les index créés avec la version 1.0 n'ont pas la colonne extension.
+        if 'extension' not in [c[1] for c in self.connexion.execute('PRAGMA table_info(fichiers)')]:
+            self.connexion.create_function('extension_de', 1, lambda nom: os.path.splitext(nom)[1])
+            self.connexion.execute('ALTER TABLE fichiers ADD COLUMN extension TEXT')
+            self.connexion.execute('UPDATE fichiers SET extension = extension_de(nom)')
+        self.connexion.executescript("""
+            CREATE INDEX IF NOT EXISTS sous_repertoires_repertoire ON sous_repertoires (repertoire);
+            CREATE INDEX IF NOT EXISTS fichiers_repertoire ON fichiers (repertoire);
+            CREATE INDEX IF NOT EXISTS fichiers_taille ON fichiers (taille);
+            CREATE INDEX IF NOT EXISTS fichiers_mtime ON fichiers (mtime);
+            CREATE INDEX IF NOT EXISTS fichiers_extension ON fichiers (extension);
+        """)
+        self.connexion.commit()
+        self.nb_ecritures = 0
+        self.nb_lus = 0
+        self.nb_index = 0
+        self.nb_differences = 0
+
+    #   -------------------------------------------------------------------------------
+    def __lire__(self, D):
+        """
+            Renvoie (mtime, sous-répertoires, fichiers) tels qu'ils sont dans l'index, ou
+            None si le répertoire n'y est pas.
+        """
+        cle = _cle(D)
+        with self.verrou:
+            ligne = self.connexion.execute('SELECT mtime FROM repertoires WHERE chemin = ?', (cle,)).fetchone()
+            if ligne is None:
+                return None
+
+            dirs = [EntreeIndex(D, nom, lien=bool(lien)) for nom, lien in
+                    self.connexion.execute('SELECT nom, lien FROM sous_repertoires WHERE repertoire = ? ORDER BY rowid', (cle,))]
+            fics = [EntreeIndex(D, nom, taille, mtime) for nom, taille, mtime in
+                    self.connexion.execute('SELECT nom, taille, mtime FROM fichiers WHERE repertoire = ? ORDER BY rowid', (cle,))]
+
+        return ligne[0], dirs, fics
+
+    #   -------------------------------------------------------------------------------
+    def __ecrire__(self, D, mtime, dirs, fics, disparus=()):
+        """
+            disparus : noms des sous-répertoires qui étaient dans l'index et n'existent
+                       plus. On les supprime avec tout leur contenu.
+        """
+        cle = _cle(D)
+        with self.verrou:
+            for nom in disparus:
+                self.__supprimer__(_cle(os.path.join(cle, nom)))
+            self.connexion.execute('DELETE FROM sous_repertoires WHERE repertoire = ?', (cle,))
+            self.connexion.execute('DELETE FROM fichiers WHERE repertoire = ?', (cle,))
+            self.connexion.executemany('INSERT INTO sous_repertoires (repertoire, nom, lien) VALUES (?, ?, ?)',
+                                       [(cle, e.name, int(e.is_symlink())) for e in dirs])
+            self.connexion.executemany('INSERT INTO fichiers (repertoire, nom, taille, mtime, extension) VALUES (?, ?, ?, ?, ?)',
+                                       [(cle, e.name, e.st_size, e.st_mtime, os.path.splitext(e.name)[1]) for e in fics])
+            self.connexion.execute('INSERT OR REPLACE INTO repertoires (chemin, mtime) VALUES (?, ?)', (cle, mtime))
+            self.nb_ecritures += 1
+            if self.nb_ecritures % REPERTOIRES_PAR_COMMIT == 0:
+                self.connexion.commit()
+
+    #   -------------------------------------------------------------------------------
+    def __supprimer__(self, cle):
+        """
+            Supprime de l'index un répertoire et toute son arborescence. À appeler avec le
+            verrou.
+        """
+        debut, fin = _sous_chemins(cle)
+        for table, colonne in (('repertoires', 'chemin'), ('sous_repertoires', 'repertoire'), ('fichiers', 'repertoire')):
+            self.connexion.execute('DELETE FROM %s WHERE %s = ? OR (%s >= ? AND %s < ?)' % (table, colonne, colonne, colonne),
+                                   (cle, debut, fin))
+
+    #   -------------------------------------------------------------------------------
+    def lister(self, D, lister):
+        """
+            Même contrat que gipkowalk._lister, qu'on passe en argument : renvoie le couple
+            (sous-répertoires, fichiers) du répertoire D, ou None s'il ne peut pas être lu.
+            Pris dans l'index si le répertoire n'a pas changé, sinon relu avec lister et
+            mis à jour dans l'index.
+        """
+        logger = logging.getLogger()
+        try:
+            mtime = os.stat(D).st_mtime
+        except OSError as e:
+            logger.error('Impossible de lister le répertoire %s : %s' % (D, e))
+            return None
+
+        connu = self.__lire__(D)
+        a_verifier = connu is not None and connu[0] == mtime and self.verification \
+            and random.random() < self.verification
+
+        if connu is not None and connu[0] == mtime and not a_verifier:
+            self.nb_index += 1
+            return connu[1], connu[2]
+
+        contenu = lister(D)
+        if contenu is None:
+            return None
+
+        self.nb_lus += 1
+        dirs = [EntreeIndex(D, e.name, lien=e.is_symlink()) for e in contenu[0]]
+        fics = []
+        for e in contenu[1]:
+            try:
+                st = e.stat()
+            except OSError:
+                logger.error('Impossible d\'avoir la taille et les dates du fichier %s' % e.path)
+                continue
+            fics.append(EntreeIndex(D, e.name, st.st_size, st.st_mtime))
+
+        if a_verifier and self.__identiques__(connu, dirs, fics):
+            return dirs, fics
+
+        if a_verifier:
+            self.nb_differences += 1
+            logger.warning('Index : le contenu de %s a changé sans que sa date de modification change' % D)
+
+        disparus = set(e.name for e in connu[1]) - set(e.name for e in dirs) if connu is not None else ()
+        self.__ecrire__(D, mtime, dirs, fics, disparus)
+
+        return dirs, fics
+
+    #   -------------------------------------------------------------------------------
+    def __identiques__(self, connu, dirs, fics):
+        avant = (sorted(e.name for e in connu[1]), sorted((e.name, e.st_size, e.st_mtime) for e in connu[2]))
+        apres = (sorted(e.name for e in dirs), sorted((e.name, e.st_size, e.st_mtime) for e in fics))
+        return avant == apres
+
+    #   -------------------------------------------------------------------------------
+    def fichiers_sous(self, nom_rep_base, size_min=None, size_max=None, date_min=None, date_max=None, extensions=None):
+        """
+            Utilisation en catalogue : renvoie, pour chaque répertoire de l'index qui est
+            dans l'arborescence nom_rep_base, le couple (répertoire, liste des EntreeIndex
+            de ses fichiers), en ne gardant que les fichiers qui remplissent les critères.
+            Les critères sont traduits en SQL pour profiter des index.
+            Les répertoires sont dans l'ordre alphabétique, et écrits à partir de
+            nom_rep_base tel qu'on l'a donné (comme pour un parcours). Sous windows la
+            suite du chemin est en minuscules, comme dans l'index.
+        """
+        base = _cle(nom_rep_base)
+        debut, fin = _sous_chemins(base)
+        conditions = ['(repertoire = ? OR (repertoire >= ? AND repertoire < ?))']
+        valeurs = [base, debut, fin]
+
+        for colonne, operateur, valeur in (('taille', '>=', size_min), ('taille', '<=', size_max),
+                                           ('mtime', '>=', date_min), ('mtime', '<=', date_max)):
+            if valeur:
+                conditions.append('%s %s ?' % (colonne, operateur))
+                valeurs.append(valeur)
+
+        if extensions:
+            conditions.append('extension IN (%s)' % ', '.join('?' * len(extensions)))
+            valeurs.extend(extensions)
+
+        def lignes():
+            #   Lues par paquets : le résultat peut être énorme.
+            with self.verrou:
+                curseur = self.connexion.execute('SELECT repertoire, nom, taille, mtime FROM fichiers WHERE %s '
+                                                 'ORDER BY repertoire, rowid' % ' AND '.join(conditions), valeurs)
+            while True:
+                with self.verrou:
+                    paquet = curseur.fetchmany(1000)
+                if not paquet:
+                    return
+                yield from paquet
+
+        for cle, groupe in itertools.groupby(lignes(), key=lambda ligne: ligne[0]):
+            D = nom_rep_base + cle[len(base):] if cle != base else nom_rep_base
+            yield D, [EntreeIndex(D, nom, taille, mtime) for cle, nom, taille, mtime in groupe]
+
+    #   -------------------------------------------------------------------------------
+    def fermer(self):
+        logger = logging.getLogger()
+        logger.info('Index : %s répertoires pris dans l\'index, %s relus, %s différences' %
+                    (self.nb_index, self.nb_lus, self.nb_differences))
+        with self.verrou:
+            self.connexion.commit()
+            self.connexion.close()
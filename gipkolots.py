@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Résultats de gipkowalk par lots, en colonnes, pour les grosses arborescences.
+
+    gipkowalk renvoie un tuple par fichier. Sur un partage de plusieurs millions de
+    fichiers, les garder tous en mémoire (pour les trier, les totaliser, les mettre en
+    forme...) coûte des gigas de petits objets : le tuple, l'entier de la taille, le
+    flottant de la date, et surtout le nom du répertoire répété pour chacun de ses
+    fichiers.
+
+    Un LotFichiers range les mêmes informations en colonnes :
+        - rep    : array d'entiers, le numéro du répertoire dans une TableRepertoires
+                   partagée par tous les lots d'un même parcours ;
+        - noms   : liste des noms de fichiers ;
+        - tailles: array d'entiers 64 bits ;
+        - dates  : array de flottants (date de modification) ;
+        - motifs : avec des motifs nommés, liste des tuples de motifs trouvés.
+    Les tailles et les dates peuvent être triées ou totalisées directement
+    (sum(lot.tailles)), sans recréer d'objets.
+
+    La TableRepertoires ne garde pas les chemins complets des répertoires, qui répètent
+    des millions de fois les mêmes débuts (\\\\serveur\\partage\\service\\...) : chaque
+    répertoire est un noeud qui n'a que son propre nom et le numéro de son père. Le
+    chemin complet n'est reconstitué qu'au moment où on en a besoin (affichage).
+
+    Syntaxe :
+        for lot in gipkowalk_lots(rep, lignes_par_lot=10000, size_min='1M'):
+            total += sum(lot.tailles)
+            for D, fic, taille, date_mod in lot: ...      # comme gipkowalk
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+    Version 1.1 2026-10-18
+        TableRepertoires (arbre des répertoires) remplace la table des chemins complets.
+
+"""
+
+import os
+from array import array
+
+VERSION = '1.1'
+
+
+#   -------------------------------------------------------------------------------
+class TableRepertoires:
+    """
+        Arbre des répertoires : le répertoire numéro n a pour nom noms[n] et pour père
+        le répertoire numéro peres[n] (-1 pour une racine, dont le nom est le chemin
+        complet). table[n] donne le chemin complet, reconstitué à la demande.
+    """
+    def __init__(self):
+        self.noms = []
+        self.peres = array('l')
+        self.numeros = {}
+        #   Les fichiers d'un même répertoire arrivent à la suite : on garde le dernier
+        #   répertoire demandé pour ne pas redécouper son chemin à chaque fichier.
+        self.dernier = (None, None)
+
+    def __ajouter__(self, pere, nom):
+        n = self.numeros.get((pere, nom))
+        if n is None:
+            n = len(self.noms)
+            self.noms.append(nom)
+            self.peres.append(pere)
+            self.numeros[(pere, nom)] = n
+        return n
+
+    def numero(self, chemin):
+        if chemin == self.dernier[0]:
+            return self.dernier[1]
+
+        #   Récursif jusqu'à la racine, mais seulement quand on change de répertoire.
+        pere, nom = os.path.split(chemin)
+        if not nom or pere == chemin:
+            n = self.__ajouter__(-1, chemin)
+        else:
+            n = self.__ajouter__(self.numero(pere), nom)
+
+        self.dernier = (chemin, n)
+        return n
+
+    def __getitem__(self, n):
+        noms = []
+        while n >= 0:
+            noms.append(self.noms[n])
+            n = self.peres[n]
+        return os.path.join(*reversed(noms))
+
+    def __len__(self):
+        return len(self.noms)
+
+
+#   -------------------------------------------------------------------------------
+class LotFichiers:
+    """
+        repertoires : la TableRepertoires, partagée entre les lots.
+        avec_motifs : True si les résultats ont un cinquième élément (motifs trouvés).
+    """
+    __slots__ = ('repertoires', 'rep', 'noms', 'tailles', 'dates', 'motifs')
+
+    def __init__(self, repertoires, avec_motifs=False):
+        self.repertoires = repertoires
+        self.rep = array('L')
+        self.noms = []
+        self.tailles = array('q')
+        self.dates = array('d')
+        self.motifs = [] if avec_motifs else None
+
+    def ajouter(self, resultat):
+        """
+            resultat : un tuple tel que renvoyé par gipkowalk.
+        """
+        self.rep.append(self.repertoires.numero(resultat[0]))
+        self.noms.append(resultat[1])
+        self.tailles.append(resultat[2])
+        self.dates.append(resultat[3])
+        if self.motifs is not None:
+            self.motifs.append(resultat[4])
+
+    def chemin(self, i):
+        return os.path.join(self.repertoires[self.rep[i]], self.noms[i])
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __getitem__(self, i):
+        if self.motifs is None:
+            return self.repertoires[self.rep[i]], self.noms[i], self.tailles[i], self.dates[i]
+        return self.repertoires[self.rep[i]], self.noms[i], self.tailles[i], self.dates[i], self.motifs[i]
+
+    def __iter__(self):
+        for i in range(len(self.noms)):
+            yield self[i]
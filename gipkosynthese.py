@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Synthèse des résultats de gipkowalk : nombre de fichiers et volume par répertoire
+    (regroupés à une profondeur donnée), par extension et par ancienneté.
+
+    Tout est calculé au fil de l'eau avec des compteurs : on ne garde rien fichier par
+    fichier, la mémoire ne dépend que du nombre de répertoires à la profondeur choisie et
+    du nombre d'extensions différentes.
+
+    Syntaxe :
+        synthese = Synthese(rep, profondeur=2)
+        for resultat in gipkowalk(rep, ...):
+            synthese.ajouter(resultat)
+        for ligne in synthese.lignes(): print(ligne)
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import os
+import time
+import bisect
+from gipkofileinfo import affichageHumain
+
+VERSION = '1.0'
+JOUR = 24 * 3600
+TRANCHES = [(JOUR, 'moins d\'un jour'), (7 * JOUR, 'moins d\'une semaine'), (31 * JOUR, 'moins d\'un mois'),
+            (365 * JOUR, 'moins d\'un an'), (2 * 365 * JOUR, '1 à 2 ans'), (5 * 365 * JOUR, '2 à 5 ans'),
+            (None, 'plus de 5 ans')]
+
+
+#   -------------------------------------------------------------------------------
+class Synthese:
+    """
+        nom_rep_base : le répertoire parcouru.
+        profondeur   : les fichiers sont comptés dans leur répertoire de ce niveau (0 : tout
+                       dans le répertoire de base, 1 : dans ses sous-répertoires etc.).
+        maintenant   : date de référence pour l'ancienneté. Défaut : l'heure actuelle.
+    """
+    def __init__(self, nom_rep_base, profondeur=1, maintenant=None):
+        self.nom_rep_base = nom_rep_base
+        self.profondeur = profondeur
+        self.maintenant = maintenant if maintenant is not None else time.time()
+        self.limites = [t[0] for t in TRANCHES[:-1]]
+        self.repertoires = {}
+        self.extensions = {}
+        self.anciennetes = [[0, 0] for t in TRANCHES]
+        self.total = [0, 0]
+        #   Les fichiers d'un même répertoire arrivent à la suite.
+        self.dernier = (None, None)
+
+    #   -------------------------------------------------------------------------------
+    def __repertoire__(self, D):
+        if D != self.dernier[0]:
+            relatif = os.path.relpath(D, self.nom_rep_base)
+            parties = [] if relatif == os.curdir else relatif.split(os.sep)
+            self.dernier = (D, os.path.join(self.nom_rep_base, *parties[:self.profondeur]))
+        return self.dernier[1]
+
+    #   -------------------------------------------------------------------------------
+    def ajouter(self, resultat):
+        D, fic, taille, date_mod = resultat[:4]
+
+        for table, cle in ((self.repertoires, self.__repertoire__(D)),
+                           (self.extensions, os.path.splitext(fic)[1].lower())):
+            compteur = table.get(cle)
+            if compteur is None:
+                compteur = table[cle] = [0, 0]
+            compteur[0] += 1
+            compteur[1] += taille
+
+        compteur = self.anciennetes[bisect.bisect_right(self.limites, self.maintenant - date_mod)]
+        compteur[0] += 1
+        compteur[1] += taille
+
+        self.total[0] += 1
+        self.total[1] += taille
+
+    #   -------------------------------------------------------------------------------
+    def lignes(self, humainementLisible=False):
+        """
+            Les trois tableaux, mis en forme. Répertoires et extensions par volume
+            décroissant, anciennetés de la plus récente à la plus ancienne.
+        """
+        def ligne(libelle, compteur):
+            volume = '{: >10s}'.format(affichageHumain(compteur[1])) if humainementLisible \
+                else '{: >15d}'.format(compteur[1])
+            pourcentage = 100.0 * compteur[1] / self.total[1] if self.total[1] else 0
+            return '{: >10d} {} {: >6.1f}%   {}'.format(compteur[0], volume, pourcentage, libelle)
+
+        yield '\tPar répertoire :'
+        for cle, compteur in sorted(self.repertoires.items(), key=lambda e: -e[1][1]):
+            yield ligne(cle, compteur)
+
+        yield '\n\tPar extension :'
+        for cle, compteur in sorted(self.extensions.items(), key=lambda e: -e[1][1]):
+            yield ligne(cle or '(aucune)', compteur)
+
+        yield '\n\tPar ancienneté :'
+        for (limite, libelle), compteur in zip(TRANCHES, self.anciennetes):
+            if compteur[0]:
+                yield ligne(libelle, compteur)
+
+        yield '\n' + ligne('Total', self.total)
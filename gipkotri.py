@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+    Tri externe (tri-fusion sur disque) d'un nombre quelconque d'éléments, avec une
+    mémoire bornée.
+
+    Les éléments sont accumulés en mémoire jusqu'à ce que leur taille estimée dépasse
+    le budget. On trie alors ce paquet et on l'écrit (pickle) dans un fichier temporaire :
+    une "monotonie". À la fin on fusionne les monotonies (heapq.merge), qui ne sont lues
+    que par petits morceaux. Si tout tient dans le budget, rien n'est écrit sur disque :
+    c'est un simple sorted.
+
+    S'il y a plus de FUSION_MAX monotonies on les fusionne d'abord par groupes, pour ne
+    pas ouvrir des centaines de fichiers en même temps.
+
+    Syntaxe :
+        for e in trier(elements, cle=lambda e: e[2], budget='200M', reverse=True): ...
+
+    Le tri est stable, comme sorted, y compris avec reverse=True.
+    Les éléments doivent pouvoir être "picklés" (tuples, chaînes, nombres...).
+
+    ---------------------------------------------------------------------------
+    Historique :
+    ------------
+
+    Version 1.0 2026-10-18
+        Original.
+
+"""
+
+import sys
+import heapq
+import itertools
+import pickle
+import tempfile
+from gipkofilter import lire_taille
+
+VERSION = '1.0'
+BUDGET = 100 * 1024 * 1024
+FUSION_MAX = 64
+ELEMENTS_PAR_BLOC = 1000
+
+
+# ------------------------------------------------------------------------------------
+def taille_estimee(element):
+    """
+        Taille en mémoire d'un élément, à peu près : le conteneur plus ses éléments (pas
+        plus profond).
+    """
+    taille = sys.getsizeof(element)
+    if isinstance(element, (tuple, list)):
+        taille += sum(sys.getsizeof(e) for e in element)
+    return taille
+
+
+# ------------------------------------------------------------------------------------
+def _ecrire_monotonie(elements):
+    """
+        Écrit des éléments (déjà triés) par blocs dans un fichier temporaire, qui
+        disparaîtra tout seul quand il sera fermé.
+    """
+    fichier = tempfile.TemporaryFile()
+    elements = iter(elements)
+    while True:
+        bloc = list(itertools.islice(elements, ELEMENTS_PAR_BLOC))
+        if not bloc:
+            break
+        pickle.dump(bloc, fichier, pickle.HIGHEST_PROTOCOL)
+    fichier.seek(0)
+    return fichier
+
+
+# ------------------------------------------------------------------------------------
+def _lire_monotonie(fichier):
+    while True:
+        try:
+            bloc = pickle.load(fichier)
+        except EOFError:
+            return
+        for element in bloc:
+            yield element
+
+
+# ------------------------------------------------------------------------------------
+def trier(elements, cle=None, budget=BUDGET, reverse=False, taille=taille_estimee):
+    """
+        Générateur qui renvoie les éléments triés.
+
+        elements : itérable, consommé entièrement avant que le premier élément trié soit
+                   renvoyé.
+        cle      : comme le key de sorted.
+        budget   : mémoire maximale (estimée) occupée par les éléments en attente, en
+                   octets ou au format de gipkofilter.lire_taille ('200M').
+        taille   : fonction qui estime la taille d'un élément.
+    """
+    if isinstance(budget, str):
+        budget = lire_taille(budget, 'budget')
+
+    monotonies = []
+    paquet = []
+    occupe = 0
+
+    try:
+        for element in elements:
+            paquet.append(element)
+            occupe += taille(element)
+            if occupe >= budget:
+                paquet.sort(key=cle, reverse=reverse)
+                monotonies.append(_ecrire_monotonie(paquet))
+                paquet = []
+                occupe = 0
+
+        paquet.sort(key=cle, reverse=reverse)
+        if not monotonies:
+            for element in paquet:
+                yield element
+            return
+
+        if paquet:
+            monotonies.append(_ecrire_monotonie(paquet))
+            paquet = []
+
+        #   Fusions intermédiaires si on a trop de fichiers. On fusionne des monotonies
+        #   consécutives pour que le tri reste stable.
+        while len(monotonies) > FUSION_MAX:
+            groupes = [monotonies[i:i + FUSION_MAX] for i in range(0, len(monotonies), FUSION_MAX)]
+            monotonies = []
+            for groupe in groupes:
+                fusion = heapq.merge(*[_lire_monotonie(f) for f in groupe], key=cle, reverse=reverse)
+                monotonies.append(_ecrire_monotonie(fusion))
+                for f in groupe:
+                    f.close()
+
+        for element in heapq.merge(*[_lire_monotonie(f) for f in monotonies], key=cle, reverse=reverse):
+            yield element
+
+    finally:
+        for f in monotonies:
+            f.close()
@@ -5,7 +5,8 @@
     les conditions données.
 
     Renvoie un tuple répertoire contenant le fichier, nom du fichier, taille,
-    date de modification.
+    date de modification. Si on cherche des motifs nommés (voir plus bas) le tuple
+    a un cinquième élément, le tuple des noms des motifs trouvés dans le fichier.
 
     On peut faire une sélection sur la taille, la date de dernière modification,
     l'extension, une expression régulière sur le nom du fichier, ou une
@@ -65,6 +66,112 @@
                         n'aura pas de match sur les patterns contenant des caractères
                         accentués...
 
+    max_octets      : avec texte_cherche, nombre maximum d'octets lus dans chaque
+                        fichier. Même format que size_min, ou nombre entier.
+                        Défaut : aucun, on lit jusqu'au bout (par blocs, la mémoire
+                        utilisée ne dépend pas de la taille du fichier).
+
+    motifs          : plusieurs expressions régulières à chercher dans le contenu,
+                        chacune avec un nom : dictionnaire {nom: regexp} ou liste de
+                        chaînes "nom=regexp". Chaque fichier n'est lu qu'une fois pour
+                        toutes les expressions. Sont sélectionnés les fichiers qui en
+                        contiennent au moins une (et texte_cherche s'il est spécifié),
+                        et on renvoie avec chacun la liste des motifs trouvés.
+
+    cache_binaires  : avec texte_cherche, nom d'un fichier (SQLite) dans lequel on
+                        garde la liste des fichiers binaires rencontrés, qui ne
+                        seront plus lus aux recherches suivantes tant qu'ils n'ont
+                        pas changé de taille ou de date.
+                        Défaut : aucun. Les fichiers binaires sont quand même repérés
+                        d'après leurs premiers octets et ne sont pas décodés.
+
+    seuil_mmap      : avec texte_cherche, taille (même format que size_min) à partir de
+                        laquelle on cherche directement dans le fichier projeté en
+                        mémoire (mmap) au lieu de le lire et le décoder. Plus rapide sur
+                        les gros fichiers, mais l'insensibilité à la casse ne marche
+                        plus pour les lettres accentuées. Sans effet sur les fichiers
+                        utf-16.
+                        Défaut : aucun, on lit toujours par blocs.
+
+    filtre          : un objet gipkofilter.Filter déjà construit. Dans ce cas les
+                        arguments de sélection ci-dessus sont ignorés.
+
+    workers         : nombre de threads qui listent les répertoires en parallèle.
+                        Sur un partage réseau le temps de parcours est surtout fait
+                        d'attente des réponses du serveur, plusieurs requêtes en
+                        parallèle vont nettement plus vite. Les critères de sélection
+                        sont appliqués dans les threads.
+                        Défaut : aucun, parcours séquentiel.
+
+    ordonne         : avec workers, si True les fichiers sont renvoyés dans le même
+                        ordre que le parcours séquentiel. Sinon dans l'ordre où les
+                        répertoires ont été traités, qui varie d'une fois à l'autre.
+                        Défaut : False.
+
+    processus       : avec texte_cherche ou motifs, nombre de processus qui font la
+                        recherche dans le contenu des fichiers. Utile quand les
+                        expressions régulières sont compliquées : dans ce cas c'est le
+                        processeur qui limite, et les threads n'y peuvent rien à cause
+                        du GIL. Les fichiers qui ont passé les autres critères sont
+                        envoyés aux processus par lots.
+                        ATTENTION, sous windows le programme appelant doit avoir son
+                        code principal dans un "if __name__ == '__main__':".
+                        Défaut : aucun, la recherche est faite pendant le parcours.
+
+    taille_lot      : avec processus, nombre de fichiers par lot. Défaut : 50.
+
+    index           : nom d'un fichier (SQLite) qui garde le contenu des répertoires
+                        d'un parcours à l'autre, ou objet gipkoindex.IndexRepertoires.
+                        Les répertoires dont la date de modification n'a pas changé
+                        ne sont pas relus, leur contenu est pris dans l'index.
+                        ATTENTION : modifier un fichier existant ne change pas la date
+                        du répertoire, sa taille et sa date peuvent donc être périmées.
+                        Voir la doc de gipkoindex.
+                        Défaut : aucun, on relit tout.
+
+    verification    : avec index, proportion (0 à 1) des répertoires non modifiés
+                        qu'on relit quand même pour vérifier l'index. Les différences
+                        sont signalées dans le log. Défaut : 0.
+
+    max_depth       : nombre de niveaux parcourus. 1 : seulement les fichiers du
+                        répertoire de base, 2 : plus ceux de ses sous-répertoires etc.
+                        Les répertoires plus profonds ne sont même pas listés.
+                        Défaut : aucun (ou 0), toute l'arborescence.
+
+    exclude_dirs    : répertoires à ne pas parcourir, eux et tout ce qu'ils contiennent.
+                        Liste de motifs, ou chaîne de motifs séparés par des virgules.
+                        Un motif est un "joker" à la windows (*, ?, [abc]) comparé au
+                        nom du répertoire sans tenir compte de la casse, par exemple
+                        "~snapshot,$RECYCLE.BIN,node_modules,.*".
+                        Un motif préfixé par "re:" (ou une expression déjà compilée
+                        par re.compile) est une expression régulière cherchée dans le
+                        nom COMPLET du répertoire.
+                        Défaut : aucun.
+
+    On peut aussi parcourir les répertoires eux-mêmes, comme avec os.walk mais avec
+    les mêmes arguments max_depth et exclude_dirs :
+        for D, dirs, fics in parcourir(rep, max_depth=3, exclude_dirs='~snapshot'): ...
+
+    Version asynchrone, pour parcourir plusieurs arborescences (typiquement des dizaines
+    de partages réseau) en même temps :
+        async for racine, resultat in agipkowalk([rep1, rep2, ...], workers=32): ...
+    Mêmes arguments de sélection que gipkowalk, et resultat est le même tuple. workers est
+    le nombre total de répertoires traités en même temps, toutes racines confondues
+    (défaut : 16). Chaque racine a son tour à chaque place qui se libère : un gros partage
+    ne bloque pas les petits. Les résultats arrivent dans l'ordre où les répertoires sont
+    traités. Les arguments ordonne et processus sont ignorés.
+
+    Version par lots en colonnes (voir gipkolots), pour garder en mémoire les résultats
+    d'une très grosse arborescence :
+        for lot in gipkowalk_lots(rep, lignes_par_lot=10000, **arguments de gipkowalk): ...
+
+    Recherche dans le catalogue (voir gipkoindex) rempli par les parcours précédents avec
+    le même index, sans parcourir l'arborescence :
+        for resultat in catalogue(rep, index='c:\\temp\\index.db', size_min='1G'): ...
+    Mêmes critères de sélection et mêmes résultats que gipkowalk, mais les fichiers sont
+    tels qu'ils étaient au dernier parcours, et sont renvoyés par répertoire dans
+    l'ordre alphabétique. max_depth, exclude_dirs, workers et processus sont ignorés.
+
     ---------------------------------------------------------------------------
     Historique :
     ------------
@@ -72,181 +179,590 @@
     Version 1.0 2021-06-13
         Original.
 
+    Version 1.1 2026-10-18
+        Parcours basé sur os.scandir au lieu de os.walk : la taille et la date de
+        modification viennent du stat en cache dans le DirEntry. Un seul appel
+        système par fichier au lieu de trois (aucun sous windows).
+
+    Version 1.2 2026-10-18
+        Arguments workers et ordonne : parcours multi-threads.
+
+    Version 1.3 2026-10-18
+        Les critères de sélection sont compilés une fois pour toutes dans un objet
+        gipkofilter.Filter, partagé avec gipkodir. On peut aussi passer directement
+        un filtre déjà construit avec l'argument filtre.
+        Au passage la recherche dans le contenu reprend la gestion des BOM de gipkodir,
+        qui ne marchait pas ici.
+
+    Version 1.4 2026-10-18
+        Argument max_octets. La recherche dans le contenu se fait par blocs, avec
+        arrêt au premier match.
+
+    Version 1.5 2026-10-18
+        Les fichiers binaires sont repérés d'après leurs premiers octets et ne sont
+        pas lus. Argument cache_binaires.
+
+    Version 1.6 2026-10-18
+        Argument seuil_mmap : recherche dans le contenu par mmap pour les gros fichiers.
+
+    Version 1.7 2026-10-18
+        Argument motifs : plusieurs expressions régulières nommées cherchées en une
+        seule lecture de chaque fichier.
+
+    Version 1.8 2026-10-18
+        Arguments processus et taille_lot : recherche dans le contenu par un pool
+        de processus.
+
+    Version 1.9 2026-10-18
+        Arguments index et verification : index persistant du contenu des
+        répertoires, pour ne pas relire ceux qui n'ont pas changé.
+
+    Version 1.10 2026-10-18
+        Arguments max_depth et exclude_dirs : les répertoires trop profonds ou exclus
+        ne sont pas listés du tout. Fonction parcourir, équivalent de os.walk avec ces
+        deux arguments.
+
+    Version 1.11 2026-10-18
+        Générateur asynchrone agipkowalk : plusieurs arborescences parcourues en même
+        temps.
+
+    Version 1.12 2026-10-18
+        Générateur gipkowalk_lots : résultats par lots en colonnes.
+
+    Version 1.13 2026-10-18
+        Générateur catalogue : recherche dans l'index sans parcourir l'arborescence.
+
 """
 
 import os
-import logging
-import datetime
 import re
+import asyncio
+import fnmatch
+import logging
+import collections
+import concurrent.futures
+from gipkofilter import Filter
+from gipkoindex import IndexRepertoires
+from gipkolots import TableRepertoires, LotFichiers
+
+ARGUMENTS_FILTRE = ('date_min', 'date_max', 'size_min', 'size_max', 'extensions', 'pattern', 'texte_cherche',
+                    'def_encoding', 'max_octets', 'cache_binaires', 'seuil_mmap', 'motifs')
+TAILLE_LOT = 50
+WORKERS_ASYNC = 16
+LIGNES_PAR_LOT = 10000
+_filtre_processus = None
 
 
 # ------------------------------------------------------------------------------------
-def gipkowalk(nom_rep_base, **kwargs):
-    logger = logging.getLogger()
-    pat_size = '^\d{1,3}[kmgt]?o?$'
+def exclusions(exclude_dirs):
+    """
+        Compile les motifs de exclude_dirs (voir la doc du module) en une fonction qui dit
+        si un répertoire (DirEntry, ou n'importe quoi qui a un name et un path) est exclu.
+        None s'il n'y a rien à exclure.
+    """
+    if not exclude_dirs:
+        return None
+
+    if isinstance(exclude_dirs, (str, re.Pattern)):
+        exclude_dirs = exclude_dirs.split(',') if isinstance(exclude_dirs, str) else [exclude_dirs]
+
+    jokers = []
+    regexps = []
+    for motif in exclude_dirs:
+        if isinstance(motif, re.Pattern):
+            regexps.append(motif.pattern)
+        elif motif.strip()[:3] == 're:':
+            regexps.append(motif.strip()[3:])
+        elif motif.strip():
+            jokers.append(fnmatch.translate(motif.strip()))
+
+    #   Une seule expression pour tous les jokers et une pour toutes les regexps : un
+    #   seul test par répertoire quel que soit le nombre de motifs.
+    nom_exclu = re.compile('|'.join(jokers), re.I).match if jokers else None
+    chemin_exclu = re.compile('|'.join('(?:%s)' % r for r in regexps), re.I).search if regexps else None
+
+    def exclu(entree):
+        return bool((nom_exclu and nom_exclu(entree.name)) or (chemin_exclu and chemin_exclu(entree.path)))
+
+    return exclu
+
+
+# ------------------------------------------------------------------------------------
+def _elaguer(dirs, profondeur, max_depth, exclu):
+    """
+        Renvoie la liste des sous-répertoires (DirEntry) qu'on garde, et celle des chemins
+        de ceux dans lesquels il faut descendre : ni liens symboliques, ni au-delà de
+        max_depth.
+    """
+    if exclu:
+        dirs = [e for e in dirs if not exclu(e)]
+
+    if max_depth and profondeur + 1 >= max_depth:
+        return dirs, []
+
+    return dirs, [e.path for e in dirs if not e.is_symlink()]
 
-    if 'date_min' in kwargs:
-        try:
-            date_min = datetime.datetime.strptime(kwargs['date_min'], '%Y-%m-%dT%H:%M:%S').timestamp()
-        except:
-            try:
-                date_min = datetime.datetime.strptime(kwargs['date_min'], '%Y-%m-%d %H:%M:%S').timestamp()
-            except:
-                try:
-                    date_min = datetime.datetime.strptime(kwargs['date_min'], '%Y-%m-%d').timestamp()
-                except:
-                    raise ValueError('Date min incorrecte, %s' % kwargs['date_min']) from None
-    else:
-        date_min = None
 
-    if 'date_max' in kwargs:
+# ------------------------------------------------------------------------------------
+def parcourir(nom_rep_base, max_depth=None, exclude_dirs=None):
+    """
+        Comme os.walk (de haut en bas, sans suivre les liens symboliques) : renvoie pour
+        chaque répertoire un tuple (répertoire, noms des sous-répertoires, noms des
+        fichiers). Mais les répertoires au-delà de max_depth ou exclus par exclude_dirs
+        ne sont pas listés, et les exclus n'apparaissent pas dans les sous-répertoires.
+    """
+    for D, dirs, fics in _parcourir(nom_rep_base, max_depth=max_depth, exclu=exclusions(exclude_dirs)):
+        yield D, [e.name for e in dirs], [e.name for e in fics]
+
+
+# ------------------------------------------------------------------------------------
+def _parcourir(nom_rep_base, lister=None, max_depth=None, exclu=None):
+    """
+        Équivalent de os.walk (de haut en bas, sans suivre les liens symboliques) mais
+        basé sur os.scandir. Renvoie pour chaque répertoire un tuple (répertoire, liste des
+        DirEntry des sous-répertoires, liste des DirEntry des fichiers).
+
+        L'intérêt : le DirEntry garde en cache ce qui a été lu pendant le listage du
+        répertoire. Sous windows FindFirstFile / FindNextFile donnent déjà la taille et les
+        dates, donc entree.stat() ne coûte aucun appel système de plus. Ailleurs on fait un
+        seul stat par fichier au lieu de trois (getsize, getctime, getmtime). Sur un partage
+        réseau chacun de ces appels est un aller-retour avec le serveur...
+
+        lister : la fonction qui donne le contenu d'un répertoire. Défaut : _lister.
+        max_depth, exclu : voir _elaguer.
+    """
+    lister = lister or _lister
+    a_traiter = [(nom_rep_base, 0)]
+
+    while a_traiter:
+        D, profondeur = a_traiter.pop()
+        contenu = lister(D)
+        if contenu is None:
+            continue
+
+        dirs, sous_reps = _elaguer(contenu[0], profondeur, max_depth, exclu)
+        yield D, dirs, contenu[1]
+
+        #   Pile : on empile à l'envers pour garder le même ordre de parcours que os.walk.
+        a_traiter.extend([(d, profondeur + 1) for d in reversed(sous_reps)])
+
+
+# ------------------------------------------------------------------------------------
+def _lister(D):
+    """
+        Liste un répertoire et renvoie le couple (sous-répertoires, fichiers), sous forme
+        de listes de DirEntry. None si le répertoire ne peut pas être lu.
+    """
+    logger = logging.getLogger()
+    try:
+        with os.scandir(D) as it:
+            entrees = list(it)
+    except OSError as e:
+        #   Comme os.walk on passe au suivant, mais on le note quand même.
+        logger.error('Impossible de lister le répertoire %s : %s' % (D, e))
+        return None
+
+    dirs = []
+    fics = []
+    for entree in entrees:
         try:
-            date_max = datetime.datetime.strptime(kwargs['date_max'], '%Y-%m-%dT%H:%M:%S').timestamp()
-        except:
-            try:
-                date_max = datetime.datetime.strptime(kwargs['date_max'], '%Y-%m-%d %H:%M:%S').timestamp()
-            except:
-                try:
-                    date_max = datetime.datetime.strptime(kwargs['date_max'], '%Y-%m-%d').timestamp()
-                except:
-                    raise ValueError('Date max incorrecte, %s' % kwargs['date_max']) from None
-    else:
-        date_max = None
+            est_rep = entree.is_dir()
+        except OSError:
+            est_rep = False
 
-    if 'size_min' in kwargs:
-        if not re.search(pat_size, kwargs['size_min'], re.I):
-            raise ValueError('Taille min incorrecte, %s' % kwargs['size_min']) from None
+        if est_rep:
+            dirs.append(entree)
         else:
-            facteur = 1000000000000 if re.search('t', kwargs['size_min'], re.I) \
-                else (1000000000 if re.search('g', kwargs['size_min'], re.I)
-                      else (1000000 if re.search('m', kwargs['size_min'], re.I)
-                            else (1000 if re.search('k', kwargs['size_min'], re.I)
-                                  else 1)))
-            size_min = int(re.search('^\d+', kwargs['size_min']).group()) * facteur
-    else:
-        size_min = None
+            fics.append(entree)
+
+    return dirs, fics
+
+
+# ------------------------------------------------------------------------------------
+def _traiter_repertoire(D, profondeur, filtre, lister, max_depth, exclu):
+    """
+        Le travail d'un thread du mode parallèle : lister un répertoire et sélectionner
+        ses fichiers. Renvoie la liste des sous-répertoires à explorer et la liste des
+        résultats.
+    """
+    contenu = lister(D)
+    if contenu is None:
+        return [], []
+
+    dirs, fics = contenu
+    return _elaguer(dirs, profondeur, max_depth, exclu)[1], _selectionner(D, fics, filtre)
+
+
+# ------------------------------------------------------------------------------------
+def _parcourir_parallele(nom_rep_base, filtre, workers, ordonne=False, lister=None, max_depth=None, exclu=None):
+    """
+        Parcours multi-threads : chaque répertoire est listé (et ses fichiers filtrés) par
+        un des threads du pool, ce qui permet d'avoir plusieurs requêtes en cours vers le
+        serveur de fichiers au lieu d'attendre chaque réponse l'une après l'autre.
+
+        Renvoie des couples (répertoire, liste des résultats).
+
+        Si ordonne est vrai les répertoires sont renvoyés dans le même ordre qu'avec le
+        parcours séquentiel : on garde une pile de "futures" qu'on attend dans l'ordre,
+        les threads continuant à travailler sur les suivants pendant ce temps.
+        Sinon on les renvoie dans l'ordre où ils sont terminés, c'est un peu plus rapide.
+    """
+    lister = lister or _lister
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    en_cours = []
+
+    def soumettre(D, profondeur):
+        return executor.submit(_traiter_repertoire, D, profondeur, filtre, lister, max_depth, exclu)
+
+    try:
+        if ordonne:
+            en_cours.append((nom_rep_base, 0, soumettre(nom_rep_base, 0)))
+            while en_cours:
+                D, profondeur, future = en_cours.pop()
+                sous_reps, resultats = future.result()
+                en_cours.extend([(d, profondeur + 1, soumettre(d, profondeur + 1)) for d in reversed(sous_reps)])
+                yield D, resultats
 
-    if 'size_max' in kwargs:
-        if not re.search(pat_size, kwargs['size_max'], re.I):
-            raise ValueError('Taille max incorrecte, %s' % kwargs['size_max']) from None
         else:
-            facteur = 1000000000000 if re.search('t', kwargs['size_max'], re.I) \
-                else (1000000000 if re.search('g', kwargs['size_max'], re.I)
-                      else (1000000 if re.search('m', kwargs['size_max'], re.I)
-                            else (1000 if re.search('k', kwargs['size_max'], re.I)
-                                  else 1)))
-            size_max = int(re.search('^\d+', kwargs['size_max']).group()) * facteur
-    else:
-        size_max = None
+            futures = {soumettre(nom_rep_base, 0): (nom_rep_base, 0)}
+            en_cours = futures
+            while futures:
+                termines, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in termines:
+                    D, profondeur = futures.pop(future)
+                    sous_reps, resultats = future.result()
+                    for d in sous_reps:
+                        futures[soumettre(d, profondeur + 1)] = (d, profondeur + 1)
+                    yield D, resultats
+
+    finally:
+        #   Si l'appelant s'arrête avant la fin on ne va pas lister le reste pour rien.
+        for e in en_cours:
+            future = e[2] if ordonne else e
+            future.cancel()
+        executor.shutdown(wait=True)
 
-    if 'extensions' in kwargs:
-        extensions = kwargs['extensions'].split(',')
-    else:
-        extensions = None
 
-    if 'pattern' in kwargs:
+# ------------------------------------------------------------------------------------
+def _selectionner(D, fics, filtre):
+    """
+        Applique le filtre aux fichiers (DirEntry) d'un répertoire et renvoie la liste
+        des tuples (répertoire, fichier, taille, date de modification) retenus. Avec des
+        motifs nommés on ajoute au tuple la liste des motifs trouvés.
+        Appelée telle quelle par les threads du mode parallèle.
+    """
+    logger = logging.getLogger()
+    predicats_nom = filtre.predicats_nom
+    predicats_stat = filtre.predicats_stat
+    predicats_contenu = filtre.predicats_contenu
+    avec_motifs = bool(filtre.motifs)
+    resultats = []
+
+    for entree in fics:
+        fic = entree.name
+        nom_complet = entree.path
+
+        #   D'abord les tests qui n'ont besoin que du nom...
+        if predicats_nom and not filtre.accepte_nom(fic, nom_complet):
+            continue
+
+        #   Maintenant on a besoin de la taille et des dates des fichiers.
+        #   Un seul stat, et encore : sous windows il est déjà dans le DirEntry.
         try:
-            pattern = re.compile(kwargs['pattern'], re.I)
-        except:
-            raise ValueError('%s n\'est pas une expression régulière correcte' % pattern) from None
+            #   Oui, on n'est pas à l'abri d'un nom trop long qui va nous planter...
+            st = entree.stat()
+        except OSError:
+            logger.error('Impossible d\'avoir la taille et les dates du fichier %s' % nom_complet)
+            continue
+
+        taille = st.st_size
+        date_mod = st.st_mtime
+
+        if predicats_stat and not filtre.accepte_stat(nom_complet, taille, date_mod):
+            continue
+
+        #   ... et on ne lit le fichier qu'en dernier recours.
+        if predicats_contenu:
+            trouves = filtre.accepte_contenu(nom_complet, taille, date_mod)
+            if trouves is None:
+                continue
 
-    else:
-        pattern = None
+        if avec_motifs:
+            resultats.append((D, fic, taille, date_mod, trouves))
+        else:
+            resultats.append((D, fic, taille, date_mod))
 
-    if 'texte_cherche' in kwargs:
-        try:
-            texte_cherche = re.compile(kwargs['texte_cherche'], re.I)
-        except:
-            raise ValueError('%s n\'est pas une expression régulière correcte' % texte_cherche) from None
-    else:
-        texte_cherche = None
+    return resultats
 
-    if 'def_encoding' in kwargs:
-        def_encoding = kwargs['def_encoding']
-    else:
-        def_encoding = None
 
-    for D, dirs, fics in os.walk(nom_rep_base):
-        for fic in fics:
-            nom_complet = os.path.join(D, fic)
+#   -------------------------------------------------------------------------------
+class _BinairesTrouves(list):
+    """
+        Se fait passer pour le cache des fichiers binaires du filtre dans un processus
+        de recherche : note simplement les fichiers binaires trouvés, que le processus
+        principal inscrira dans le vrai cache.
+    """
+    def lire(self, chemin, taille, mtime):
+        return None
 
-            #   Premier test tout simple : le filtre sur les extensions
-            if extensions and os.path.splitext(os.path.basename(nom_complet))[1] not in extensions:
-                logger.debug('%s éliminé à cause de son extension' % nom_complet)
-                continue
+    def ecrire(self, chemin, taille, mtime, valeur):
+        self.append((chemin, taille, mtime))
 
-            #   Deuxième test, simple aussi : le filtre sur la pattern
-            #   if pattern and not re.search(pattern, fic):
-            if pattern and not re.search(pattern, nom_complet):
-                logger.debug('%s éliminé par l\'expression régulière sur le nom' % nom_complet)
-                continue
+    def fermer(self):
+        pass
 
-            #   Maintenant on a besoin de la taille et des dates des fichiers.
-            try:
-                #   Oui, on n'est pas à l'abri d'un nom trop long qui va nous planter...
-                taille = os.path.getsize(nom_complet)
-            except:
-                logger.error('Impossible d\'avoir la taille du fichier %s' % nom_complet)
-                continue
 
-            try:
-                date_cre = os.path.getctime(nom_complet)
-            except:
-                logger.error('Impossible d\'avoir la date de création du fichier %s' % nom_complet)
-                continue
+# ------------------------------------------------------------------------------------
+def _initialiser_processus(parametres):
+    """
+        Exécutée une fois au démarrage de chaque processus de recherche : le filtre, et
+        donc les expressions régulières, ne sont compilés qu'une fois par processus.
+    """
+    global _filtre_processus
+    _filtre_processus = Filter(**parametres)
 
-            try:
-                date_mod = os.path.getmtime(nom_complet)
-            except:
-                logger.error('Impossible d\'avoir la date de modification du fichier %s' % nom_complet)
-                continue
 
-            """
-                Le gag des dates avec windows :
-                Si on crée un fichier f1 le 1 janvier, qu'on le modifie le 15 janvier, et que le 1 février on
-                copie ce fichier f1 en fichier f2, le fichier f1 aura bien comme date de création le 1 janvier
-                et comme date de modification le 15 janvier, mais le fichier f2 aura, lui, comme date de
-                modification le 15 janvier et comme date de création le 1 janvier !
-                Microsoft nous a inventé la machine à remonter le temps...
+# ------------------------------------------------------------------------------------
+def _chercher_lot(lot):
+    """
+        Le travail d'un processus de recherche : chercher dans le contenu d'un lot de
+        fichiers qui ont déjà passé les autres critères.
+        Renvoie la liste des fichiers retenus et la liste des fichiers binaires trouvés.
+    """
+    binaires = _BinairesTrouves()
+    _filtre_processus.cache_binaires = binaires
+    avec_motifs = bool(_filtre_processus.motifs)
+    resultats = []
+
+    for D, fic, taille, date_mod in lot:
+        trouves = _filtre_processus.accepte_contenu(os.path.join(D, fic), taille, date_mod)
+        if trouves is None:
+            continue
+
+        if avec_motifs:
+            resultats.append((D, fic, taille, date_mod, trouves))
+        else:
+            resultats.append((D, fic, taille, date_mod))
 
-                On va donc se baser sur la date de modification
-            """
+    return resultats, list(binaires)
 
-            if date_min and date_mod < date_min:
-                logger.debug('%s éliminé parce qu\'antérieur à date min' % nom_complet)
-                continue
 
-            if date_max and date_mod > date_max:
-                logger.debug('%s éliminé parce que postérieur à date max' % nom_complet)
+# ------------------------------------------------------------------------------------
+def _chercher_en_parallele(candidats, filtre, processus, taille_lot):
+    """
+        Recherche dans le contenu par un pool de processus, pour les expressions
+        régulières compliquées où c'est le processeur (et le GIL) qui limite et non plus
+        les entrées-sorties.
+
+        Les candidats, qui ont déjà passé les critères de nom, taille et date, sont
+        envoyés par lots de taille_lot pour limiter le coût des échanges entre processus.
+        On n'a jamais plus de deux lots par processus en attente, la mémoire reste donc
+        stable quelle que soit la taille de l'arborescence. Les résultats sont renvoyés
+        dans l'ordre des candidats.
+    """
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus,
+                                                      initargs=(filtre.parametres_contenu(),))
+    en_cours = collections.deque()
+    lot = []
+
+    def resultats_lot(future):
+        resultats, binaires = future.result()
+        if filtre.cache_binaires is not None:
+            for nom_complet, taille, date_mod in binaires:
+                filtre.cache_binaires.ecrire(nom_complet, taille, date_mod, True)
+        return resultats
+
+    try:
+        for D, fic, taille, date_mod in candidats:
+            if filtre.binaire_connu(os.path.join(D, fic), taille, date_mod):
                 continue
 
-            if size_min and taille < size_min:
-                logger.debug('%s éliminé parce que plus petit que taille min' % nom_complet)
-                continue
+            lot.append((D, fic, taille, date_mod))
+            if len(lot) >= taille_lot:
+                en_cours.append(executor.submit(_chercher_lot, lot))
+                lot = []
 
-            if size_max and taille > size_max:
-                logger.debug('%s éliminé parce que plus grand que taille max' % nom_complet)
-                continue
+                while len(en_cours) >= 2 * processus:
+                    for resultat in resultats_lot(en_cours.popleft()):
+                        yield resultat
+
+        if lot:
+            en_cours.append(executor.submit(_chercher_lot, lot))
+
+        while en_cours:
+            for resultat in resultats_lot(en_cours.popleft()):
+                yield resultat
+
+    finally:
+        for future in en_cours:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+# ------------------------------------------------------------------------------------
+def _options(kwargs):
+    """
+        Les arguments communs à gipkowalk et agipkowalk : renvoie le filtre, l'index, la
+        fonction qui liste les répertoires, max_depth et la fonction d'exclusion.
+    """
+    if 'filtre' in kwargs:
+        filtre = kwargs['filtre']
+    else:
+        filtre = Filter(**{k: kwargs[k] for k in kwargs if k in ARGUMENTS_FILTRE})
 
-            if texte_cherche:
-                try:
-                    with open(nom_complet, 'r', encoding=def_encoding ) as f:
-                        contenu = f.read()
-                except Exception as e:
-                    #   Y'a des farceurs qui nous encodent leurs fichiers en utf 16... Faut gérer !
-                    for bom in boms:
-                        if contenu[:len(bom)] == bom:
-                            logger.debug('{0} encodé en {1}'.format(nom_complet, boms[bom]))
-                            with open(nom_complet, 'r', encoding=boms[bom]) as f:
-                                try:
-                                    contenu = f.read()
-                                except Exception as e:
-                                    logger.warning('Pas pu lire le contenu du fichier {0} en {1} pour y chercher l\'expression régulière'.format(nom_complet, boms[bom]))
-                            break
-
-                if not re.search(texte_cherche, contenu):
-                    logger.debug('%s éliminé parce qu\'il ne contient pas l\'expression régulière indiquée' % nom_complet)
-                    continue
-
-            yield D, fic, taille, date_mod
+    index = kwargs.get('index')
+    if isinstance(index, str):
+        index = IndexRepertoires(index, float(kwargs.get('verification', 0)))
+    lister = (lambda D: index.lister(D, _lister)) if index else _lister
 
+    return filtre, index, lister, int(kwargs.get('max_depth') or 0), exclusions(kwargs.get('exclude_dirs'))
+
+
+# ------------------------------------------------------------------------------------
+def _fermer(kwargs, filtre, index):
+    if 'filtre' not in kwargs:
+        #   Le filtre est à nous, c'est à nous de le fermer.
+        filtre.fermer()
+    if isinstance(kwargs.get('index'), str):
+        index.fermer()
+
+
+# ------------------------------------------------------------------------------------
+def gipkowalk(nom_rep_base, **kwargs):
+    filtre, index, lister, max_depth, exclu = _options(kwargs)
+
+    if 'workers' in kwargs and kwargs['workers'] and int(kwargs['workers']) > 1:
+        workers = int(kwargs['workers'])
+    else:
+        workers = None
+
+    ordonne = kwargs.get('ordonne', False)
+
+    if 'processus' in kwargs and kwargs['processus'] and filtre.predicats_contenu:
+        processus = int(kwargs['processus'])
+        filtre_parcours = filtre.sans_contenu()
+    else:
+        processus = None
+        filtre_parcours = filtre
+
+    if workers:
+        parcours = _parcourir_parallele(nom_rep_base, filtre_parcours, workers, ordonne, lister, max_depth, exclu)
+    else:
+        parcours = ((D, _selectionner(D, fics, filtre_parcours))
+                    for D, dirs, fics in _parcourir(nom_rep_base, lister, max_depth, exclu))
+
+    resultats = (resultat for D, resultats_rep in parcours for resultat in resultats_rep)
+    if processus:
+        resultats = _chercher_en_parallele(resultats, filtre, processus, int(kwargs.get('taille_lot', TAILLE_LOT)))
+
+    try:
+        for resultat in resultats:
+            yield resultat
+    finally:
+        resultats.close()
+        _fermer(kwargs, filtre, index)
+
+
+# ------------------------------------------------------------------------------------
+def gipkowalk_lots(nom_rep_base, lignes_par_lot=LIGNES_PAR_LOT, **kwargs):
+    """
+        Mêmes arguments et mêmes résultats que gipkowalk, mais regroupés par lots de
+        lignes_par_lot fichiers (gipkolots.LotFichiers). Tous les lots partagent la même
+        table des noms de répertoires.
+    """
+    repertoires = TableRepertoires()
+    avec_motifs = None
+    lot = None
+
+    for resultat in gipkowalk(nom_rep_base, **kwargs):
+        if lot is None:
+            if avec_motifs is None:
+                avec_motifs = len(resultat) > 4
+            lot = LotFichiers(repertoires, avec_motifs)
+
+        lot.ajouter(resultat)
+        if len(lot) >= lignes_par_lot:
+            yield lot
+            lot = None
+
+    if lot is not None:
+        yield lot
+
+
+# ------------------------------------------------------------------------------------
+def catalogue(nom_rep_base, **kwargs):
+    """
+        Comme gipkowalk, mais les fichiers viennent de l'index (argument index obligatoire)
+        au lieu d'un parcours. Les critères de taille, date et extension sont appliqués par
+        la base, les autres (expressions régulières...) ensuite comme pour un parcours.
+    """
+    if not kwargs.get('index'):
+        raise ValueError('Pas de catalogue sans index')
+
+    filtre, index, lister, max_depth, exclu = _options(kwargs)
+    try:
+        for D, fics in index.fichiers_sous(nom_rep_base, filtre.size_min, filtre.size_max, filtre.date_min,
+                                           filtre.date_max, filtre.extensions):
+            for resultat in _selectionner(D, fics, filtre):
+                yield resultat
+    finally:
+        _fermer(kwargs, filtre, index)
+
+
+# ------------------------------------------------------------------------------------
+async def agipkowalk(racines, **kwargs):
+    """
+        Parcours de plusieurs arborescences en même temps. Renvoie des couples (racine,
+        résultat), résultat étant le tuple que renverrait gipkowalk(racine).
+
+        Le listage des répertoires et la sélection de leurs fichiers (stat, lecture du
+        contenu) se font comme dans le mode multi-threads de gipkowalk, dans un pool de
+        workers threads : c'est le seul nombre de requêtes en cours vers les serveurs.
+        Chaque racine a sa propre pile de répertoires à traiter, et les racines qui ont
+        encore du travail passent à tour de rôle (tourniquet) à chaque place libérée.
+    """
+    filtre, index, lister, max_depth, exclu = _options(kwargs)
+    workers = int(kwargs.get('workers') or WORKERS_ASYNC)
+    boucle = asyncio.get_running_loop()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    racines = list(dict.fromkeys(racines))
+    a_traiter = {racine: [(racine, 0)] for racine in racines}
+    #   Les racines qui ont des répertoires en attente, chacune une seule fois, dans
+    #   l'ordre où elles passeront.
+    tourniquet = collections.deque(racines)
+    en_cours = {}
+
+    try:
+        while tourniquet or en_cours:
+            while tourniquet and len(en_cours) < workers:
+                racine = tourniquet.popleft()
+                pile = a_traiter[racine]
+                D, profondeur = pile.pop()
+                future = boucle.run_in_executor(executor, _traiter_repertoire, D, profondeur, filtre, lister,
+                                                max_depth, exclu)
+                en_cours[future] = (racine, profondeur)
+                if pile:
+                    tourniquet.append(racine)
+
+            termines, _ = await asyncio.wait(en_cours, return_when=asyncio.FIRST_COMPLETED)
+            for future in termines:
+                racine, profondeur = en_cours.pop(future)
+                sous_reps, resultats = future.result()
+
+                pile = a_traiter[racine]
+                if sous_reps and not pile:
+                    tourniquet.append(racine)
+                pile.extend([(d, profondeur + 1) for d in reversed(sous_reps)])
+
+                for resultat in resultats:
+                    yield racine, resultat
+
+    finally:
+        for future in en_cours:
+            future.cancel()
+        #   Si l'appelant s'arrête avant la fin, les threads qui travaillent encore
+        #   finissent leur répertoire : au pire workers répertoires d'attente, mais on ne
+        #   ferme pas le filtre et l'index sous leurs pieds.
+        executor.shutdown(wait=True)
+        _fermer(kwargs, filtre, index)